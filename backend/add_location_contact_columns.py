@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Script to add the contact columns to an existing ngo_locations table
+Run once after deploying the contact_person, contact_phone and
+operating_hours columns; create_all adds them for new databases only.
+The columns are nullable without a default, so PostgreSQL only updates the
+catalog, but each ALTER still needs a brief exclusive lock on the table.
+"""
+import asyncio
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+COLUMNS = [
+    ("contact_person", "VARCHAR(255)"),
+    ("contact_phone", "VARCHAR(20)"),
+    ("operating_hours", "VARCHAR(255)"),
+]
+
+
+async def main():
+    async with engine.begin() as conn:
+        # Give up instead of queueing every query on the table behind a long transaction
+        await conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        for name, column_type in COLUMNS:
+            await conn.execute(text(f"ALTER TABLE ngo_locations ADD COLUMN IF NOT EXISTS {name} {column_type}"))
+    await engine.dispose()
+
+    print(f"✅ ngo_locations has {', '.join(name for name, _ in COLUMNS)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
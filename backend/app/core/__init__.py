@@ -6,9 +6,13 @@ from app.core.database import Base, get_db, engine
 from app.core.security import (
     hash_password,
     verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     get_current_user,
+    get_current_donor_profile,
+    get_current_ngo_profile,
     require_role,
     require_donor,
     require_ngo,
@@ -22,9 +26,13 @@ __all__ = [
     "engine",
     "hash_password",
     "verify_password",
+    "hash_password_async",
+    "verify_password_async",
     "create_access_token",
     "create_refresh_token",
     "get_current_user",
+    "get_current_donor_profile",
+    "get_current_ngo_profile",
     "require_role",
     "require_donor",
     "require_ngo",
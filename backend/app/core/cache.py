@@ -0,0 +1,108 @@
+"""
+In-process TTL cache
+Small async-aware cache for expensive read-mostly values (e.g. dashboard stats).
+Each worker process keeps its own copy; entries expire after ttl_seconds or
+when explicitly invalidated, and the oldest are evicted beyond max_entries.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Every cache created in this process, for metrics
+_caches: List["TTLCache"] = []
+
+
+def all_caches() -> List["TTLCache"]:
+    return list(_caches)
+
+
+class TTLCache:
+    """Key/value cache with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, ttl_seconds: float, name: str = "cache", max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        # Per-key loader lock and how many callers hold or await it
+        self._locks: Dict[Hashable, Tuple[asyncio.Lock, int]] = {}
+        _caches.append(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def lookup(self, key: Hashable) -> Optional[Any]:
+        """get() that also counts the hit or miss, for callers filling entries with set()"""
+        value = self.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_entries is not None and key not in self._entries and len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or every key when called without arguments"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_set(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value or await loader() to fill it
+        Concurrent misses for the same key share one loader call
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        lock, users = self._locks.get(key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                # Another request may have filled the entry while we waited
+                value = self.get(key)
+                if value is not None:
+                    self.hits += 1
+                    return value
+
+                self.misses += 1
+                value = await loader()
+                self.set(key, value)
+                return value
+        finally:
+            # The last caller drops the lock so keys seen once don't pile up
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
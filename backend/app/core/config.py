@@ -2,7 +2,7 @@
 Configuration settings for Plates for People API
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -23,6 +23,82 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing (bcrypt runs on a dedicated thread pool)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 200
+    
+    # Query instrumentation: warn above this many queries per request, and flag
+    # a statement run this many times in one request as a probable N+1
+    QUERY_BUDGET_PER_REQUEST: int = 20
+    QUERY_REPEAT_THRESHOLD: int = 5
+    # Return X-DB-* headers even when DEBUG is off (used by perf.query_budget)
+    QUERY_STATS_HEADERS: bool = False
+    
+    # Admin dashboard stats snapshot lifetime
+    ADMIN_STATS_TTL_SECONDS: int = 30
+    
+    # Audit log writer (batched, off the request path)
+    AUDIT_BATCH_SIZE: int = 100
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 2.0
+    AUDIT_MAX_QUEUE: int = 10000
+    
+    # Readiness probe (/health/ready) thresholds
+    HEALTH_DB_TIMEOUT_SECONDS: float = 1.0
+    HEALTH_POOL_SATURATION_THRESHOLD: float = 0.9
+    HEALTH_MAX_LOOP_LAG_MS: float = 250.0
+    
+    # Response compression (br when the brotli package is installed, else gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    
+    # Prometheus-style metrics at /metrics
+    METRICS_ENABLED: bool = True
+    
+    # Donation exports: rows fetched per server-side cursor batch
+    EXPORT_BATCH_SIZE: int = 2000
+    
+    # Donation analytics: longest date range one request may cover
+    ANALYTICS_MAX_DAYS: int = 366
+    
+    # Map clustering grid (/api/search/clusters): finest precomputed zoom level,
+    # grid cells per map tile side, and how long a built grid is reused
+    CLUSTER_MAX_ZOOM: int = 16
+    CLUSTER_CELLS_PER_TILE: int = 4
+    CLUSTER_INDEX_TTL_SECONDS: float = 300.0
+    
+    # Donation heatmap: geohash precisions tiles are kept at (set as JSON in the environment)
+    HEATMAP_PRECISIONS: List[int] = [3, 4, 5, 6]
+    
+    # Reverse geocoding: Nominatim timeout before falling back to the local
+    # gazetteer, whether to skip Nominatim entirely, the gazetteer CSV (empty
+    # uses the bundled one) and how far away its nearest place may be
+    GEOCODING_TIMEOUT_SECONDS: float = 4.0
+    GEOCODING_LOCAL_PRIMARY: bool = False
+    GAZETTEER_PATH: str = ""
+    GAZETTEER_MAX_DISTANCE_KM: float = 50.0
+    
+    # Reverse geocoding cache (coordinates rounded to this many decimals, 4 ~ 11 m)
+    # and the Nominatim throttle: concurrent requests and request starts per second
+    # (Nominatim's usage policy allows 1 per second)
+    GEOCODING_CACHE_TTL_SECONDS: float = 86400.0
+    GEOCODING_CACHE_MAX_ENTRIES: int = 50000
+    GEOCODING_COORDINATE_DECIMALS: int = 4
+    GEOCODING_MAX_CONCURRENCY: int = 2
+    GEOCODING_UPSTREAM_RATE_PER_SECOND: float = 1.0
+    # Batch reverse geocoding: time spent on cache misses before returning partial results
+    GEOCODING_BATCH_TIMEOUT_SECONDS: float = 20.0
+    
+    # Bulk NGO location import: upload size, rows per upload, rows per INSERT
+    # batch, and how long a running job may go without progress before it is
+    # considered abandoned by a crashed worker
+    LOCATION_IMPORT_MAX_BYTES: int = 5_000_000
+    LOCATION_IMPORT_MAX_ROWS: int = 1000
+    LOCATION_IMPORT_BATCH_SIZE: int = 500
+    LOCATION_IMPORT_STALE_SECONDS: int = 600
+    
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8100"
     
@@ -35,8 +111,16 @@ class Settings(BaseSettings):
     ADMIN_EMAIL: str = "admin@platesforpeople.org"
     ADMIN_PASSWORD: str = "changeme123!"
     
-    # Rate Limiting
+    # Rate Limiting (per user, or per IP for anonymous requests)
+    RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 100
+    # Per-route budgets (path prefix -> requests per minute); set as JSON in the environment
+    RATE_LIMIT_ROUTES: Dict[str, int] = {
+        "/api/search/ngos": 30,
+        "/api/geocoding/reverse": 20,
+    }
+    # Dotted path of the counter store; swap for a shared backend when running several workers
+    RATE_LIMIT_BACKEND: str = "app.core.rate_limit.InMemoryRateLimitBackend"
     
     class Config:
         env_file = ".env"
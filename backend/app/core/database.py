@@ -1,6 +1,12 @@
 """
 Database connection and session management
 """
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.core.config import settings
@@ -14,6 +20,44 @@ engine = create_async_engine(
     pool_pre_ping=True,
 )
 
+
+
+class QueryStats:
+    """Queries executed while a QueryStats is active (normally one HTTP request)"""
+    
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.statements: Counter = Counter()
+    
+    def repeated_statements(self, threshold: int) -> list:
+        """Statement shapes run at least threshold times, most frequent first"""
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+
+
+# Set per request by QueryStatsMiddleware; the async engine runs the sync
+# event hooks in a greenlet that shares the calling task's context
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if current_query_stats.get() is not None:
+        context._query_start_time = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    started = getattr(context, "_query_start_time", None)
+    if stats is None or started is None:
+        return
+    stats.total_time += time.perf_counter() - started
+    stats.count += 1
+    # Parameters are bound separately, so identical text means identical statement shape
+    stats.statements[statement] += 1
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -0,0 +1,102 @@
+"""
+Health probes
+Liveness only says the process is serving requests. Readiness checks the
+database with a SELECT 1 under a tight timeout, and reports pool saturation
+and event-loop lag; it fails when the pool is nearly exhausted or the loop is
+falling behind, so the load balancer sheds traffic before latency collapses.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+
+
+class EventLoopLagMonitor:
+    """Background ticker measuring how late the event loop wakes it up"""
+
+    def __init__(self, interval_seconds: float = 0.5):
+        self.interval_seconds = interval_seconds
+        self.lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            self.lag_seconds = max(0.0, time.perf_counter() - expected)
+            self.max_lag_seconds = max(self.max_lag_seconds, self.lag_seconds)
+
+
+loop_monitor = EventLoopLagMonitor()
+
+
+def pool_status() -> Dict[str, Any]:
+    """Checked-out connections against the pool's hard limit (size + max_overflow)"""
+    pool = engine.pool
+    # NullPool/StaticPool (tests, SQLite) have no sizing to report
+    if not hasattr(pool, "checkedout"):
+        return {"checked_out": None, "capacity": None, "saturation": 0.0}
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+async def _ping_database() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def check_readiness() -> Tuple[bool, Dict[str, Any]]:
+    """Run the readiness checks; returns (ready, details)"""
+    pool = pool_status()
+    lag_ms = round(loop_monitor.lag_seconds * 1000, 1)
+    details: Dict[str, Any] = {"pool": pool, "event_loop_lag_ms": lag_ms}
+    problems = []
+
+    if pool["saturation"] >= settings.HEALTH_POOL_SATURATION_THRESHOLD:
+        # Don't queue for a connection just to prove the pool is exhausted
+        problems.append("pool saturated")
+        details["database"] = "skipped"
+    else:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(_ping_database(), timeout=settings.HEALTH_DB_TIMEOUT_SECONDS)
+            details["database"] = "connected"
+        except asyncio.TimeoutError:
+            details["database"] = "timeout"
+            problems.append("database timeout")
+        except Exception as e:
+            details["database"] = "error"
+            problems.append(f"database error: {type(e).__name__}")
+        details["database_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    if lag_ms > settings.HEALTH_MAX_LOOP_LAG_MS:
+        problems.append("event loop lagging")
+
+    details["status"] = "unready" if problems else "ready"
+    if problems:
+        details["problems"] = problems
+    return not problems, details
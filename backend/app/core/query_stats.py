@@ -0,0 +1,75 @@
+"""
+Per-request query instrumentation
+Counts the SQL statements and DB time of each request (see the engine hooks
+in app.core.database), warns when a route goes over QUERY_BUDGET_PER_REQUEST
+and flags statements repeated QUERY_REPEAT_THRESHOLD or more times as probable
+N+1 queries. In DEBUG (or with QUERY_STATS_HEADERS) the numbers are also
+returned as response headers.
+"""
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Activate a QueryStats for each HTTP request and report on it"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        budget: int = None,
+        repeat_threshold: int = None,
+        expose_headers: bool = None
+    ):
+        self.app = app
+        self.budget = budget if budget is not None else settings.QUERY_BUDGET_PER_REQUEST
+        self.repeat_threshold = repeat_threshold if repeat_threshold is not None else settings.QUERY_REPEAT_THRESHOLD
+        if expose_headers is None:
+            expose_headers = settings.DEBUG or settings.QUERY_STATS_HEADERS
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.total_time * 1000:.1f}"
+                repeated = stats.repeated_statements(self.repeat_threshold)
+                if repeated:
+                    headers["X-DB-Repeated-Statements"] = str(len(repeated))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if self.expose_headers else send)
+        finally:
+            current_query_stats.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        route = scope.get("route")
+        label = f"{scope['method']} {route.path if route else scope['path']}"
+
+        if stats.count > self.budget:
+            logger.warning(
+                "%s ran %d queries (budget %d) in %.1f ms",
+                label, stats.count, self.budget, stats.total_time * 1000
+            )
+
+        for statement, times in stats.repeated_statements(self.repeat_threshold):
+            logger.warning(
+                "Probable N+1 in %s: statement ran %d times: %s",
+                label, times, " ".join(statement.split())[:300]
+            )
@@ -0,0 +1,190 @@
+"""
+Rate limiting
+ASGI middleware enforcing per-client request budgets on /api routes.
+Clients are identified by the user id in a valid bearer token, falling back
+to the client IP. Each route prefix in RATE_LIMIT_ROUTES gets its own budget;
+every other /api route shares RATE_LIMIT_PER_MINUTE.
+
+The default backend keeps counters in process memory, so with several workers
+each one enforces the budget separately. Set RATE_LIMIT_BACKEND to the dotted
+path of a RateLimitBackend subclass (e.g. one backed by Redis) to share
+counters between workers.
+"""
+import abc
+import importlib
+import math
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from jose import JWTError, jwt
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int  # seconds; 0 when allowed
+
+
+class RateLimitBackend(abc.ABC):
+    """Interface for counter stores"""
+
+    @abc.abstractmethod
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        """Count one request for key and report whether it fits in the budget"""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Sliding window counter kept in process memory
+    Each key stores the counts for the current and previous fixed window; the
+    previous count is weighted by how much of it still overlaps the sliding
+    window. O(1) memory per key, unlike a per-request timestamp log.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self):
+        # key -> [window index, count in that window, count in the window before]
+        self._counters: Dict[str, List[int]] = {}
+        self._hits_since_prune = 0
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        now = time.time()
+        window = int(now // window_seconds)
+        elapsed = (now % window_seconds) / window_seconds
+
+        counter = self._counters.get(key)
+        if counter is None or counter[0] < window - 1:
+            counter = [window, 0, 0]
+        elif counter[0] == window - 1:
+            counter = [window, 0, counter[1]]
+        self._counters[key] = counter
+
+        self._hits_since_prune += 1
+        if self._hits_since_prune >= self.PRUNE_EVERY:
+            self._prune(window)
+
+        _, current, previous = counter
+        used = previous * (1 - elapsed) + current
+        if used + 1 > limit:
+            return RateLimitResult(False, limit, 0, self._retry_after(now, window_seconds, limit, current, previous))
+
+        counter[1] += 1
+        return RateLimitResult(True, limit, max(0, int(limit - used - 1)), 0)
+
+    @staticmethod
+    def _retry_after(now: float, window_seconds: int, limit: int, current: int, previous: int) -> int:
+        """Seconds until the weighted count leaves room for one more request"""
+        window_start = (now // window_seconds) * window_seconds
+        if limit < 1:
+            # A zero budget never admits a request; retry no sooner than the next window
+            return max(1, math.ceil(window_start + window_seconds - now))
+        if current + 1 > limit:
+            # Wait for the next window, then for enough of this one to slide out
+            fraction = 1 - (limit - 1) / current
+            wait = window_start + window_seconds * (1 + fraction) - now
+        elif previous:
+            fraction = 1 - (limit - 1 - current) / previous
+            wait = window_start + window_seconds * fraction - now
+        else:
+            # Unreachable by the weighted count's arithmetic; wait out this window
+            wait = window_start + window_seconds - now
+        return max(1, math.ceil(wait))
+
+    def _prune(self, window: int) -> None:
+        self._hits_since_prune = 0
+        stale = [key for key, counter in self._counters.items() if counter[0] < window - 1]
+        for key in stale:
+            del self._counters[key]
+
+
+def load_backend(path: str) -> RateLimitBackend:
+    """Instantiate a backend from a dotted path like 'package.module.ClassName'"""
+    module_name, _, class_name = path.rpartition(".")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class()
+
+
+def client_identity(scope: Scope) -> str:
+    """user:<id> for requests with a valid access token, otherwise ip:<address>"""
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+                    if payload.get("sub"):
+                        return f"user:{payload['sub']}"
+                except JWTError:
+                    pass
+            break
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "ip:unknown"
+
+
+class RateLimitMiddleware:
+    """Reject requests over budget with 429 and Retry-After"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: Optional[RateLimitBackend] = None,
+        default_limit: Optional[int] = None,
+        route_limits: Optional[Dict[str, int]] = None,
+        window_seconds: int = 60,
+        path_prefix: str = "/api/"
+    ):
+        self.app = app
+        self.backend = backend or load_backend(settings.RATE_LIMIT_BACKEND)
+        self.default_limit = default_limit if default_limit is not None else settings.RATE_LIMIT_PER_MINUTE
+        limits = route_limits if route_limits is not None else settings.RATE_LIMIT_ROUTES
+        # Longest prefix first so /api/x/y wins over /api/x
+        self.route_limits: List[Tuple[str, int]] = sorted(limits.items(), key=lambda item: -len(item[0]))
+        self.window_seconds = window_seconds
+        self.path_prefix = path_prefix
+
+    def _budget(self, path: str) -> Tuple[str, int]:
+        for route, limit in self.route_limits:
+            if path == route or path.startswith(route.rstrip("/") + "/"):
+                return route, limit
+        return "default", self.default_limit
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        bucket, limit = self._budget(scope["path"])
+        result = await self.backend.hit(f"{bucket}|{client_identity(scope)}", limit, self.window_seconds)
+
+        if not result.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": f"Rate limit exceeded. Try again in {result.retry_after} seconds"},
+                headers={
+                    "Retry-After": str(result.retry_after),
+                    "X-RateLimit-Limit": str(result.limit),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(result.limit)
+                headers["X-RateLimit-Remaining"] = str(result.remaining)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,40 +1,138 @@
 """
 Security utilities for authentication and authorization
 """
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import contains_eager
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.models.user import User
+from app.models.user import User, UserRole
+from app.models.donor import DonorProfile
+from app.models.ngo import NGOProfile
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes created with a different cost than BCRYPT_ROUNDS are flagged by
+# needs_update() and transparently rehashed on the next successful login.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt is CPU-bound (~100-300 ms per call), so it runs on a dedicated,
+# size-limited thread pool instead of blocking the event loop
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_password_pool_lock = threading.Lock()
+_password_pool_stats = {"queued": 0, "running": 0, "completed": 0, "rejected": 0}
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
 
+def _truncate_password(password: str) -> str:
+    """Truncate password to 72 bytes for bcrypt compatibility"""
+    if len(password.encode('utf-8')) > 72:
+        password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
+    return password
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    # Truncate password to 72 bytes for bcrypt compatibility
-    if len(plain_password.encode('utf-8')) > 72:
-        plain_password = plain_password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context.verify(_truncate_password(plain_password), hashed_password)
 
 
 def hash_password(password: str) -> str:
     """Hash a password"""
-    # Truncate password to 72 bytes for bcrypt compatibility
-    if len(password.encode('utf-8')) > 72:
-        password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.hash(password)
+    return pwd_context.hash(_truncate_password(password))
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and return a replacement hash if the stored one uses
+    outdated settings (e.g. a different BCRYPT_ROUNDS)
+    Returns (is_valid, new_hash_or_None)
+    """
+    return pwd_context.verify_and_update(_truncate_password(plain_password), hashed_password)
+
+
+def _run_tracked(func, *args):
+    """Run a hashing call on a pool thread, keeping queue-depth counters"""
+    with _password_pool_lock:
+        _password_pool_stats["queued"] -= 1
+        _password_pool_stats["running"] += 1
+    try:
+        return func(*args)
+    finally:
+        with _password_pool_lock:
+            _password_pool_stats["running"] -= 1
+            _password_pool_stats["completed"] += 1
+
+
+async def _run_in_password_pool(func, *args):
+    """Submit a hashing call to the password pool, shedding load when the queue is full"""
+    with _password_pool_lock:
+        if _password_pool_stats["queued"] >= settings.PASSWORD_HASH_MAX_QUEUE:
+            _password_pool_stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Please try again shortly.",
+                headers={"Retry-After": "1"},
+            )
+        _password_pool_stats["queued"] += 1
+    
+    try:
+        future = _password_executor.submit(_run_tracked, func, *args)
+    except RuntimeError:
+        # The pool has been shut down
+        _release_if_cancelled(None)
+        raise
+    future.add_done_callback(_release_if_cancelled)
+    return await asyncio.wrap_future(future)
+
+
+def _release_if_cancelled(future: Optional[Future]) -> None:
+    """Take a job that never reached a pool thread back off the queue count"""
+    # Cancelling the awaiting request cancels a still-queued job, so _run_tracked never runs
+    if future is None or future.cancelled():
+        with _password_pool_lock:
+            _password_pool_stats["queued"] -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password pool (use from async handlers)"""
+    return await _run_in_password_pool(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password pool (use from async handlers)"""
+    return await _run_in_password_pool(hash_password, password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password on the password pool (use from async handlers)"""
+    return await _run_in_password_pool(verify_and_update_password, plain_password, hashed_password)
+
+
+def get_password_pool_stats() -> Dict[str, int]:
+    """Snapshot of the password pool: workers, queue depth and totals"""
+    with _password_pool_lock:
+        stats = dict(_password_pool_stats)
+    stats["workers"] = settings.PASSWORD_HASH_WORKERS
+    return stats
+
+
+def shutdown_password_pool():
+    """Stop the password pool threads (called on application shutdown)"""
+    _password_executor.shutdown(wait=False, cancel_futures=True)
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -96,9 +194,17 @@ async def get_current_user(
             detail="Could not validate credentials"
         )
     
-    # Fetch user from database
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
+    # Fetch user together with their donor/NGO profile in one joined query.
+    # FastAPI caches this dependency per request, so every profile dependency
+    # below reuses the same row instead of re-querying by user_id.
+    result = await db.execute(
+        select(User)
+        .outerjoin(User.donor_profile)
+        .outerjoin(User.ngo_profile)
+        .options(contains_eager(User.donor_profile), contains_eager(User.ngo_profile))
+        .where(User.id == int(user_id))
+    )
+    user = result.unique().scalar_one_or_none()
     
     if user is None:
         raise HTTPException(
@@ -115,6 +221,46 @@ async def get_current_user(
     return user
 
 
+async def get_current_donor_profile(current_user: User = Depends(get_current_user)) -> DonorProfile:
+    """
+    Get the current donor's profile (Donor only)
+    Usage: donor_profile: DonorProfile = Depends(get_current_donor_profile)
+    """
+    if current_user.role != UserRole.DONOR:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only donors can access this endpoint"
+        )
+    
+    if current_user.donor_profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Donor profile not found"
+        )
+    
+    return current_user.donor_profile
+
+
+async def get_current_ngo_profile(current_user: User = Depends(get_current_user)) -> NGOProfile:
+    """
+    Get the current NGO's profile (NGO only)
+    Usage: ngo_profile: NGOProfile = Depends(get_current_ngo_profile)
+    """
+    if current_user.role != UserRole.NGO:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only NGOs can access this endpoint"
+        )
+    
+    if current_user.ngo_profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="NGO profile not found"
+        )
+    
+    return current_user.ngo_profile
+
+
 def require_role(*allowed_roles: str):
     """
     Dependency factory for role-based access control
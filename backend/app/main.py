@@ -2,11 +2,21 @@
 Main FastAPI application
 """
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
 from app.core.database import init_db, close_db
+from app.core.health import check_readiness, loop_monitor
+from app.core.metrics import MetricsMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.security import shutdown_password_pool
+from app.services.audit_service import audit_writer
+from app.services.location_import_service import recover_import_jobs, stop_import_jobs
+from app.utils.gazetteer import get_gazetteer
 # Import models so Base.metadata knows about them
 from app import models  # noqa: F401
 
@@ -17,10 +27,21 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()
     print("✅ Database initialized")
+    failed_imports = await recover_import_jobs()
+    if failed_imports:
+        print(f"⚠️  Marked {failed_imports} interrupted location import job(s) as failed")
+    audit_writer.start()
+    loop_monitor.start()
+    print(f"✅ Gazetteer loaded ({get_gazetteer().size} places)")
     yield
     # Shutdown
+    await stop_import_jobs()
+    await loop_monitor.stop()
+    await audit_writer.stop()
+    print("✅ Audit log flushed")
     await close_db()
     print("✅ Database connections closed")
+    shutdown_password_pool()
 
 
 # Create FastAPI app
@@ -31,6 +52,10 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Rate limiting (added before CORS so 429 responses still carry CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -38,8 +63,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Total-Count", "X-Next-Cursor", "Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining",
+        "X-DB-Query-Count", "X-DB-Time-Ms", "X-DB-Repeated-Statements", "ETag",
+    ],
 )
 
+# Response compression (inside the instrumentation so its cost shows in latency metrics)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Per-request query counting (directly inside MetricsMiddleware and outside
+# compression, CORS and rate limiting, so it still sees every request)
+app.add_middleware(QueryStatsMiddleware)
+
+# Request counts and latency histograms (outermost, so timings cover all middleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/")
 async def root():
@@ -52,17 +93,22 @@ async def root():
     }
 
 
+@app.get("/health/live")
+async def health_live():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
 @app.get("/health")
-async def health():
-    """Detailed health check"""
-    return {
-        "status": "healthy",
-        "database": "connected"
-    }
+async def health_ready():
+    """Readiness probe: database reachable, pool not saturated, event loop keeping up"""
+    ready, details = await check_readiness()
+    return JSONResponse(details, status_code=200 if ready else 503)
 
 
 # Include routers
-from app.routers import auth, donors, ngos, ngo_locations, admin, donations, notifications, search, ratings, geocoding
+from app.routers import auth, donors, ngos, ngo_locations, admin, donations, notifications, search, ratings, geocoding, exports, analytics
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(donors.router, prefix="/api/donors", tags=["Donors"])
 app.include_router(ngos.router, prefix="/api/ngos", tags=["NGOs"])
@@ -73,5 +119,11 @@ app.include_router(notifications.router, prefix="/api/notifications", tags=["Not
 app.include_router(search.router, prefix="/api/search", tags=["Search"])
 app.include_router(ratings.router, prefix="/api/ratings", tags=["Ratings"])
 app.include_router(geocoding.router, prefix="/api", tags=["Geocoding"])
+app.include_router(exports.router, prefix="/api/exports", tags=["Exports"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
+
+if settings.METRICS_ENABLED:
+    from app.routers import metrics
+    app.include_router(metrics.router, tags=["Metrics"])
 
 # All routers included! Backend complete! 🎉
@@ -4,9 +4,12 @@ Models package - Import all models for Alembic
 from app.core.database import Base
 from app.models.user import User, UserRole
 from app.models.donor import DonorProfile
-from app.models.ngo import NGOProfile, NGOLocation, NGOLocationCapacity, NGOVerificationStatus, MealType
-from app.models.donation import DonationRequest, DonationStatus
-from app.models.rating import Rating
+from app.models.ngo import (
+    NGOProfile, NGOLocation, NGOLocationCapacity, NGOVerificationStatus, MealType,
+    LocationImportJob, LocationImportStatus
+)
+from app.models.donation import DonationRequest, DonationStatus, DonationDailyRollup, DonationHeatmapTile
+from app.models.rating import Rating, NGORatingStats
 from app.models.notification import Notification
 from app.models.audit import AuditLog
 
@@ -20,9 +23,14 @@ __all__ = [
     "NGOLocationCapacity",
     "NGOVerificationStatus",
     "MealType",
+    "LocationImportJob",
+    "LocationImportStatus",
     "DonationRequest",
     "DonationStatus",
+    "DonationDailyRollup",
+    "DonationHeatmapTile",
     "Rating",
+    "NGORatingStats",
     "Notification",
     "AuditLog",
 ]
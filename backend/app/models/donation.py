@@ -1,7 +1,7 @@
 """
 Donation request model
 """
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date, Enum as SQLEnum, Text
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, ForeignKey, DateTime, Date, Enum as SQLEnum, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -64,3 +64,55 @@ class DonationRequest(Base):
     
     def __repr__(self):
         return f"<DonationRequest #{self.id} {self.food_type} ({self.status})>"
+
+
+class DonationDailyRollup(Base):
+    """Donation counts and plates per day, location, meal type and status, maintained on every status change"""
+    __tablename__ = "donation_daily_rollups"
+    
+    date = Column(Date, primary_key=True)
+    location_id = Column(Integer, ForeignKey("ngo_locations.id", ondelete="CASCADE"), primary_key=True)
+    meal_type = Column(SQLEnum(MealType), primary_key=True)
+    status = Column(SQLEnum(DonationStatus), primary_key=True)
+    
+    # Totals
+    donation_count = Column(Integer, default=0, nullable=False)
+    plates = Column(Integer, default=0, nullable=False)
+    
+    # Metadata
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # NGO and location reports filter by location first, then date range
+        Index("ix_donation_daily_rollups_location_date", "location_id", "date"),
+    )
+    
+    def __repr__(self):
+        return f"<DonationDailyRollup {self.date} location#{self.location_id} {self.meal_type} {self.status}: {self.donation_count}>"
+
+
+class DonationHeatmapTile(Base):
+    """Completed donations per geohash cell and month, at each HEATMAP_PRECISIONS precision"""
+    __tablename__ = "donation_heatmap_tiles"
+    
+    geohash = Column(String(12), primary_key=True)
+    month = Column(Date, primary_key=True)  # first day of the month
+    precision = Column(SmallInteger, nullable=False)
+    
+    # Totals
+    donation_count = Column(Integer, default=0, nullable=False)
+    plates = Column(Integer, default=0, nullable=False)
+    
+    # Metadata
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Tiles are served by precision and geohash prefix (LIKE 'prefix%')
+        Index(
+            "ix_donation_heatmap_tiles_precision_geohash", "precision", "geohash",
+            postgresql_ops={"geohash": "varchar_pattern_ops"}
+        ),
+    )
+    
+    def __repr__(self):
+        return f"<DonationHeatmapTile {self.geohash} {self.month}: {self.donation_count}>"
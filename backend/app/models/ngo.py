@@ -1,7 +1,7 @@
 """
 NGO profile and location models
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Date, Enum as SQLEnum, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Date, Enum as SQLEnum, Text, Index, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -16,6 +16,13 @@ class NGOVerificationStatus(str, enum.Enum):
     REJECTED = "rejected"
 
 
+class LocationImportStatus(str, enum.Enum):
+    """Bulk location import job status"""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class MealType(str, enum.Enum):
     """Meal type enumeration"""
     BREAKFAST = "breakfast"
@@ -53,6 +60,23 @@ class NGOProfile(Base):
     locations = relationship("NGOLocation", back_populates="ngo", cascade="all, delete-orphan")
     ratings_received = relationship("Rating", foreign_keys="Rating.ngo_id", back_populates="ngo")
     
+    __table_args__ = (
+        # Keyset pagination for the admin listings (newest first, optionally per status)
+        Index("ix_ngo_profiles_created_at_id", "created_at", "id"),
+        Index("ix_ngo_profiles_status_created_at_id", "verification_status", "created_at", "id"),
+        # Case-insensitive prefix search (LIKE 'abc%') on name and registration number
+        Index(
+            "ix_ngo_profiles_org_name_prefix",
+            func.lower(organization_name).label("org_name_lower"),
+            postgresql_ops={"org_name_lower": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_ngo_profiles_registration_prefix",
+            func.lower(registration_number).label("registration_lower"),
+            postgresql_ops={"registration_lower": "text_pattern_ops"},
+        ),
+    )
+    
     def __repr__(self):
         return f"<NGOProfile {self.organization_name} ({self.verification_status})>"
 
@@ -77,6 +101,11 @@ class NGOLocation(Base):
     latitude = Column(Float, nullable=False, index=True)
     longitude = Column(Float, nullable=False, index=True)
     
+    # Contact details
+    contact_person = Column(String(255))
+    contact_phone = Column(String(20))
+    operating_hours = Column(String(255))
+    
     # Status
     is_active = Column(Boolean, default=True, nullable=False)
     
@@ -122,3 +151,29 @@ class NGOLocationCapacity(Base):
     __table_args__ = (
         {"sqlite_autoincrement": True},
     )
+
+
+class LocationImportJob(Base):
+    """Progress of a bulk NGO location import whose rows are geocoded in the background"""
+    __tablename__ = "location_import_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ngo_id = Column(Integer, ForeignKey("ngo_profiles.id", ondelete="CASCADE"), nullable=False, index=True)
+    filename = Column(String(255))
+    status = Column(SQLEnum(LocationImportStatus), default=LocationImportStatus.RUNNING, nullable=False)
+    
+    # Row counts: every valid row is either imported or failed once the job completes
+    total_rows = Column(Integer, nullable=False)
+    imported_count = Column(Integer, default=0, nullable=False)
+    failed_count = Column(Integer, default=0, nullable=False)
+    geocode_total = Column(Integer, default=0, nullable=False)
+    geocode_done = Column(Integer, default=0, nullable=False)
+    errors = Column(JSON)  # [{"row": n, "error": "..."}] for rows that could not be imported
+    
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True))
+    
+    def __repr__(self):
+        return f"<LocationImportJob {self.id}: {self.status}>"
@@ -1,5 +1,5 @@
 """
-Rating model
+Rating models
 """
 from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, CheckConstraint
 from sqlalchemy.sql import func
@@ -40,3 +40,39 @@ class Rating(Base):
     
     def __repr__(self):
         return f"<Rating {self.rating}★ for Donation #{self.donation_id}>"
+
+
+class NGORatingStats(Base):
+    """Precomputed rating aggregates per NGO, maintained on every rating change"""
+    __tablename__ = "ngo_rating_stats"
+    
+    ngo_id = Column(Integer, ForeignKey("ngo_profiles.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Totals
+    rating_count = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Integer, default=0, nullable=False)
+    
+    # Histogram (1-5 stars)
+    rating_1_count = Column(Integer, default=0, nullable=False)
+    rating_2_count = Column(Integer, default=0, nullable=False)
+    rating_3_count = Column(Integer, default=0, nullable=False)
+    rating_4_count = Column(Integer, default=0, nullable=False)
+    rating_5_count = Column(Integer, default=0, nullable=False)
+    
+    # Metadata
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    @property
+    def average_rating(self) -> float:
+        """Average rating rounded to 2 decimals (0.0 when unrated)"""
+        if not self.rating_count:
+            return 0.0
+        return round(self.rating_sum / self.rating_count, 2)
+    
+    @property
+    def rating_distribution(self) -> dict:
+        """Rating histogram as {stars: count}"""
+        return {stars: getattr(self, f"rating_{stars}_count") or 0 for stars in range(1, 6)}
+    
+    def __repr__(self):
+        return f"<NGORatingStats NGO#{self.ngo_id}: {self.rating_count} ratings>"
@@ -2,18 +2,22 @@
 Admin routes
 Handles admin operations including NGO verification
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import List, Dict, Any
+from sqlalchemy import select
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from app.core.database import get_db
 from app.core.security import get_current_user
-from app.models import User, NGOProfile, DonationRequest, UserRole
+from app.models import User, NGOProfile, UserRole
 from app.models.ngo import NGOVerificationStatus
 from app.schemas import NGOProfileResponse
 from app.services.notification_service import notify_ngo_verified, notify_ngo_rejected
+from app.services.audit_service import record_audit
+from app.services.stats_service import get_platform_stats, invalidate_platform_stats
+from app.services.ngo_listing_service import list_ngos_page, count_ngos, ngo_count_cache
+from app.services.location_grid_service import invalidate_location_grid
 
 router = APIRouter()
 
@@ -35,83 +39,41 @@ async def get_admin_dashboard(
 ) -> Dict[str, Any]:
     """
     Get admin dashboard statistics
+    Served from a short-lived snapshot (see ADMIN_STATS_TTL_SECONDS)
     """
-    # Count pending NGOs
-    pending_result = await db.execute(
-        select(func.count(NGOProfile.id))
-        .where(NGOProfile.verification_status == NGOVerificationStatus.PENDING)
-    )
-    pending_ngos = pending_result.scalar() or 0
-    
-    # Count verified NGOs
-    verified_result = await db.execute(
-        select(func.count(NGOProfile.id))
-        .where(NGOProfile.verification_status == NGOVerificationStatus.VERIFIED)
-    )
-    verified_ngos = verified_result.scalar() or 0
-    
-    # Count rejected NGOs
-    rejected_result = await db.execute(
-        select(func.count(NGOProfile.id))
-        .where(NGOProfile.verification_status == NGOVerificationStatus.REJECTED)
-    )
-    rejected_ngos = rejected_result.scalar() or 0
-    
-    # Count total users
-    total_users_result = await db.execute(select(func.count(User.id)))
-    total_users = total_users_result.scalar() or 0
-    
-    # Count active users
-    active_users_result = await db.execute(
-        select(func.count(User.id)).where(User.is_active == True)
-    )
-    active_users = active_users_result.scalar() or 0
-    
-    # Count total donations
-    total_donations_result = await db.execute(select(func.count(DonationRequest.id)))
-    total_donations = total_donations_result.scalar() or 0
-    
-    # Count completed donations
-    completed_donations_result = await db.execute(
-        select(func.count(DonationRequest.id))
-        .where(DonationRequest.status == "completed")
-    )
-    completed_donations = completed_donations_result.scalar() or 0
-    
-    return {
-        "pending_verifications": pending_ngos,
-        "verified_ngos": verified_ngos,
-        "rejected_ngos": rejected_ngos,
-        "total_users": total_users,
-        "active_users": active_users,
-        "total_donations": total_donations,
-        "completed_donations": completed_donations
-    }
+    return await get_platform_stats(db)
+
+
+def _set_page_headers(response: Response, total: int, next_cursor: Optional[str]) -> None:
+    """Pagination metadata goes in headers so the body stays a plain list"""
+    response.headers["X-Total-Count"] = str(total)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
 
 @router.get("/ngos/all")
 async def get_all_ngos(
-    status: str = None,
+    response: Response,
+    status_filter: Optional[NGOVerificationStatus] = Query(None, alias="status", description="Filter by verification status"),
+    search: Optional[str] = Query(None, min_length=1, max_length=100, description="Prefix of organization name or registration number"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get all NGOs, optionally filtered by verification status
+    Get NGOs newest first, optionally filtered by verification status and search prefix
+    Keyset paginated: pass the X-Next-Cursor response header as cursor for the next page
     """
-    query = select(NGOProfile)
-    
-    if status:
-        try:
-            status_enum = NGOVerificationStatus(status)
-            query = query.where(NGOProfile.verification_status == status_enum)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status. Must be one of: pending, verified, rejected"
-            )
+    try:
+        ngos, next_cursor = await list_ngos_page(db, status_filter, search, limit, cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
     
-    result = await db.execute(query.order_by(NGOProfile.created_at.desc()))
-    ngos = result.scalars().all()
+    _set_page_headers(response, await count_ngos(db, status_filter, search), next_cursor)
     
     return [
         {
@@ -130,18 +92,28 @@ async def get_all_ngos(
 
 @router.get("/ngos/pending")
 async def get_pending_ngos(
+    response: Response,
+    search: Optional[str] = Query(None, min_length=1, max_length=100, description="Prefix of organization name or registration number"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get all NGOs pending verification
+    Get NGOs pending verification, newest first
+    Keyset paginated: pass the X-Next-Cursor response header as cursor for the next page
     """
-    result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.verification_status == NGOVerificationStatus.PENDING)
-        .order_by(NGOProfile.created_at.desc())
-    )
-    pending_ngos = result.scalars().all()
+    try:
+        pending_ngos, next_cursor = await list_ngos_page(
+            db, NGOVerificationStatus.PENDING, search, limit, cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    _set_page_headers(response, await count_ngos(db, NGOVerificationStatus.PENDING, search), next_cursor)
     
     return [
         {
@@ -198,6 +170,7 @@ async def get_ngo_details(
 
 @router.post("/ngos/{ngo_id}/verify")
 async def verify_ngo(
+    request: Request,
     ngo_id: int,
     current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
@@ -246,6 +219,15 @@ async def verify_ngo(
     
     await db.commit()
     await db.refresh(ngo_profile)
+    invalidate_platform_stats()
+    ngo_count_cache.invalidate()
+    invalidate_location_grid()
+    
+    record_audit(
+        request, current_user, "ngo_verified", "ngo", ngo_id,
+        f"NGO {ngo_profile.organization_name} verified",
+        changes={"verification_status": {"from": "pending", "to": "verified"}}
+    )
     
     return {
         "message": "NGO verified successfully",
@@ -256,6 +238,7 @@ async def verify_ngo(
 
 @router.post("/ngos/{ngo_id}/reject")
 async def reject_ngo(
+    request: Request,
     ngo_id: int,
     rejection_reason: str,
     current_user: User = Depends(require_admin),
@@ -296,6 +279,15 @@ async def reject_ngo(
     
     await db.commit()
     await db.refresh(ngo_profile)
+    invalidate_platform_stats()
+    ngo_count_cache.invalidate()
+    invalidate_location_grid()
+    
+    record_audit(
+        request, current_user, "ngo_rejected", "ngo", ngo_id,
+        f"NGO {ngo_profile.organization_name} rejected: {rejection_reason}",
+        changes={"verification_status": {"from": "pending", "to": "rejected"}}
+    )
     
     return {
         "message": "NGO rejected",
@@ -0,0 +1,195 @@
+"""
+Analytics routes
+Donation totals per day, NGO, location or city and the donation heatmap,
+read only from the donation_daily_rollups and donation_heatmap_tiles
+aggregates (never from donation_requests)
+"""
+from datetime import date
+from typing import Any, Dict, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import require_admin, require_ngo_or_admin
+from app.models import User, UserRole, NGOProfile, NGOLocation, DonationStatus, DonationDailyRollup, DonationHeatmapTile
+from app.services.heatmap_service import month_start
+from app.utils import geohash
+
+router = APIRouter()
+
+COUNT_FIELDS = ["total_donations", "total_plates", "meals_donated"] + [s.value for s in DonationStatus]
+
+
+def _group_columns(group_by: str):
+    """Columns that identify a row for each grouping, in output order"""
+    if group_by == "day":
+        return [DonationDailyRollup.date.label("date")]
+    if group_by == "ngo":
+        return [NGOProfile.id.label("ngo_id"), NGOProfile.organization_name.label("ngo_name")]
+    if group_by == "location":
+        return [
+            NGOLocation.id.label("location_id"),
+            NGOLocation.location_name.label("location_name"),
+            NGOLocation.city.label("city"),
+            NGOLocation.ngo_id.label("ngo_id"),
+        ]
+    return [NGOLocation.city.label("city")]
+
+
+@router.get("/donations")
+async def get_donation_analytics(
+    start_date: date = Query(..., description="First donation date to include"),
+    end_date: date = Query(..., description="Last donation date to include"),
+    group_by: Literal["day", "ngo", "location", "city"] = Query("day"),
+    ngo_id: Optional[int] = Query(None, description="Only this NGO (admin only; NGOs always see their own)"),
+    location_id: Optional[int] = Query(None, description="Only this location"),
+    city: Optional[str] = Query(None, min_length=1, max_length=100, description="Only locations in this city"),
+    current_user: User = Depends(require_ngo_or_admin),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Donation totals grouped by day, NGO, location or city (NGO or admin)
+    meals_donated counts plates of completed donations; the status fields
+    count donations currently in each status
+    """
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+
+    if (end_date - start_date).days >= settings.ANALYTICS_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {settings.ANALYTICS_MAX_DAYS} days"
+        )
+
+    if current_user.role == UserRole.NGO:
+        if current_user.ngo_profile is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="NGO profile not found"
+            )
+        ngo_id = current_user.ngo_profile.id
+
+    group_columns = _group_columns(group_by)
+    query = select(
+        *group_columns,
+        func.sum(DonationDailyRollup.donation_count).label("total_donations"),
+        func.sum(DonationDailyRollup.plates).label("total_plates"),
+        func.sum(case(
+            (DonationDailyRollup.status == DonationStatus.COMPLETED, DonationDailyRollup.plates), else_=0
+        )).label("meals_donated"),
+        *[
+            func.sum(case(
+                (DonationDailyRollup.status == donation_status, DonationDailyRollup.donation_count), else_=0
+            )).label(donation_status.value)
+            for donation_status in DonationStatus
+        ]
+    ).where(
+        DonationDailyRollup.date >= start_date,
+        DonationDailyRollup.date <= end_date
+    )
+
+    # Locations (and NGOs for names) are only joined when a filter or grouping needs them
+    if group_by != "day" or ngo_id is not None or city is not None:
+        query = query.join(NGOLocation, DonationDailyRollup.location_id == NGOLocation.id)
+    if group_by == "ngo":
+        query = query.join(NGOProfile, NGOLocation.ngo_id == NGOProfile.id)
+
+    if ngo_id is not None:
+        query = query.where(NGOLocation.ngo_id == ngo_id)
+    if location_id is not None:
+        query = query.where(DonationDailyRollup.location_id == location_id)
+    if city is not None:
+        query = query.where(func.lower(NGOLocation.city) == city.lower())
+
+    query = query.group_by(*group_columns).order_by(*group_columns)
+    result = await db.execute(query)
+
+    rows = []
+    totals = dict.fromkeys(COUNT_FIELDS, 0)
+    for row in result.mappings():
+        item = {key: (value.isoformat() if isinstance(value, date) else value) for key, value in row.items()}
+        for field in COUNT_FIELDS:
+            item[field] = int(item[field] or 0)
+            totals[field] += item[field]
+        rows.append(item)
+
+    return {
+        "group_by": group_by,
+        "date_range": {
+            "start": start_date.isoformat(),
+            "end": end_date.isoformat()
+        },
+        "totals": totals,
+        "rows": rows
+    }
+
+
+@router.get("/heatmap")
+async def get_donation_heatmap(
+    precision: int = Query(..., description="Geohash precision of the tiles (one of HEATMAP_PRECISIONS)"),
+    prefix: str = Query("", max_length=12, description="Only tiles inside this geohash cell"),
+    start_date: date = Query(..., description="Donations from this date's month"),
+    end_date: date = Query(..., description="Donations up to this date's month"),
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Completed donations per geohash tile (Admin only)
+    Tiles are kept per month, so the range covers whole months
+    """
+    if precision not in settings.HEATMAP_PRECISIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"precision must be one of {sorted(settings.HEATMAP_PRECISIONS)}"
+        )
+
+    prefix = prefix.lower()
+    if not geohash.is_valid(prefix) or len(prefix) > precision:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="prefix must be a geohash no longer than precision"
+        )
+
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+
+    first_month, last_month = month_start(start_date), month_start(end_date)
+    query = select(
+        DonationHeatmapTile.geohash,
+        func.sum(DonationHeatmapTile.donation_count),
+        func.sum(DonationHeatmapTile.plates)
+    ).where(
+        DonationHeatmapTile.precision == precision,
+        DonationHeatmapTile.month >= first_month,
+        DonationHeatmapTile.month <= last_month
+    )
+    if prefix:
+        # Geohash characters never include LIKE wildcards
+        query = query.where(DonationHeatmapTile.geohash.like(f"{prefix}%"))
+
+    result = await db.execute(query.group_by(DonationHeatmapTile.geohash).order_by(DonationHeatmapTile.geohash))
+
+    tiles = [
+        {"geohash": cell, "donation_count": int(count), "plates": int(plates or 0), **geohash.cell(cell)}
+        for cell, count, plates in result.all()
+    ]
+
+    return {
+        "precision": precision,
+        "prefix": prefix,
+        "months": {
+            "start": first_month.isoformat(),
+            "end": last_month.isoformat()
+        },
+        "max_donation_count": max((tile["donation_count"] for tile in tiles), default=0),
+        "tiles": tiles
+    }
@@ -8,8 +8,8 @@ from sqlalchemy import select
 
 from app.core.database import get_db
 from app.core.security import (
-    hash_password, verify_password, create_access_token,
-    create_refresh_token, decode_token, get_current_user
+    hash_password_async, verify_password_async, verify_and_update_password_async,
+    create_access_token, create_refresh_token, decode_token, get_current_user
 )
 from app.models import User, DonorProfile, NGOProfile, UserRole
 from app.schemas import (
@@ -41,7 +41,7 @@ async def register_donor(
     # Create user
     user = User(
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password_async(user_data.password),
         role=UserRole.DONOR,
         is_active=True
     )
@@ -100,7 +100,7 @@ async def register_ngo(
     # Create user (inactive until verified)
     user = User(
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password_async(user_data.password),
         role=UserRole.NGO,
         is_active=False  # NGOs can't login until verified
     )
@@ -138,7 +138,11 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == credentials.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    is_valid, new_hash = False, None
+    if user:
+        is_valid, new_hash = await verify_and_update_password_async(credentials.password, user.password_hash)
+    
+    if not user or not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -150,6 +154,11 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
             detail="Account not active. Please wait for admin verification."
         )
     
+    # Transparently upgrade hashes created with a different bcrypt cost
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    
     # Generate tokens
     token_data = {"sub": str(user.id), "email": user.email, "role": user.role.value}
     access_token = create_access_token(token_data)
@@ -218,14 +227,14 @@ async def change_password(
     Change user password
     """
     # Verify old password
-    if not verify_password(password_data.old_password, current_user.password_hash):
+    if not await verify_password_async(password_data.old_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect old password"
         )
     
     # Update password
-    current_user.password_hash = hash_password(password_data.new_password)
+    current_user.password_hash = await hash_password_async(password_data.new_password)
     await db.commit()
     
     return {"message": "Password changed successfully"}
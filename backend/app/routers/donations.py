@@ -2,21 +2,32 @@
 Donation request routes
 Handles donation request creation and management
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
 from typing import List, Optional
 from datetime import date, datetime
+from collections import defaultdict
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.responses import FastJSONResponse
+from app.core.security import get_current_user, get_current_donor_profile, get_current_ngo_profile
 from app.models import (
     User, DonorProfile, NGOProfile, NGOLocation, NGOLocationCapacity,
     DonationRequest, UserRole, Notification, AuditLog
 )
 from app.models.donation import DonationStatus
 from app.models.ngo import MealType
-from app.schemas import DonationRequestCreate, DonationRequestResponse, DonationRequestUpdate
+from app.schemas import (
+    DonationRequestCreate, DonationRequestResponse, DonationRequestUpdate, DonationBulkActionRequest
+)
+from app.services.donation_service import (
+    NGO_ACTION_TRANSITIONS, get_ngo_owned_donation, load_donation_with_parties,
+    load_donations_with_parties, restore_capacity
+)
+from app.services.audit_service import record_audit
+from app.services.rollup_service import record_status_change, record_status_changes
+from app.services.heatmap_service import record_completed_donations
 from app.services.notification_service import (
     notify_donation_created, notify_donation_confirmed, notify_donation_rejected,
     notify_donation_completed, notify_donation_cancelled
@@ -28,31 +39,15 @@ router = APIRouter()
 
 @router.post("/requests", status_code=status.HTTP_201_CREATED)
 async def create_donation_request(
+    request: Request,
     donation_data: DonationRequestCreate,
     current_user: User = Depends(get_current_user),
+    donor_profile: DonorProfile = Depends(get_current_donor_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new donation request (Donor only)
     """
-    if current_user.role != UserRole.DONOR:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only donors can create donation requests"
-        )
-    
-    # Get donor profile
-    donor_result = await db.execute(
-        select(DonorProfile).where(DonorProfile.user_id == current_user.id)
-    )
-    donor_profile = donor_result.scalar_one_or_none()
-    
-    if not donor_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donor profile not found"
-        )
-    
     # Verify NGO location exists and is active
     location_result = await db.execute(
         select(NGOLocation).where(NGOLocation.id == donation_data.ngo_location_id)
@@ -109,6 +104,8 @@ async def create_donation_request(
     # Update available capacity
     capacity.current_capacity -= donation_data.quantity_plates
     
+    await record_status_change(db, donation_request)
+    
     # Flush to get the donation ID
     await db.flush()
     
@@ -133,6 +130,17 @@ async def create_donation_request(
     await db.commit()
     await db.refresh(donation_request)
     
+    record_audit(
+        request, current_user, "donation_created", "donation", donation_request.id,
+        f"Donation request for {donation_request.quantity_plates} plates created",
+        changes={
+            "ngo_location_id": donation_request.ngo_location_id,
+            "donation_date": donation_request.donation_date.isoformat(),
+            "meal_type": donation_request.meal_type.value,
+            "quantity_plates": donation_request.quantity_plates
+        }
+    )
+    
     return {
         "id": donation_request.id,
         "status": donation_request.status.value,
@@ -145,32 +153,20 @@ async def create_donation_request(
 @router.get("/requests/my-donations")
 async def get_my_donations(
     status: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    donor_profile: DonorProfile = Depends(get_current_donor_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all donation requests for the current donor
     """
-    if current_user.role != UserRole.DONOR:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only donors can access this endpoint"
-        )
-    
-    # Get donor profile
-    donor_result = await db.execute(
-        select(DonorProfile).where(DonorProfile.user_id == current_user.id)
-    )
-    donor_profile = donor_result.scalar_one_or_none()
-    
-    if not donor_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donor profile not found"
-        )
-    
-    # Build query
-    query = select(DonationRequest).where(DonationRequest.donor_id == donor_profile.id)
+    # Build query (location and NGO names joined in rather than fetched per donation)
+    query = select(
+        DonationRequest, NGOLocation.location_name, NGOProfile.organization_name
+    ).outerjoin(
+        NGOLocation, NGOLocation.id == DonationRequest.ngo_location_id
+    ).outerjoin(
+        NGOProfile, NGOProfile.id == NGOLocation.ngo_id
+    ).where(DonationRequest.donor_id == donor_profile.id)
     
     if status:
         try:
@@ -183,81 +179,44 @@ async def get_my_donations(
             )
     
     result = await db.execute(query.order_by(DonationRequest.created_at.desc()))
-    donations = result.scalars().all()
     
-    # Fetch NGO details for each donation
+    # Dates and enums are serialized by FastJSONResponse, skipping jsonable_encoder
     donation_list = []
-    for d in donations:
-        # Get NGO location details
-        location_result = await db.execute(
-            select(NGOLocation).where(NGOLocation.id == d.ngo_location_id)
-        )
-        location = location_result.scalar_one_or_none()
-        
-        ngo_name = None
-        location_name = None
-        if location:
-            # Get NGO profile
-            ngo_result = await db.execute(
-                select(NGOProfile).where(NGOProfile.id == location.ngo_id)
-            )
-            ngo = ngo_result.scalar_one_or_none()
-            if ngo:
-                ngo_name = ngo.organization_name
-            location_name = location.location_name
-        
+    for d, location_name, ngo_name in result.all():
         donation_list.append({
             "id": d.id,
             "donor_id": donor_profile.id,
             "ngo_location_id": d.ngo_location_id,
             "food_type": d.food_type,
             "quantity_plates": d.quantity_plates,
-            "meal_type": d.meal_type.value,
-            "donation_date": d.donation_date.isoformat(),
+            "meal_type": d.meal_type,
+            "donation_date": d.donation_date,
             "pickup_time_start": d.pickup_time_start,
             "pickup_time_end": d.pickup_time_end,
             "description": d.description,
             "special_instructions": d.special_instructions,
-            "status": d.status.value,
+            "status": d.status,
             "rejection_reason": d.rejection_reason,
-            "created_at": d.created_at.isoformat(),
-            "confirmed_at": d.confirmed_at.isoformat() if d.confirmed_at else None,
-            "completed_at": d.completed_at.isoformat() if d.completed_at else None,
-            "cancelled_at": d.cancelled_at.isoformat() if d.cancelled_at else None,
+            "created_at": d.created_at,
+            "confirmed_at": d.confirmed_at,
+            "completed_at": d.completed_at,
+            "cancelled_at": d.cancelled_at,
             "ngo_name": ngo_name,
             "location_name": location_name
         })
     
-    return donation_list
+    return FastJSONResponse(donation_list)
 
 
 @router.get("/requests/ngo-requests")
 async def get_ngo_requests(
     status: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all donation requests for the current NGO's locations
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
-    # Get NGO profile
-    ngo_result = await db.execute(
-        select(NGOProfile).where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     # Get all location IDs for this NGO
     location_ids_result = await db.execute(
         select(NGOLocation.id).where(NGOLocation.ngo_id == ngo_profile.id)
@@ -283,24 +242,145 @@ async def get_ngo_requests(
     result = await db.execute(query.order_by(DonationRequest.created_at.desc()))
     donations = result.scalars().all()
     
-    return [
+    return FastJSONResponse([
         {
             "id": d.id,
             "donor_id": d.donor_id,
             "ngo_location_id": d.ngo_location_id,
             "food_type": d.food_type,
             "quantity_plates": d.quantity_plates,
-            "meal_type": d.meal_type.value,
-            "donation_date": d.donation_date.isoformat(),
+            "meal_type": d.meal_type,
+            "donation_date": d.donation_date,
             "pickup_time_start": d.pickup_time_start,
             "pickup_time_end": d.pickup_time_end,
             "description": d.description,
             "special_instructions": d.special_instructions,
-            "status": d.status.value,
-            "created_at": d.created_at.isoformat()
+            "status": d.status,
+            "created_at": d.created_at
         }
         for d in donations
-    ]
+    ])
+
+
+@router.post("/requests/bulk-action")
+async def bulk_donation_action(
+    request: Request,
+    bulk_data: DonationBulkActionRequest,
+    current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Confirm, reject or complete many donation requests at once (NGO only)
+    Valid items are applied in a single transaction; returns a result per donation
+    """
+    action = bulk_data.action
+    if action == "reject" and not bulk_data.rejection_reason:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="rejection_reason is required when rejecting donations"
+        )
+    
+    required_status, new_status = NGO_ACTION_TRANSITIONS[action]
+    donation_ids = list(dict.fromkeys(bulk_data.donation_ids))
+    donations = await load_donations_with_parties(db, donation_ids, for_update=True)
+    
+    now = datetime.utcnow()
+    results = []
+    capacity_restores = defaultdict(int)
+    status_changes = []
+    
+    for donation_id in donation_ids:
+        donation = donations.get(donation_id)
+        
+        if not donation:
+            results.append({"donation_id": donation_id, "success": False, "error": "Donation request not found"})
+            continue
+        
+        if donation.ngo_location.ngo_id != ngo_profile.id:
+            results.append({"donation_id": donation_id, "success": False, "error": "Access denied"})
+            continue
+        
+        if donation.status != required_status:
+            results.append({
+                "donation_id": donation_id,
+                "success": False,
+                "error": f"Cannot {action} donation with status: {donation.status.value}"
+            })
+            continue
+        
+        donation.status = new_status
+        status_changes.append((donation, required_status))
+        ngo_name = donation.ngo_location.ngo.organization_name
+        
+        if action == "confirm":
+            donation.confirmed_at = now
+            await notify_donation_confirmed(
+                db=db,
+                donor_user_id=donation.donor.user_id,
+                ngo_name=ngo_name,
+                donation_id=donation.id,
+                location_name=donation.ngo_location.location_name
+            )
+        elif action == "reject":
+            donation.rejected_at = now
+            donation.rejection_reason = bulk_data.rejection_reason
+            capacity_restores[
+                (donation.ngo_location_id, donation.donation_date, donation.meal_type)
+            ] += donation.quantity_plates
+            await notify_donation_rejected(
+                db=db,
+                donor_user_id=donation.donor.user_id,
+                ngo_name=ngo_name,
+                donation_id=donation.id,
+                reason=bulk_data.rejection_reason
+            )
+        else:
+            donation.completed_at = now
+            await notify_donation_completed(
+                db=db,
+                donor_user_id=donation.donor.user_id,
+                ngo_name=ngo_name,
+                donation_id=donation.id,
+                quantity=donation.quantity_plates
+            )
+        
+        results.append({"donation_id": donation_id, "success": True, "status": new_status.value})
+    
+    # One capacity UPDATE per (location, date, meal) instead of one per donation
+    for (location_id, donation_date, meal_type), plates in capacity_restores.items():
+        await restore_capacity(
+            db,
+            location_id=location_id,
+            donation_date=donation_date,
+            meal_type=meal_type,
+            plates=plates
+        )
+    
+    await record_status_changes(db, status_changes)
+    if new_status == DonationStatus.COMPLETED:
+        await record_completed_donations(db, [donation for donation, _ in status_changes])
+    
+    # Notifications are only added to the session above, so they are
+    # inserted together with the status updates in this single commit
+    await db.commit()
+    
+    for result in results:
+        if result["success"]:
+            record_audit(
+                request, current_user, f"donation_{new_status.value}", "donation", result["donation_id"],
+                f"Donation request {new_status.value} (bulk)",
+                changes={"status": {"from": required_status.value, "to": new_status.value}}
+            )
+    
+    succeeded = sum(1 for r in results if r["success"])
+    return {
+        "action": action,
+        "processed": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results
+    }
 
 
 @router.get("/requests/{donation_id}")
@@ -312,10 +392,7 @@ async def get_donation_request(
     """
     Get details of a specific donation request
     """
-    result = await db.execute(
-        select(DonationRequest).where(DonationRequest.id == donation_id)
-    )
-    donation = result.scalar_one_or_none()
+    donation = await load_donation_with_parties(db, donation_id)
     
     if not donation:
         raise HTTPException(
@@ -325,51 +402,21 @@ async def get_donation_request(
     
     # Verify access (donor owns it or NGO location belongs to them)
     if current_user.role == UserRole.DONOR:
-        donor_result = await db.execute(
-            select(DonorProfile).where(DonorProfile.user_id == current_user.id)
-        )
-        donor_profile = donor_result.scalar_one_or_none()
+        donor_profile = current_user.donor_profile
         if not donor_profile or donation.donor_id != donor_profile.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied"
             )
     elif current_user.role == UserRole.NGO:
-        ngo_result = await db.execute(
-            select(NGOProfile).where(NGOProfile.user_id == current_user.id)
-        )
-        ngo_profile = ngo_result.scalar_one_or_none()
-        location_result = await db.execute(
-            select(NGOLocation).where(
-                and_(
-                    NGOLocation.id == donation.ngo_location_id,
-                    NGOLocation.ngo_id == ngo_profile.id
-                )
-            )
-        )
-        if not location_result.scalar_one_or_none():
+        ngo_profile = current_user.ngo_profile
+        if not ngo_profile or donation.ngo_location.ngo_id != ngo_profile.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied"
             )
     
-    # Get NGO location details
-    location_result = await db.execute(
-        select(NGOLocation).where(NGOLocation.id == donation.ngo_location_id)
-    )
-    location = location_result.scalar_one_or_none()
-    
-    ngo_name = None
-    location_name = None
-    if location:
-        # Get NGO profile
-        ngo_result = await db.execute(
-            select(NGOProfile).where(NGOProfile.id == location.ngo_id)
-        )
-        ngo = ngo_result.scalar_one_or_none()
-        if ngo:
-            ngo_name = ngo.organization_name
-        location_name = location.location_name
+    location = donation.ngo_location
     
     return {
         "id": donation.id,
@@ -391,186 +438,106 @@ async def get_donation_request(
         "cancelled_at": donation.cancelled_at.isoformat() if donation.cancelled_at else None,
         "created_at": donation.created_at.isoformat(),
         "updated_at": donation.updated_at.isoformat() if donation.updated_at else None,
-        "ngo_name": ngo_name,
-        "location_name": location_name
+        "ngo_name": location.ngo.organization_name,
+        "location_name": location.location_name
     }
 
 
 @router.post("/requests/{donation_id}/confirm")
 async def confirm_donation_request(
-    donation_id: int,
+    request: Request,
+    donation: DonationRequest = Depends(get_ngo_owned_donation),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Confirm a donation request (NGO only)
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can confirm donation requests"
-        )
-    
-    result = await db.execute(
-        select(DonationRequest).where(DonationRequest.id == donation_id)
-    )
-    donation = result.scalar_one_or_none()
-    
-    if not donation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donation request not found"
-        )
-    
     if donation.status != DonationStatus.PENDING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot confirm donation with status: {donation.status.value}"
         )
     
-    # Verify NGO owns this location
-    ngo_result = await db.execute(
-        select(NGOProfile).where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    location_result = await db.execute(
-        select(NGOLocation).where(
-            and_(
-                NGOLocation.id == donation.ngo_location_id,
-                NGOLocation.ngo_id == ngo_profile.id
-            )
-        )
-    )
-    if not location_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
     donation.status = DonationStatus.CONFIRMED
     donation.confirmed_at = datetime.utcnow()
-    
-    # Get donor user and NGO name for notification
-    donor_result = await db.execute(
-        select(DonorProfile).where(DonorProfile.id == donation.donor_id)
-    )
-    donor_profile = donor_result.scalar_one_or_none()
-    
-    location_result = await db.execute(
-        select(NGOLocation).where(NGOLocation.id == donation.ngo_location_id)
-    )
-    location = location_result.scalar_one_or_none()
+    await record_status_change(db, donation, DonationStatus.PENDING)
     
     # Create notification for donor
-    if donor_profile and ngo_profile and location:
-        await notify_donation_confirmed(
-            db=db,
-            donor_user_id=donor_profile.user_id,
-            ngo_name=ngo_profile.organization_name,
-            donation_id=donation_id,
-            location_name=location.location_name
-        )
+    await notify_donation_confirmed(
+        db=db,
+        donor_user_id=donation.donor.user_id,
+        ngo_name=donation.ngo_location.ngo.organization_name,
+        donation_id=donation.id,
+        location_name=donation.ngo_location.location_name
+    )
     
     await db.commit()
     
+    record_audit(
+        request, current_user, "donation_confirmed", "donation", donation.id,
+        "Donation request confirmed",
+        changes={"status": {"from": "pending", "to": "confirmed"}}
+    )
+    
     return {
         "message": "Donation request confirmed",
-        "donation_id": donation_id,
+        "donation_id": donation.id,
         "status": "confirmed"
     }
 
 
 @router.post("/requests/{donation_id}/reject")
 async def reject_donation_request(
-    donation_id: int,
+    request: Request,
     rejection_reason: str,
+    donation: DonationRequest = Depends(get_ngo_owned_donation),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Reject a donation request (NGO only)
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can reject donation requests"
-        )
-    
-    result = await db.execute(
-        select(DonationRequest).where(DonationRequest.id == donation_id)
-    )
-    donation = result.scalar_one_or_none()
-    
-    if not donation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donation request not found"
-        )
-    
     if donation.status != DonationStatus.PENDING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot reject donation with status: {donation.status.value}"
         )
     
-    # Verify NGO owns this location
-    ngo_result = await db.execute(
-        select(NGOProfile).where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    location_result = await db.execute(
-        select(NGOLocation).where(
-            and_(
-                NGOLocation.id == donation.ngo_location_id,
-                NGOLocation.ngo_id == ngo_profile.id
-            )
-        )
-    )
-    if not location_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
     donation.status = DonationStatus.REJECTED
     donation.rejected_at = datetime.utcnow()
     donation.rejection_reason = rejection_reason
+    await record_status_change(db, donation, DonationStatus.PENDING)
     
     # Restore capacity
-    capacity_result = await db.execute(
-        select(NGOLocationCapacity).where(
-            and_(
-                NGOLocationCapacity.location_id == donation.ngo_location_id,
-                NGOLocationCapacity.date == donation.donation_date,
-                NGOLocationCapacity.meal_type == donation.meal_type
-            )
-        )
+    await restore_capacity(
+        db,
+        location_id=donation.ngo_location_id,
+        donation_date=donation.donation_date,
+        meal_type=donation.meal_type,
+        plates=donation.quantity_plates
     )
-    capacity = capacity_result.scalar_one_or_none()
-    if capacity:
-        capacity.current_capacity += donation.quantity_plates
-    
-    # Get donor user for notification
-    donor_result = await db.execute(
-        select(DonorProfile).where(DonorProfile.id == donation.donor_id)
-    )
-    donor_profile = donor_result.scalar_one_or_none()
     
     # Create notification for donor
-    if donor_profile and ngo_profile:
-        await notify_donation_rejected(
-            db=db,
-            donor_user_id=donor_profile.user_id,
-            ngo_name=ngo_profile.organization_name,
-            donation_id=donation_id,
-            reason=rejection_reason
-        )
+    await notify_donation_rejected(
+        db=db,
+        donor_user_id=donation.donor.user_id,
+        ngo_name=donation.ngo_location.ngo.organization_name,
+        donation_id=donation.id,
+        reason=rejection_reason
+    )
     
     await db.commit()
     
+    record_audit(
+        request, current_user, "donation_rejected", "donation", donation.id,
+        f"Donation request rejected: {rejection_reason}",
+        changes={"status": {"from": "pending", "to": "rejected"}, "plates_restored": donation.quantity_plates}
+    )
+    
     return {
         "message": "Donation request rejected",
-        "donation_id": donation_id,
+        "donation_id": donation.id,
         "status": "rejected",
         "reason": rejection_reason
     }
@@ -578,102 +545,61 @@ async def reject_donation_request(
 
 @router.post("/requests/{donation_id}/complete")
 async def complete_donation_request(
-    donation_id: int,
+    request: Request,
+    donation: DonationRequest = Depends(get_ngo_owned_donation),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Mark a donation request as completed (NGO only)
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can complete donation requests"
-        )
-    
-    result = await db.execute(
-        select(DonationRequest).where(DonationRequest.id == donation_id)
-    )
-    donation = result.scalar_one_or_none()
-    
-    if not donation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donation request not found"
-        )
-    
     if donation.status != DonationStatus.CONFIRMED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Can only complete confirmed donations. Current status: {donation.status.value}"
         )
     
-    # Verify NGO owns this location
-    ngo_result = await db.execute(
-        select(NGOProfile).where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    location_result = await db.execute(
-        select(NGOLocation).where(
-            and_(
-                NGOLocation.id == donation.ngo_location_id,
-                NGOLocation.ngo_id == ngo_profile.id
-            )
-        )
-    )
-    if not location_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
     donation.status = DonationStatus.COMPLETED
     donation.completed_at = datetime.utcnow()
-    
-    # Get donor user for notification
-    donor_result = await db.execute(
-        select(DonorProfile).where(DonorProfile.id == donation.donor_id)
-    )
-    donor_profile = donor_result.scalar_one_or_none()
+    await record_status_change(db, donation, DonationStatus.CONFIRMED)
+    await record_completed_donations(db, [donation])
     
     # Create notification for donor
-    if donor_profile and ngo_profile:
-        await notify_donation_completed(
-            db=db,
-            donor_user_id=donor_profile.user_id,
-            ngo_name=ngo_profile.organization_name,
-            donation_id=donation_id,
-            quantity=donation.quantity_plates
-        )
+    await notify_donation_completed(
+        db=db,
+        donor_user_id=donation.donor.user_id,
+        ngo_name=donation.ngo_location.ngo.organization_name,
+        donation_id=donation.id,
+        quantity=donation.quantity_plates
+    )
     
     await db.commit()
     
+    record_audit(
+        request, current_user, "donation_completed", "donation", donation.id,
+        "Donation request marked as completed",
+        changes={"status": {"from": "confirmed", "to": "completed"}}
+    )
+    
     return {
         "message": "Donation request marked as completed",
-        "donation_id": donation_id,
+        "donation_id": donation.id,
         "status": "completed"
     }
 
 
 @router.post("/requests/{donation_id}/cancel")
 async def cancel_donation_request(
+    request: Request,
     donation_id: int,
     current_user: User = Depends(get_current_user),
+    donor_profile: DonorProfile = Depends(get_current_donor_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Cancel a donation request (Donor only)
     """
-    if current_user.role != UserRole.DONOR:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only donors can cancel donation requests"
-        )
-    
-    result = await db.execute(
-        select(DonationRequest).where(DonationRequest.id == donation_id)
-    )
-    donation = result.scalar_one_or_none()
+    donation = await load_donation_with_parties(db, donation_id, for_update=True)
     
     if not donation:
         raise HTTPException(
@@ -682,11 +608,7 @@ async def cancel_donation_request(
         )
     
     # Verify donor owns this donation
-    donor_result = await db.execute(
-        select(DonorProfile).where(DonorProfile.user_id == current_user.id)
-    )
-    donor_profile = donor_result.scalar_one_or_none()
-    if not donor_profile or donation.donor_id != donor_profile.id:
+    if donation.donor_id != donor_profile.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
@@ -698,49 +620,42 @@ async def cancel_donation_request(
             detail=f"Cannot cancel donation with status: {donation.status.value}"
         )
     
+    previous_status = donation.status
     donation.status = DonationStatus.CANCELLED
     donation.cancelled_at = datetime.utcnow()
+    await record_status_change(db, donation, previous_status)
     
     # Restore capacity if not yet confirmed
-    if donation.status == DonationStatus.PENDING:
-        capacity_result = await db.execute(
-            select(NGOLocationCapacity).where(
-                and_(
-                    NGOLocationCapacity.location_id == donation.ngo_location_id,
-                    NGOLocationCapacity.date == donation.donation_date,
-                    NGOLocationCapacity.meal_type == donation.meal_type
-                )
-            )
+    if previous_status == DonationStatus.PENDING:
+        await restore_capacity(
+            db,
+            location_id=donation.ngo_location_id,
+            donation_date=donation.donation_date,
+            meal_type=donation.meal_type,
+            plates=donation.quantity_plates
         )
-        capacity = capacity_result.scalar_one_or_none()
-        if capacity:
-            capacity.current_capacity += donation.quantity_plates
     
-    # Get NGO user for notification
-    location_result = await db.execute(
-        select(NGOLocation).where(NGOLocation.id == donation.ngo_location_id)
+    # Create notification for NGO
+    await notify_donation_cancelled(
+        db=db,
+        ngo_user_id=donation.ngo_location.ngo.user_id,
+        donor_name=donor_profile.organization_name,
+        donation_id=donation.id
     )
-    location = location_result.scalar_one_or_none()
-    
-    if location:
-        ngo_result = await db.execute(
-            select(NGOProfile).where(NGOProfile.id == location.ngo_id)
-        )
-        ngo_profile = ngo_result.scalar_one_or_none()
-        
-        # Create notification for NGO
-        if ngo_profile and donor_profile:
-            await notify_donation_cancelled(
-                db=db,
-                ngo_user_id=ngo_profile.user_id,
-                donor_name=donor_profile.organization_name,
-                donation_id=donation_id
-            )
     
     await db.commit()
     
+    record_audit(
+        request, current_user, "donation_cancelled", "donation", donation.id,
+        "Donation request cancelled by donor",
+        changes={
+            "status": {"from": previous_status.value, "to": "cancelled"},
+            "plates_restored": donation.quantity_plates if previous_status == DonationStatus.PENDING else 0
+        }
+    )
+    
     return {
         "message": "Donation request cancelled",
-        "donation_id": donation_id,
+        "donation_id": donation.id,
         "status": "cancelled"
     }
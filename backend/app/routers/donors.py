@@ -2,77 +2,45 @@
 Donor routes
 Handles donor profile management and dashboard
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import Dict, Any
 
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.models import User, DonorProfile, DonationRequest, Rating, UserRole
+from app.core.security import get_current_donor_profile
+from app.models import DonorProfile, DonationRequest, Rating
 from app.schemas import DonorProfileUpdate, DonorProfileResponse
+from app.utils.etag import compute_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
 
 @router.get("/profile", response_model=DonorProfileResponse)
 async def get_donor_profile(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    donor_profile: DonorProfile = Depends(get_current_donor_profile)
 ):
     """
     Get current donor's profile
     """
-    if current_user.role != UserRole.DONOR:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only donors can access this endpoint"
-        )
-    
-    # Get donor profile with eager loading
-    result = await db.execute(
-        select(DonorProfile)
-        .where(DonorProfile.user_id == current_user.id)
-    )
-    donor_profile = result.scalar_one_or_none()
-    
-    if not donor_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donor profile not found"
-        )
-    
+    etag = compute_etag("donor-profile", donor_profile.id, donor_profile.created_at, donor_profile.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return donor_profile
 
 
 @router.put("/profile", response_model=DonorProfileResponse)
 async def update_donor_profile(
     profile_update: DonorProfileUpdate,
-    current_user: User = Depends(get_current_user),
+    donor_profile: DonorProfile = Depends(get_current_donor_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Update current donor's profile
     """
-    if current_user.role != UserRole.DONOR:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only donors can access this endpoint"
-        )
-    
-    # Get donor profile
-    result = await db.execute(
-        select(DonorProfile)
-        .where(DonorProfile.user_id == current_user.id)
-    )
-    donor_profile = result.scalar_one_or_none()
-    
-    if not donor_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donor profile not found"
-        )
-    
     # Update fields
     update_data = profile_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
@@ -86,7 +54,7 @@ async def update_donor_profile(
 
 @router.get("/dashboard")
 async def get_donor_dashboard(
-    current_user: User = Depends(get_current_user),
+    donor_profile: DonorProfile = Depends(get_current_donor_profile),
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -99,25 +67,6 @@ async def get_donor_dashboard(
     - average_rating: Average rating received
     - total_meals_donated: Total meals across all donations
     """
-    if current_user.role != UserRole.DONOR:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only donors can access this endpoint"
-        )
-    
-    # Get donor profile first
-    donor_result = await db.execute(
-        select(DonorProfile)
-        .where(DonorProfile.user_id == current_user.id)
-    )
-    donor_profile = donor_result.scalar_one_or_none()
-    
-    if not donor_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donor profile not found"
-        )
-    
     # Get total donations count
     total_result = await db.execute(
         select(func.count(DonationRequest.id))
@@ -0,0 +1,165 @@
+"""
+Export routes
+Streams donation history as CSV or NDJSON for admins (all donations) and
+NGOs (their own locations). Rows are read through a server-side cursor in
+EXPORT_BATCH_SIZE batches and written out batch by batch, so memory stays
+flat however many rows the report covers.
+"""
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+from typing import AsyncIterator, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.responses import dumps
+from app.core.security import require_ngo_or_admin
+from app.models import User, UserRole, DonationRequest, DonationStatus, DonorProfile, NGOLocation, NGOProfile
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_COLUMNS = (
+    DonationRequest.id.label("id"),
+    DonationRequest.donation_date.label("donation_date"),
+    DonationRequest.meal_type.label("meal_type"),
+    DonationRequest.food_type.label("food_type"),
+    DonationRequest.quantity_plates.label("quantity_plates"),
+    DonationRequest.pickup_time_start.label("pickup_time_start"),
+    DonationRequest.pickup_time_end.label("pickup_time_end"),
+    DonationRequest.status.label("status"),
+    DonationRequest.donor_id.label("donor_id"),
+    DonorProfile.organization_name.label("donor_name"),
+    NGOProfile.id.label("ngo_id"),
+    NGOProfile.organization_name.label("ngo_name"),
+    DonationRequest.ngo_location_id.label("ngo_location_id"),
+    NGOLocation.location_name.label("location_name"),
+    NGOLocation.city.label("city"),
+    DonationRequest.created_at.label("created_at"),
+    DonationRequest.confirmed_at.label("confirmed_at"),
+    DonationRequest.completed_at.label("completed_at"),
+    DonationRequest.cancelled_at.label("cancelled_at"),
+    DonationRequest.rejection_reason.label("rejection_reason"),
+)
+EXPORT_FIELDS = [column.name for column in EXPORT_COLUMNS]
+
+
+# Spreadsheets evaluate cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    """
+    csv.writer would write enums as 'DonationStatus.PENDING'
+    Donor-written text that would open as a formula is prefixed with '
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+async def stream_export(query: Select, export_format: str) -> AsyncIterator[bytes]:
+    """
+    Yield the export one cursor batch at a time
+    Uses its own session: the request's session is closed once the endpoint
+    returns, before the response body is streamed.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+
+        if export_format == "csv":
+            writer.writerow(EXPORT_FIELDS)
+            yield buffer.getvalue().encode("utf-8")
+
+        async for rows in result.partitions():
+            if export_format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([_csv_value(value) for value in row] for row in rows)
+                yield buffer.getvalue().encode("utf-8")
+            else:
+                yield b"".join(dumps(dict(row._mapping)) + b"\n" for row in rows)
+
+
+@router.get("/donations")
+async def export_donations(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    start_date: Optional[date] = Query(None, description="First donation date to include"),
+    end_date: Optional[date] = Query(None, description="Last donation date to include"),
+    status_filter: Optional[DonationStatus] = Query(None, alias="status", description="Filter by donation status"),
+    location_id: Optional[int] = Query(None, description="Filter by NGO location"),
+    current_user: User = Depends(require_ngo_or_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Export donation requests as CSV or NDJSON (NGO or admin)
+    NGOs only see donations to their own locations
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+
+    query = (
+        select(*EXPORT_COLUMNS)
+        .join(DonorProfile, DonationRequest.donor_id == DonorProfile.id)
+        .join(NGOLocation, DonationRequest.ngo_location_id == NGOLocation.id)
+        .join(NGOProfile, NGOLocation.ngo_id == NGOProfile.id)
+    )
+
+    if current_user.role == UserRole.NGO:
+        if current_user.ngo_profile is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="NGO profile not found"
+            )
+        ngo_id = current_user.ngo_profile.id
+        if location_id is not None:
+            owned = await db.execute(
+                select(NGOLocation.id).where(NGOLocation.id == location_id, NGOLocation.ngo_id == ngo_id)
+            )
+            if owned.scalar_one_or_none() is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Location not found"
+                )
+        query = query.where(NGOLocation.ngo_id == ngo_id)
+
+    if location_id is not None:
+        query = query.where(DonationRequest.ngo_location_id == location_id)
+    if start_date:
+        query = query.where(DonationRequest.donation_date >= start_date)
+    if end_date:
+        query = query.where(DonationRequest.donation_date <= end_date)
+    if status_filter:
+        query = query.where(DonationRequest.status == status_filter)
+
+    query = query.order_by(DonationRequest.donation_date, DonationRequest.id)
+
+    filename = "donations"
+    if start_date or end_date:
+        filename += f"-{start_date or 'start'}-{end_date or 'end'}"
+
+    return StreamingResponse(
+        stream_export(query, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
@@ -1,11 +1,16 @@
 """
 Geocoding API endpoints
 """
-from fastapi import APIRouter, HTTPException, Query
+from collections import Counter
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Dict
 import logging
 
-from app.utils.geocoding import reverse_geocode
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.models import User
+from app.schemas import ReverseGeocodeBatchRequest
+from app.utils.geocoding import reverse_geocode, reverse_geocode_batch, round_coordinate
 
 router = APIRouter(prefix="/geocoding", tags=["geocoding"])
 logger = logging.getLogger(__name__)
@@ -20,7 +25,9 @@ async def reverse_geocode_endpoint(
     Reverse geocode coordinates to address
     
     This endpoint acts as a proxy to Nominatim API to avoid CORS issues
-    and properly set User-Agent headers
+    and properly set User-Agent headers. When Nominatim times out or fails,
+    the nearest place in the local gazetteer answers at city precision
+    (address_line1 is empty and source is "gazetteer")
     
     Args:
         lat: Latitude coordinate (-90 to 90)
@@ -34,6 +41,7 @@ async def reverse_geocode_endpoint(
         - country: Country name
         - zip_code: Postal code
         - raw_address: Full formatted address
+        - source: "nominatim" or "gazetteer"
         
     Example:
         GET /api/geocoding/reverse?lat=13.0827&lon=80.2707
@@ -45,7 +53,8 @@ async def reverse_geocode_endpoint(
             "state": "Tamil Nadu",
             "country": "India",
             "zip_code": "600001",
-            "raw_address": "Raja Muthiah Road, Chennai, Tamil Nadu, 600001, India"
+            "raw_address": "Raja Muthiah Road, Chennai, Tamil Nadu, 600001, India",
+            "source": "nominatim"
         }
     """
     try:
@@ -71,3 +80,40 @@ async def reverse_geocode_endpoint(
             status_code=500,
             detail="Failed to geocode coordinates. Please try again or enter address manually."
         )
+
+
+@router.post("/reverse/batch")
+async def reverse_geocode_batch_endpoint(
+    payload: ReverseGeocodeBatchRequest,
+    current_user: User = Depends(get_current_user)
+) -> Dict:
+    """
+    Reverse geocode up to 500 coordinates in one request
+    
+    Points are rounded to GEOCODING_COORDINATE_DECIMALS and deduplicated.
+    Cached addresses are returned straight away; the rest are looked up through
+    the shared Nominatim throttle (GEOCODING_UPSTREAM_RATE_PER_SECOND) until
+    GEOCODING_BATCH_TIMEOUT_SECONDS, so large batches may come back partial.
+    
+    Returns:
+        results: one item per input point, in order, with lat, lon,
+        status (ok, fallback, not_found or timeout), cached and address
+        (the /reverse response, or null)
+        summary: counts per status plus total, unique and cached
+        
+    Points with status "timeout" were not looked up yet; sending them again
+    later is cheap because everything resolved so far is cached.
+    """
+    points = [(point.lat, point.lon) for point in payload.points]
+    results = await reverse_geocode_batch(points, settings.GEOCODING_BATCH_TIMEOUT_SECONDS)
+
+    statuses = Counter(item["status"] for item in results)
+    summary = {
+        "total": len(results),
+        "unique": len({round_coordinate(lat, lon) for lat, lon in points}),
+        "cached": sum(1 for item in results if item["cached"]),
+        **{item_status: statuses.get(item_status, 0) for item_status in ("ok", "fallback", "not_found", "timeout")}
+    }
+    logger.info(f"Batch reverse geocoding: {summary}")
+
+    return {"results": results, "summary": summary}
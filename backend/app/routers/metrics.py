@@ -0,0 +1,72 @@
+"""
+Metrics endpoint
+Serves the in-process metrics registry in the Prometheus text format, plus
+gauges mirrored from the DB pool, caches, password pool and audit writer.
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache import all_caches
+from app.core.database import engine
+from app.core.metrics import registry
+from app.core.security import get_password_pool_stats
+from app.services.audit_service import audit_writer
+
+router = APIRouter()
+
+db_pool_connections = registry.gauge(
+    "db_pool_connections", "Database pool connections by state", ("state",)
+)
+cache_lookups = registry.gauge(
+    "cache_lookups", "Cache lookups by result since process start", ("cache", "result")
+)
+cache_hit_ratio = registry.gauge("cache_hit_ratio", "Cache hit ratio since process start", ("cache",))
+cache_entries = registry.gauge("cache_entries", "Entries currently held by a cache", ("cache",))
+password_pool = registry.gauge(
+    "password_hash_pool", "Password hashing pool workers, queue depth and totals", ("stat",)
+)
+audit_log_entries = registry.gauge(
+    "audit_log_entries", "Audit writer queue depth and totals", ("state",)
+)
+
+
+def _collect_db_pool() -> None:
+    pool = engine.pool
+    # NullPool/StaticPool (tests, SQLite) have no sizing to report
+    if not hasattr(pool, "checkedout"):
+        return
+    db_pool_connections.set(pool.size(), "size")
+    db_pool_connections.set(pool.checkedout(), "checked_out")
+    db_pool_connections.set(pool.checkedin(), "checked_in")
+    db_pool_connections.set(pool.overflow(), "overflow")
+
+
+def _collect_caches() -> None:
+    for cache in all_caches():
+        stats = cache.stats()
+        cache_lookups.set(stats["hits"], cache.name, "hit")
+        cache_lookups.set(stats["misses"], cache.name, "miss")
+        cache_hit_ratio.set(stats["hit_ratio"], cache.name)
+        cache_entries.set(stats["entries"], cache.name)
+
+
+def _collect_password_pool() -> None:
+    for stat, value in get_password_pool_stats().items():
+        password_pool.set(value, stat)
+
+
+def _collect_audit_writer() -> None:
+    for state, value in audit_writer.stats().items():
+        audit_log_entries.set(value, state)
+
+
+registry.add_collector(_collect_db_pool)
+registry.add_collector(_collect_caches)
+registry.add_collector(_collect_password_pool)
+registry.add_collector(_collect_audit_writer)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (values are per worker process)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
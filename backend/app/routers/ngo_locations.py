@@ -2,19 +2,29 @@
 NGO Location routes
 Handles NGO location and capacity management
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from typing import List
 from datetime import date
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.models import User, NGOProfile, NGOLocation, NGOLocationCapacity, UserRole
+from app.core.responses import FastJSONResponse
+from app.core.security import get_current_user, get_current_ngo_profile
+from app.models import User, NGOProfile, NGOLocation, NGOLocationCapacity, LocationImportJob, DonationRequest, Rating
 from app.models.ngo import MealType
 from app.schemas import (
     NGOLocationCreate, NGOLocationUpdate, NGOLocationResponse,
-    NGOLocationCapacityCreate, NGOLocationCapacityUpdate, NGOLocationCapacityResponse
+    NGOLocationCapacityCreate, NGOLocationCapacityUpdate, NGOLocationCapacityResponse,
+    LocationImportJobResponse
+)
+from app.services.audit_service import record_audit
+from app.services.location_grid_service import invalidate_location_grid
+from app.services.rating_stats_service import remove_ratings
+from app.services.location_import_service import (
+    ImportFileError, parse_import_file, validate_rows, start_import, fail_stale_import_jobs
 )
 
 router = APIRouter()
@@ -26,31 +36,12 @@ router = APIRouter()
 
 @router.get("/locations", response_model=List[NGOLocationResponse])
 async def list_ngo_locations(
-    current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     List all locations for the current NGO
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
-    # Get NGO profile
-    ngo_result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     # Get all locations
     locations_result = await db.execute(
         select(NGOLocation)
@@ -65,31 +56,12 @@ async def list_ngo_locations(
 @router.post("/locations", response_model=NGOLocationResponse, status_code=status.HTTP_201_CREATED)
 async def create_ngo_location(
     location_data: NGOLocationCreate,
-    current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new location for the current NGO
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
-    # Get NGO profile
-    ngo_result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     # Create location
     new_location = NGOLocation(
         ngo_id=ngo_profile.id,
@@ -99,38 +71,99 @@ async def create_ngo_location(
     db.add(new_location)
     await db.commit()
     await db.refresh(new_location)
+    invalidate_location_grid()
     
     return new_location
 
 
-@router.get("/locations/{location_id}", response_model=NGOLocationResponse)
-async def get_ngo_location(
-    location_id: int,
-    current_user: User = Depends(get_current_user),
+@router.post("/locations/import", response_model=LocationImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def import_ngo_locations(
+    file: UploadFile = File(..., description="CSV with a header row, or a JSON list of locations"),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get a specific location by ID
+    Bulk import locations for the current NGO from a CSV or JSON file
+    
+    Columns are the location fields (location_name, address_line1, address_line2,
+    city, state, country, zip_code, latitude, longitude, contact_person,
+    contact_phone, operating_hours). Every row is validated
+    first and nothing is imported if any row is invalid. Complete rows are
+    inserted right away; rows without coordinates are geocoded from their
+    address and rows missing address parts are reverse geocoded by a background
+    job. Poll GET /locations/import/{job_id} for progress.
     """
-    if current_user.role != UserRole.NGO:
+    # Read one byte past the limit to tell "at the limit" from "over it"
+    content = await file.read(settings.LOCATION_IMPORT_MAX_BYTES + 1)
+    if len(content) > settings.LOCATION_IMPORT_MAX_BYTES:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File cannot be larger than {settings.LOCATION_IMPORT_MAX_BYTES} bytes"
         )
     
-    # Get NGO profile
-    ngo_result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
+    try:
+        raw_rows = parse_import_file(content, file.filename or "")
+    except ImportFileError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if not raw_rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File contains no locations"
+        )
+    
+    if len(raw_rows) > settings.LOCATION_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot import more than {settings.LOCATION_IMPORT_MAX_ROWS} locations at once"
+        )
     
-    if not ngo_profile:
+    rows, errors = validate_rows(raw_rows)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=errors
+        )
+    
+    return await start_import(db, ngo_profile.id, rows, filename=file.filename)
+
+
+@router.get("/locations/import/{job_id}", response_model=LocationImportJobResponse)
+async def get_location_import(
+    job_id: int,
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Progress of a bulk location import
+    """
+    job = await db.get(LocationImportJob, job_id)
+    
+    if not job or job.ngo_id != ngo_profile.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
+            detail="Import job not found"
         )
     
+    # A job whose worker died would otherwise report "running" forever
+    if await fail_stale_import_jobs(db, job_id=job.id):
+        await db.commit()
+    
+    return job
+
+
+@router.get("/locations/{location_id}", response_model=NGOLocationResponse)
+async def get_ngo_location(
+    location_id: int,
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a specific location by ID
+    """
     # Get location
     location_result = await db.execute(
         select(NGOLocation)
@@ -154,31 +187,12 @@ async def get_ngo_location(
 async def update_ngo_location(
     location_id: int,
     location_update: NGOLocationUpdate,
-    current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Update a specific location
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
-    # Get NGO profile
-    ngo_result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     # Get location
     location_result = await db.execute(
         select(NGOLocation)
@@ -202,6 +216,7 @@ async def update_ngo_location(
     
     await db.commit()
     await db.refresh(location)
+    invalidate_location_grid()
     
     return location
 
@@ -209,31 +224,12 @@ async def update_ngo_location(
 @router.delete("/locations/{location_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_ngo_location(
     location_id: int,
-    current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a specific location
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
-    # Get NGO profile
-    ngo_result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     # Check if location exists
     location_result = await db.execute(
         select(NGOLocation)
@@ -250,9 +246,16 @@ async def delete_ngo_location(
             detail="Location not found"
         )
     
-    # Delete location (capacities will be cascaded)
+    # Ratings of the location's donations go with it; take them out of the NGO's stats first
+    await remove_ratings(
+        db,
+        Rating.donation_id.in_(select(DonationRequest.id).where(DonationRequest.ngo_location_id == location.id))
+    )
+    
+    # Delete location (capacities, donations and their ratings will be cascaded)
     await db.delete(location)
     await db.commit()
+    invalidate_location_grid()
     
     return None
 
@@ -264,31 +267,13 @@ async def delete_ngo_location(
 @router.get("/locations/{location_id}/capacity", response_model=List[NGOLocationCapacityResponse])
 async def list_location_capacity(
     location_id: int,
-    current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     List capacity for a specific location
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
     # Verify location belongs to current NGO
-    ngo_result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     location_result = await db.execute(
         select(NGOLocation)
         .where(
@@ -312,38 +297,33 @@ async def list_location_capacity(
     )
     capacities = capacity_result.scalars().all()
     
-    return capacities
+    # Rows come straight from the table, so skip re-validating them against the response model
+    return FastJSONResponse([
+        {
+            "date": c.date,
+            "meal_type": c.meal_type,
+            "total_capacity": c.total_capacity,
+            "id": c.id,
+            "location_id": c.location_id,
+            "current_capacity": c.current_capacity
+        }
+        for c in capacities
+    ])
 
 
 @router.post("/locations/{location_id}/capacity", response_model=NGOLocationCapacityResponse, status_code=status.HTTP_201_CREATED)
 async def create_location_capacity(
+    request: Request,
     location_id: int,
     capacity_data: NGOLocationCapacityCreate,
     current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Create capacity for a specific location and date/meal type
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
     # Verify location belongs to current NGO
-    ngo_result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     location_result = await db.execute(
         select(NGOLocation)
         .where(
@@ -389,39 +369,30 @@ async def create_location_capacity(
     await db.commit()
     await db.refresh(new_capacity)
     
+    record_audit(
+        request, current_user, "capacity_created", "capacity", new_capacity.id,
+        f"Capacity of {new_capacity.total_capacity} plates set for {location.location_name} "
+        f"on {new_capacity.date} ({new_capacity.meal_type.value})",
+        changes={"location_id": location_id, "total_capacity": new_capacity.total_capacity}
+    )
+    
     return new_capacity
 
 
 @router.put("/locations/{location_id}/capacity/{capacity_id}", response_model=NGOLocationCapacityResponse)
 async def update_location_capacity(
+    request: Request,
     location_id: int,
     capacity_id: int,
     capacity_update: NGOLocationCapacityUpdate,
     current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Update capacity for a specific location
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
     # Verify location belongs to current NGO
-    ngo_result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     location_result = await db.execute(
         select(NGOLocation)
         .where(
@@ -455,44 +426,38 @@ async def update_location_capacity(
     
     # Update fields
     update_data = capacity_update.model_dump(exclude_unset=True)
+    changes = {
+        field: {"from": getattr(capacity, field), "to": value}
+        for field, value in update_data.items()
+    }
     for field, value in update_data.items():
         setattr(capacity, field, value)
     
     await db.commit()
     await db.refresh(capacity)
     
+    record_audit(
+        request, current_user, "capacity_updated", "capacity", capacity.id,
+        f"Capacity updated for {location.location_name} on {capacity.date} ({capacity.meal_type.value})",
+        changes=jsonable_encoder(changes)
+    )
+    
     return capacity
 
 
 @router.delete("/locations/{location_id}/capacity/{capacity_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_location_capacity(
+    request: Request,
     location_id: int,
     capacity_id: int,
     current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Delete capacity for a specific location
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
     # Verify location belongs to current NGO
-    ngo_result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     location_result = await db.execute(
         select(NGOLocation)
         .where(
@@ -528,4 +493,10 @@ async def delete_location_capacity(
     await db.delete(capacity)
     await db.commit()
     
+    record_audit(
+        request, current_user, "capacity_deleted", "capacity", capacity_id,
+        f"Capacity removed for {location.location_name} on {capacity.date} ({capacity.meal_type.value})",
+        changes={"location_id": location_id, "total_capacity": capacity.total_capacity}
+    )
+    
     return None
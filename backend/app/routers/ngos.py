@@ -2,78 +2,46 @@
 NGO routes
 Handles NGO profile management and dashboard
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import Dict, Any
 
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.models import User, NGOProfile, DonationRequest, Rating, UserRole
-from app.models.ngo import NGOVerificationStatus
+from app.core.security import get_current_ngo_profile
+from app.models import NGOProfile, DonationRequest, NGORatingStats
 from app.schemas import NGOProfileUpdate, NGOProfileResponse
+from app.services.location_grid_service import invalidate_location_grid
+from app.utils.etag import compute_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
 
 @router.get("/profile", response_model=NGOProfileResponse)
 async def get_ngo_profile(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile)
 ):
     """
     Get current NGO's profile
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
-    # Get NGO profile
-    result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
+    etag = compute_etag("ngo-profile", ngo_profile.id, ngo_profile.created_at, ngo_profile.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return ngo_profile
 
 
 @router.put("/profile", response_model=NGOProfileResponse)
 async def update_ngo_profile(
     profile_update: NGOProfileUpdate,
-    current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Update current NGO's profile
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
-    # Get NGO profile
-    result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     # Update fields (excluding verification fields that only admins can change)
     update_data = profile_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
@@ -82,12 +50,16 @@ async def update_ngo_profile(
     await db.commit()
     await db.refresh(ngo_profile)
     
+    # Map points carry the organization name
+    if "organization_name" in update_data:
+        invalidate_location_grid()
+    
     return ngo_profile
 
 
 @router.get("/dashboard")
 async def get_ngo_dashboard(
-    current_user: User = Depends(get_current_user),
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -101,25 +73,6 @@ async def get_ngo_dashboard(
     - average_rating: Average rating received
     - total_meals_received: Total meals across all donations
     """
-    if current_user.role != UserRole.NGO:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only NGOs can access this endpoint"
-        )
-    
-    # Get NGO profile first
-    ngo_result = await db.execute(
-        select(NGOProfile)
-        .where(NGOProfile.user_id == current_user.id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO profile not found"
-        )
-    
     # Get total donations count (from all NGO locations)
     from app.models import NGOLocation
     location_ids_result = await db.execute(
@@ -177,13 +130,12 @@ async def get_ngo_dashboard(
     )
     rejected_donations = rejected_result.scalar() or 0
     
-    # Get average rating received
-    rating_result = await db.execute(
-        select(func.avg(Rating.rating))
-        .where(Rating.ngo_id == ngo_profile.id)
+    # Get average rating received from precomputed stats
+    stats_result = await db.execute(
+        select(NGORatingStats).where(NGORatingStats.ngo_id == ngo_profile.id)
     )
-    avg_rating = rating_result.scalar()
-    average_rating = float(avg_rating) if avg_rating else 0.0
+    rating_stats = stats_result.scalar_one_or_none()
+    average_rating = rating_stats.average_rating if rating_stats else 0.0
     
     # Get total meals received
     meals_result = await db.execute(
@@ -196,32 +148,19 @@ async def get_ngo_dashboard(
     total_meals = meals_result.scalar()
     total_meals_received = int(total_meals) if total_meals else 0
     
-    # Get recent donations (last 5)
+    # Get recent donations (last 5) with donor and location names in the same query
     from app.models import DonorProfile
     recent_result = await db.execute(
-        select(DonationRequest)
+        select(DonationRequest, DonorProfile.organization_name, NGOLocation.location_name)
+        .join(NGOLocation, NGOLocation.id == DonationRequest.ngo_location_id)
+        .outerjoin(DonorProfile, DonorProfile.id == DonationRequest.donor_id)
         .where(DonationRequest.ngo_location_id.in_(location_ids))
         .order_by(DonationRequest.created_at.desc())
         .limit(5)
     )
-    recent_donations_raw = recent_result.scalars().all()
     
-    # Format recent donations with donor info
     recent_donations = []
-    for donation in recent_donations_raw:
-        donor_result = await db.execute(
-            select(DonorProfile)
-            .join(User)
-            .where(DonorProfile.user_id == donation.donor_id)
-        )
-        donor = donor_result.scalar_one_or_none()
-        
-        location_result = await db.execute(
-            select(NGOLocation)
-            .where(NGOLocation.id == donation.ngo_location_id)
-        )
-        location = location_result.scalar_one()
-        
+    for donation, donor_name, location_name in recent_result.all():
         recent_donations.append({
             "id": donation.id,
             "food_type": donation.food_type,
@@ -231,8 +170,8 @@ async def get_ngo_dashboard(
             "pickup_time_start": donation.pickup_time_start,
             "pickup_time_end": donation.pickup_time_end,
             "status": donation.status.value,
-            "donor_name": donor.organization_name if donor else "Unknown",
-            "location_name": location.location_name,
+            "donor_name": donor_name or "Unknown",
+            "location_name": location_name,
             "created_at": donation.created_at.isoformat()
         })
     
@@ -2,7 +2,7 @@
 Notification routes
 Handles in-app notifications for users
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, update
 from typing import List, Optional
@@ -12,12 +12,31 @@ from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models import User, Notification
 from app.schemas import NotificationResponse, NotificationListResponse
+from app.utils.etag import compute_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
 
+async def _notification_stamp(db: AsyncSession, user_id: int):
+    """
+    Total, unread count, newest id and latest read_at for a user's notifications
+    One aggregate that both versions the lists (for ETags) and provides their counts
+    """
+    result = await db.execute(
+        select(
+            func.count(),
+            func.count().filter(Notification.is_read == False),
+            func.max(Notification.id),
+            func.max(Notification.read_at)
+        ).where(Notification.user_id == user_id)
+    )
+    return result.one()
+
+
 @router.get("/", response_model=NotificationListResponse)
 async def get_notifications(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     unread_only: bool = Query(False),
@@ -27,32 +46,21 @@ async def get_notifications(
     """
     Get user's notifications with pagination
     """
+    stamp = await _notification_stamp(db, current_user.id)
+    etag = compute_etag("notifications", current_user.id, skip, limit, unread_only, *stamp)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    all_count, unread_count = stamp[0], stamp[1]
+    total = unread_count if unread_only else all_count
+    
     # Build query
     query = select(Notification).where(Notification.user_id == current_user.id)
     
     if unread_only:
         query = query.where(Notification.is_read == False)
     
-    # Get total count
-    count_query = select(func.count()).select_from(Notification).where(
-        Notification.user_id == current_user.id
-    )
-    if unread_only:
-        count_query = count_query.where(Notification.is_read == False)
-    
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Get unread count
-    unread_query = select(func.count()).select_from(Notification).where(
-        and_(
-            Notification.user_id == current_user.id,
-            Notification.is_read == False
-        )
-    )
-    unread_result = await db.execute(unread_query)
-    unread_count = unread_result.scalar()
-    
     # Get notifications
     query = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
@@ -67,6 +75,8 @@ async def get_notifications(
 
 @router.get("/unread", response_model=NotificationListResponse)
 async def get_unread_notifications(
+    request: Request,
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -74,6 +84,14 @@ async def get_unread_notifications(
     """
     Get only unread notifications (for notification bell dropdown)
     """
+    stamp = await _notification_stamp(db, current_user.id)
+    etag = compute_etag("unread-notifications", current_user.id, limit, *stamp)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    unread_count = stamp[1]
+    
     # Get unread notifications
     query = select(Notification).where(
         and_(
@@ -85,16 +103,6 @@ async def get_unread_notifications(
     result = await db.execute(query)
     notifications = result.scalars().all()
     
-    # Get unread count
-    count_query = select(func.count()).select_from(Notification).where(
-        and_(
-            Notification.user_id == current_user.id,
-            Notification.is_read == False
-        )
-    )
-    count_result = await db.execute(count_query)
-    unread_count = count_result.scalar()
-    
     return {
         "total": unread_count,
         "unread_count": unread_count,
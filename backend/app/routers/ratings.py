@@ -2,49 +2,52 @@
 Rating routes
 Handles ratings and feedback for completed donations
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select
 from typing import List, Optional
 
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.models import User, DonorProfile, NGOProfile, Rating, DonationRequest, UserRole
+from app.core.security import get_current_user, get_current_donor_profile
+from app.models import User, DonorProfile, NGOProfile, Rating, NGORatingStats, DonationRequest, UserRole
 from app.models.donation import DonationStatus
 from app.schemas import RatingCreate, RatingResponse, NGORatingsSummary
+from app.services.donation_service import load_donation_with_parties
 from app.services.notification_service import notify_rating_received
+from app.services.rating_stats_service import apply_rating_change
+from app.utils.etag import compute_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
 
+async def _get_ngo_with_rating_stats(db: AsyncSession, ngo_id: int):
+    """Fetch an NGO and its precomputed rating stats (or None) in one query"""
+    result = await db.execute(
+        select(NGOProfile, NGORatingStats)
+        .outerjoin(NGORatingStats, NGORatingStats.ngo_id == NGOProfile.id)
+        .where(NGOProfile.id == ngo_id)
+    )
+    row = result.one_or_none()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="NGO not found"
+        )
+    
+    return row
+
+
 @router.post("/", response_model=RatingResponse, status_code=status.HTTP_201_CREATED)
 async def create_rating(
     rating_data: RatingCreate,
-    current_user: User = Depends(get_current_user),
+    donor_profile: DonorProfile = Depends(get_current_donor_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Create a rating for a completed donation (Donor only)
     Can only rate once per donation
     """
-    if current_user.role != UserRole.DONOR:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only donors can create ratings"
-        )
-    
-    # Get donor profile
-    donor_result = await db.execute(
-        select(DonorProfile).where(DonorProfile.user_id == current_user.id)
-    )
-    donor_profile = donor_result.scalar_one_or_none()
-    
-    if not donor_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donor profile not found"
-        )
-    
     # Get donation
     donation_result = await db.execute(
         select(DonationRequest).where(DonationRequest.id == rating_data.donation_id)
@@ -106,6 +109,9 @@ async def create_rating(
     db.add(new_rating)
     await db.flush()
     
+    # Keep the NGO's precomputed rating stats in the same transaction
+    await apply_rating_change(db, ngo_id=location.ngo_id, rating=rating_data.rating, delta=1)
+    
     # Get NGO profile for notification
     ngo_result = await db.execute(
         select(NGOProfile).where(NGOProfile.id == location.ngo_id)
@@ -130,30 +136,12 @@ async def create_rating(
 
 @router.get("/my-ratings", response_model=List[RatingResponse])
 async def get_my_ratings(
-    current_user: User = Depends(get_current_user),
+    donor_profile: DonorProfile = Depends(get_current_donor_profile),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all ratings given by the current donor
     """
-    if current_user.role != UserRole.DONOR:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only donors can view their ratings"
-        )
-    
-    # Get donor profile
-    donor_result = await db.execute(
-        select(DonorProfile).where(DonorProfile.user_id == current_user.id)
-    )
-    donor_profile = donor_result.scalar_one_or_none()
-    
-    if not donor_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donor profile not found"
-        )
-    
     # Get all ratings by this donor
     result = await db.execute(
         select(Rating)
@@ -167,6 +155,8 @@ async def get_my_ratings(
 
 @router.get("/ngo/{ngo_id}", response_model=NGORatingsSummary)
 async def get_ngo_ratings(
+    request: Request,
+    response: Response,
     ngo_id: int,
     limit: int = Query(10, ge=1, le=50, description="Number of recent ratings to return"),
     current_user: User = Depends(get_current_user),
@@ -176,28 +166,19 @@ async def get_ngo_ratings(
     Get ratings summary for a specific NGO
     Includes average rating, distribution, and recent ratings
     """
-    # Verify NGO exists
-    ngo_result = await db.execute(
-        select(NGOProfile).where(NGOProfile.id == ngo_id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO not found"
-        )
+    # Verify NGO exists and get its precomputed rating stats
+    ngo_profile, stats = await _get_ngo_with_rating_stats(db, ngo_id)
     
-    # Get all ratings for this NGO
-    ratings_result = await db.execute(
-        select(Rating).where(Rating.ngo_id == ngo_id)
+    # Every rating create/delete bumps the stats row, so it versions the whole summary
+    etag = compute_etag(
+        "ngo-ratings", ngo_id, limit, ngo_profile.updated_at,
+        stats.rating_count if stats else 0, stats.rating_sum if stats else 0, stats.updated_at if stats else None
     )
-    all_ratings = ratings_result.scalars().all()
-    
-    # Calculate statistics
-    total_ratings = len(all_ratings)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     
-    if total_ratings == 0:
+    if not stats or stats.rating_count == 0:
         return {
             "ngo_id": ngo_id,
             "ngo_name": ngo_profile.organization_name,
@@ -207,15 +188,6 @@ async def get_ngo_ratings(
             "recent_ratings": []
         }
     
-    # Calculate average
-    total_score = sum(r.rating for r in all_ratings)
-    average_rating = round(total_score / total_ratings, 2)
-    
-    # Calculate distribution
-    rating_distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-    for rating in all_ratings:
-        rating_distribution[rating.rating] += 1
-    
     # Get recent ratings
     recent_ratings_result = await db.execute(
         select(Rating)
@@ -228,9 +200,9 @@ async def get_ngo_ratings(
     return {
         "ngo_id": ngo_id,
         "ngo_name": ngo_profile.organization_name,
-        "total_ratings": total_ratings,
-        "average_rating": average_rating,
-        "rating_distribution": rating_distribution,
+        "total_ratings": stats.rating_count,
+        "average_rating": stats.average_rating,
+        "rating_distribution": stats.rating_distribution,
         "recent_ratings": recent_ratings
     }
 
@@ -244,32 +216,13 @@ async def get_ngo_average_rating(
     """
     Get just the average rating for an NGO (lightweight endpoint)
     """
-    # Verify NGO exists
-    ngo_result = await db.execute(
-        select(NGOProfile).where(NGOProfile.id == ngo_id)
-    )
-    ngo_profile = ngo_result.scalar_one_or_none()
-    
-    if not ngo_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="NGO not found"
-        )
-    
-    # Calculate average rating using SQL
-    avg_result = await db.execute(
-        select(
-            func.count(Rating.id).label('total'),
-            func.avg(Rating.rating).label('average')
-        ).where(Rating.ngo_id == ngo_id)
-    )
-    stats = avg_result.one()
+    ngo_profile, stats = await _get_ngo_with_rating_stats(db, ngo_id)
     
     return {
         "ngo_id": ngo_id,
         "ngo_name": ngo_profile.organization_name,
-        "total_ratings": stats.total or 0,
-        "average_rating": round(float(stats.average), 2) if stats.average else 0.0
+        "total_ratings": stats.rating_count if stats else 0,
+        "average_rating": stats.average_rating if stats else 0.0
     }
 
 
@@ -282,11 +235,8 @@ async def get_donation_rating(
     """
     Get rating for a specific donation (if exists)
     """
-    # Get donation
-    donation_result = await db.execute(
-        select(DonationRequest).where(DonationRequest.id == donation_id)
-    )
-    donation = donation_result.scalar_one_or_none()
+    # Get donation with its location
+    donation = await load_donation_with_parties(db, donation_id)
     
     if not donation:
         raise HTTPException(
@@ -296,31 +246,15 @@ async def get_donation_rating(
     
     # Verify access (donor or NGO)
     if current_user.role == UserRole.DONOR:
-        donor_result = await db.execute(
-            select(DonorProfile).where(DonorProfile.user_id == current_user.id)
-        )
-        donor_profile = donor_result.scalar_one_or_none()
+        donor_profile = current_user.donor_profile
         if not donor_profile or donation.donor_id != donor_profile.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied"
             )
     elif current_user.role == UserRole.NGO:
-        from app.models import NGOLocation
-        ngo_result = await db.execute(
-            select(NGOProfile).where(NGOProfile.user_id == current_user.id)
-        )
-        ngo_profile = ngo_result.scalar_one_or_none()
-        
-        location_result = await db.execute(
-            select(NGOLocation).where(
-                and_(
-                    NGOLocation.id == donation.ngo_location_id,
-                    NGOLocation.ngo_id == ngo_profile.id
-                )
-            )
-        )
-        if not location_result.scalar_one_or_none():
+        ngo_profile = current_user.ngo_profile
+        if not ngo_profile or donation.ngo_location.ngo_id != ngo_profile.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied"
@@ -361,10 +295,7 @@ async def delete_rating(
     
     # Verify permission
     if current_user.role == UserRole.DONOR:
-        donor_result = await db.execute(
-            select(DonorProfile).where(DonorProfile.user_id == current_user.id)
-        )
-        donor_profile = donor_result.scalar_one_or_none()
+        donor_profile = current_user.donor_profile
         
         if not donor_profile or rating.donor_id != donor_profile.id:
             raise HTTPException(
@@ -377,6 +308,7 @@ async def delete_rating(
             detail="Only donors and admins can delete ratings"
         )
     
+    await apply_rating_change(db, ngo_id=rating.ngo_id, rating=rating.rating, delta=-1)
     await db.delete(rating)
     await db.commit()
     
@@ -2,17 +2,20 @@
 Search routes
 Handles NGO search with geolocation and capacity filtering
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, func, true
 from typing import List, Optional
 from datetime import date
 import math
 
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse
 from app.core.security import get_current_user
-from app.models import User, NGOProfile, NGOLocation, NGOLocationCapacity
+from app.models import User, NGOProfile, NGOLocation, NGOLocationCapacity, NGORatingStats
 from app.models.ngo import NGOVerificationStatus, MealType
+from app.services.location_grid_service import get_location_grid
+from app.utils.etag import compute_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
@@ -42,6 +45,46 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return round(distance, 2)
 
 
+def build_search_result(
+    ngo_profile: NGOProfile,
+    location: NGOLocation,
+    rating_stats: Optional[NGORatingStats],
+    distance: float,
+    available_capacity: Optional[int]
+) -> dict:
+    """Build one search_ngos result entry"""
+    # Average rating from precomputed stats
+    total_ratings = rating_stats.rating_count if rating_stats else 0
+    avg_rating = rating_stats.average_rating if total_ratings else None
+    
+    return {
+        "ngo_id": ngo_profile.id,
+        "ngo_name": ngo_profile.organization_name,
+        "location_id": location.id,
+        "location_name": location.location_name,
+        "address": {
+            "line1": location.address_line1,
+            "line2": location.address_line2,
+            "city": location.city,
+            "state": location.state,
+            "zip_code": location.zip_code,
+            "country": location.country
+        },
+        "coordinates": {
+            "latitude": location.latitude,
+            "longitude": location.longitude
+        },
+        "distance_km": distance,
+        "available_capacity": available_capacity,
+        "average_rating": avg_rating,
+        "total_ratings": total_ratings,
+        "contact": {
+            "person": ngo_profile.contact_person,
+            "phone": ngo_profile.phone
+        }
+    }
+
+
 @router.get("/ngos")
 async def search_ngos(
     latitude: float = Query(..., description="User's latitude"),
@@ -57,9 +100,14 @@ async def search_ngos(
     Search for verified NGOs within radius with optional capacity filtering
     Returns NGOs sorted by distance
     """
-    # Get all verified NGOs with active locations
-    query = select(NGOProfile, NGOLocation).join(
+    check_capacity = bool(donation_date and meal_type)
+    
+    # Get all verified NGOs with active locations, their precomputed rating stats
+    # and, when filtering by date/meal, that slot's capacity - all in one query
+    query = select(NGOProfile, NGOLocation, NGORatingStats).join(
         NGOLocation, NGOProfile.id == NGOLocation.ngo_id
+    ).outerjoin(
+        NGORatingStats, NGORatingStats.ngo_id == NGOProfile.id
     ).where(
         and_(
             NGOProfile.verification_status == NGOVerificationStatus.VERIFIED,
@@ -67,13 +115,25 @@ async def search_ngos(
         )
     )
     
+    if check_capacity:
+        query = query.add_columns(NGOLocationCapacity).outerjoin(
+            NGOLocationCapacity,
+            and_(
+                NGOLocationCapacity.location_id == NGOLocation.id,
+                NGOLocationCapacity.date == donation_date,
+                NGOLocationCapacity.meal_type == meal_type
+            )
+        )
+    
     result = await db.execute(query)
     ngo_locations = result.all()
     
     # Filter by distance and capacity
     nearby_ngos = []
     
-    for ngo_profile, location in ngo_locations:
+    for row in ngo_locations:
+        ngo_profile, location, rating_stats = row[:3]
+        
         # Calculate distance
         distance = calculate_distance(
             latitude, longitude,
@@ -86,17 +146,8 @@ async def search_ngos(
         
         # Check capacity if date and meal_type provided
         available_capacity = None
-        if donation_date and meal_type:
-            capacity_result = await db.execute(
-                select(NGOLocationCapacity).where(
-                    and_(
-                        NGOLocationCapacity.location_id == location.id,
-                        NGOLocationCapacity.date == donation_date,
-                        NGOLocationCapacity.meal_type == meal_type
-                    )
-                )
-            )
-            capacity = capacity_result.scalar_one_or_none()
+        if check_capacity:
+            capacity = row[3]
             
             if capacity:
                 available_capacity = capacity.current_capacity
@@ -109,47 +160,14 @@ async def search_ngos(
                 if min_capacity:
                     continue
         
-        # Calculate average rating
-        from app.models import Rating
-        rating_result = await db.execute(
-            select(func.avg(Rating.rating), func.count(Rating.id))
-            .where(Rating.ngo_id == ngo_profile.id)
+        nearby_ngos.append(
+            build_search_result(ngo_profile, location, rating_stats, distance, available_capacity)
         )
-        avg_rating_data = rating_result.one()
-        avg_rating = round(float(avg_rating_data[0]), 2) if avg_rating_data[0] else None
-        total_ratings = avg_rating_data[1] or 0
-        
-        nearby_ngos.append({
-            "ngo_id": ngo_profile.id,
-            "ngo_name": ngo_profile.organization_name,
-            "location_id": location.id,
-            "location_name": location.location_name,
-            "address": {
-                "line1": location.address_line1,
-                "line2": location.address_line2,
-                "city": location.city,
-                "state": location.state,
-                "zip_code": location.zip_code,
-                "country": location.country
-            },
-            "coordinates": {
-                "latitude": location.latitude,
-                "longitude": location.longitude
-            },
-            "distance_km": distance,
-            "available_capacity": available_capacity,
-            "average_rating": avg_rating,
-            "total_ratings": total_ratings,
-            "contact": {
-                "person": ngo_profile.contact_person,
-                "phone": ngo_profile.phone
-            }
-        })
     
     # Sort by distance
     nearby_ngos.sort(key=lambda x: x["distance_km"])
     
-    return {
+    return FastJSONResponse({
         "total": len(nearby_ngos),
         "search_params": {
             "latitude": latitude,
@@ -160,11 +178,69 @@ async def search_ngos(
             "min_capacity": min_capacity
         },
         "ngos": nearby_ngos
-    }
+    })
+
+
+@router.get("/clusters")
+async def get_location_clusters(
+    min_lat: float = Query(..., ge=-90, le=90, description="South edge of the map view"),
+    min_lon: float = Query(..., ge=-180, le=180, description="West edge of the map view"),
+    max_lat: float = Query(..., ge=-90, le=90, description="North edge of the map view"),
+    max_lon: float = Query(..., ge=-180, le=180, description="East edge (less than min_lon across the antimeridian)"),
+    zoom: int = Query(..., ge=0, le=22, description="Map zoom level"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Clustered NGO locations inside a map view
+    Nearby locations are grouped per grid cell with a count, centroid and
+    bounds; cells holding one location, and every location above
+    CLUSTER_MAX_ZOOM, are returned as individual points
+    """
+    if min_lat > max_lat:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_lat must be less than or equal to max_lat"
+        )
+    
+    grid = await get_location_grid(db)
+    clusters, points = grid.query(zoom, min_lat, min_lon, max_lat, max_lon)
+    
+    return FastJSONResponse({
+        "zoom": zoom,
+        "total": sum(cell.count for cell in clusters) + len(points),
+        "clusters": [
+            {
+                "latitude": round(cell.lat_sum / cell.count, 6),
+                "longitude": round(cell.lon_sum / cell.count, 6),
+                "count": cell.count,
+                "bounds": {
+                    "min_lat": cell.min_lat,
+                    "min_lon": cell.min_lon,
+                    "max_lat": cell.max_lat,
+                    "max_lon": cell.max_lon
+                }
+            }
+            for cell in clusters
+        ],
+        "points": [
+            {
+                "location_id": point.location_id,
+                "ngo_id": point.ngo_id,
+                "ngo_name": point.ngo_name,
+                "location_name": point.location_name,
+                "latitude": point.latitude,
+                "longitude": point.longitude
+            }
+            for point in points
+        ]
+    })
 
 
 @router.get("/ngos/{location_id}/availability")
 async def get_location_availability(
+    request: Request,
+    response: Response,
     location_id: int,
     start_date: date = Query(..., description="Start date for availability check"),
     end_date: date = Query(..., description="End date for availability check"),
@@ -175,27 +251,50 @@ async def get_location_availability(
     Get capacity availability for a specific location across a date range
     Useful for calendar view in frontend
     """
+    in_range = and_(
+        NGOLocationCapacity.location_id == location_id,
+        NGOLocationCapacity.date >= start_date,
+        NGOLocationCapacity.date <= end_date
+    )
+    
+    # Version stamp of the range, fetched with the location so a matching
+    # If-None-Match is answered without loading the capacity rows
+    stamp = (
+        select(
+            func.count().label("rows"),
+            func.max(func.coalesce(NGOLocationCapacity.updated_at, NGOLocationCapacity.created_at)).label("changed"),
+            func.sum(NGOLocationCapacity.current_capacity).label("current"),
+            func.sum(NGOLocationCapacity.total_capacity).label("total")
+        ).where(in_range)
+        .subquery()
+    )
+    
     # Verify location exists
     location_result = await db.execute(
-        select(NGOLocation).where(NGOLocation.id == location_id)
+        select(NGOLocation, stamp.c.rows, stamp.c.changed, stamp.c.current, stamp.c.total)
+        .join(stamp, true())
+        .where(NGOLocation.id == location_id)
     )
-    location = location_result.scalar_one_or_none()
+    row = location_result.one_or_none()
     
-    if not location:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Location not found"
         )
+    location = row[0]
+    
+    etag = compute_etag(
+        "availability", location_id, start_date, end_date, location.updated_at, *row[1:]
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     
     # Get all capacity entries in date range
     capacity_result = await db.execute(
-        select(NGOLocationCapacity).where(
-            and_(
-                NGOLocationCapacity.location_id == location_id,
-                NGOLocationCapacity.date >= start_date,
-                NGOLocationCapacity.date <= end_date
-            )
-        ).order_by(NGOLocationCapacity.date, NGOLocationCapacity.meal_type)
+        select(NGOLocationCapacity).where(in_range)
+        .order_by(NGOLocationCapacity.date, NGOLocationCapacity.meal_type)
     )
     capacities = capacity_result.scalars().all()
     
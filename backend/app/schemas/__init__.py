@@ -1,11 +1,11 @@
 """
 Pydantic schemas for request/response validation
 """
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, validator, field_validator, model_validator
+from typing import Optional, List, Literal
 from datetime import datetime, date
 from decimal import Decimal
-from app.models import UserRole, NGOVerificationStatus, DonationStatus, MealType
+from app.models import UserRole, NGOVerificationStatus, DonationStatus, MealType, LocationImportStatus
 
 
 # ===== User Schemas =====
@@ -184,6 +184,61 @@ class NGOLocationResponse(NGOLocationBase):
         from_attributes = True
 
 
+class NGOLocationImportRow(BaseModel):
+    """
+    One row of a bulk location import
+    Rows without coordinates are geocoded from their address, and rows with
+    coordinates but missing address parts are reverse geocoded
+    """
+    location_name: str = Field(..., min_length=1, max_length=255)
+    address_line1: Optional[str] = Field(None, max_length=255)
+    address_line2: Optional[str] = Field(None, max_length=255)
+    city: Optional[str] = Field(None, max_length=100)
+    state: Optional[str] = Field(None, max_length=100)
+    country: Optional[str] = Field(None, max_length=100)
+    zip_code: Optional[str] = Field(None, max_length=20)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    contact_person: Optional[str] = Field(None, max_length=255)
+    contact_phone: Optional[str] = Field(None, max_length=20)
+    operating_hours: Optional[str] = Field(None, max_length=255)
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def blank_to_none(cls, value):
+        # Empty CSV cells arrive as ""
+        if isinstance(value, str):
+            value = value.strip()
+            return value or None
+        return value
+
+    @model_validator(mode="after")
+    def check_location(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be given together")
+        if self.latitude is None and not (self.address_line1 and self.city):
+            raise ValueError("address_line1 and city are required when coordinates are missing")
+        return self
+
+
+class LocationImportJobResponse(BaseModel):
+    id: int
+    ngo_id: int
+    filename: Optional[str]
+    status: LocationImportStatus
+    total_rows: int
+    imported_count: int
+    failed_count: int
+    geocode_total: int
+    geocode_done: int
+    errors: Optional[List[dict]]
+    created_at: datetime
+    finished_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
 # ===== Capacity Schemas =====
 class CapacityBase(BaseModel):
     date: date
@@ -251,6 +306,12 @@ class DonationRequestResponse(DonationRequestBase):
         from_attributes = True
 
 
+class DonationBulkActionRequest(BaseModel):
+    donation_ids: List[int] = Field(..., min_length=1, max_length=200)
+    action: Literal["confirm", "reject", "complete"]
+    rejection_reason: Optional[str] = None
+
+
 class DonationSearchQuery(BaseModel):
     latitude: Optional[Decimal] = Field(None, ge=-90, le=90)
     longitude: Optional[Decimal] = Field(None, ge=-180, le=180)
@@ -370,6 +431,16 @@ class NGOSearchResult(BaseModel):
     average_rating: Optional[float]
 
 
+# ===== Geocoding Schemas =====
+class GeocodePoint(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+
+
+class ReverseGeocodeBatchRequest(BaseModel):
+    points: List[GeocodePoint] = Field(..., min_length=1, max_length=500)
+
+
 # Update forward references
 DonorDashboardResponse.model_rebuild()
 NGODashboardResponse.model_rebuild()
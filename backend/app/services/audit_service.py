@@ -0,0 +1,146 @@
+"""
+Audit service
+Records audit trail entries off the request path: handlers enqueue entries in
+memory and a background task writes them in multi-row INSERTs, flushing when
+AUDIT_BATCH_SIZE entries are waiting or AUDIT_FLUSH_INTERVAL_SECONDS has passed
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List
+
+from fastapi import Request
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import AuditLog, User
+
+logger = logging.getLogger(__name__)
+
+# Queued after the last entry on shutdown so the writer drains and exits
+_STOP = object()
+
+
+class AuditLogWriter:
+    """Buffered, batching writer for AuditLog rows"""
+
+    def __init__(self, batch_size: int, flush_interval: float, max_queue: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background writer on the running event loop"""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name="audit-log-writer")
+
+    async def stop(self) -> None:
+        """Write everything still queued, then stop the background writer"""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    def enqueue(self, entry: Dict[str, Any]) -> None:
+        """Queue one AuditLog row (as column values) without waiting"""
+        if self._queue is None:
+            self.dropped += 1
+            logger.warning("Audit writer not running, dropped %s entry", entry.get("action"))
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Audit queue full, dropped %s entry", entry.get("action"))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await self._queue.get()
+            if entry is _STOP:
+                return
+
+            batch = [entry]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            await self._write(batch)
+            if stopping:
+                return
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(insert(AuditLog), batch)
+                await session.commit()
+            self.written += len(batch)
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Failed to write %d audit log entries", len(batch))
+
+
+audit_writer = AuditLogWriter(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_queue=settings.AUDIT_MAX_QUEUE,
+)
+
+
+def record_audit(
+    request: Request,
+    user: Optional[User],
+    action: str,
+    entity_type: str,
+    entity_id: int,
+    description: str,
+    changes: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Queue an audit entry for an action that has been committed
+    Captures the acting user, client IP and user agent from the request
+    """
+    user_agent = request.headers.get("user-agent")
+    audit_writer.enqueue({
+        "user_id": user.id if user else None,
+        "user_email": user.email if user else None,
+        "user_role": user.role.value if user else None,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "description": description,
+        "changes": changes,
+        "ip_address": request.client.host if request.client else None,
+        "user_agent": user_agent[:500] if user_agent else None,
+        # Stamp the event time here; the row is inserted up to a flush interval later
+        "created_at": datetime.now(timezone.utc),
+    })
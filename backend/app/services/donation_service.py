@@ -0,0 +1,126 @@
+"""
+Donation service
+Loads donations together with their location, NGO and donor, and checks
+ownership in memory so state transitions cost one read plus one write.
+State transitions load with for_update=True: the donation rows stay locked
+until commit, so concurrent actions on the same donation see its new status
+instead of both passing the status check.
+"""
+from datetime import date
+from typing import Optional, List, Dict
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+
+from app.core.database import get_db
+from app.core.security import get_current_ngo_profile
+from app.models import DonationRequest, NGOProfile, NGOLocation, NGOLocationCapacity
+from app.models.donation import DonationStatus
+from app.models.ngo import MealType
+
+
+# NGO workflow actions: action -> (required current status, resulting status)
+NGO_ACTION_TRANSITIONS = {
+    "confirm": (DonationStatus.PENDING, DonationStatus.CONFIRMED),
+    "reject": (DonationStatus.PENDING, DonationStatus.REJECTED),
+    "complete": (DonationStatus.CONFIRMED, DonationStatus.COMPLETED),
+}
+
+
+def donation_with_parties_query():
+    """
+    SELECT for donations joined with their location, NGO profile and donor
+    Access them as donation.ngo_location, donation.ngo_location.ngo and donation.donor
+    """
+    return (
+        select(DonationRequest)
+        .join(DonationRequest.ngo_location)
+        .join(NGOLocation.ngo)
+        .join(DonationRequest.donor)
+        .options(
+            contains_eager(DonationRequest.ngo_location).contains_eager(NGOLocation.ngo),
+            contains_eager(DonationRequest.donor),
+        )
+    )
+
+
+def _locked(query):
+    """Lock the selected donation rows until commit and read their current state"""
+    return query.with_for_update(of=DonationRequest).execution_options(populate_existing=True)
+
+
+async def load_donation_with_parties(
+    db: AsyncSession,
+    donation_id: int,
+    for_update: bool = False
+) -> Optional[DonationRequest]:
+    """Load a single donation with its location, NGO and donor in one query"""
+    query = donation_with_parties_query().where(DonationRequest.id == donation_id)
+    if for_update:
+        query = _locked(query)
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+
+async def load_donations_with_parties(
+    db: AsyncSession,
+    donation_ids: List[int],
+    for_update: bool = False
+) -> Dict[int, DonationRequest]:
+    """Load many donations with their location, NGO and donor in one query, keyed by id"""
+    if not donation_ids:
+        return {}
+    query = donation_with_parties_query().where(DonationRequest.id.in_(donation_ids))
+    if for_update:
+        # Lock in id order so overlapping bulk actions cannot deadlock
+        query = _locked(query.order_by(DonationRequest.id))
+    result = await db.execute(query)
+    return {donation.id: donation for donation in result.scalars().all()}
+
+
+async def get_ngo_owned_donation(
+    donation_id: int,
+    ngo_profile: NGOProfile = Depends(get_current_ngo_profile),
+    db: AsyncSession = Depends(get_db)
+) -> DonationRequest:
+    """
+    Dependency for NGO-scoped donation actions
+    Returns the donation (with parties loaded and its row locked) if it
+    belongs to one of the current NGO's locations
+    """
+    donation = await load_donation_with_parties(db, donation_id, for_update=True)
+
+    if not donation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Donation request not found"
+        )
+
+    if donation.ngo_location.ngo_id != ngo_profile.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+
+    return donation
+
+
+async def restore_capacity(
+    db: AsyncSession,
+    location_id: int,
+    donation_date: date,
+    meal_type: MealType,
+    plates: int
+) -> None:
+    """Give plates back to a location's capacity with a single UPDATE (no read)"""
+    await db.execute(
+        update(NGOLocationCapacity)
+        .where(
+            NGOLocationCapacity.location_id == location_id,
+            NGOLocationCapacity.date == donation_date,
+            NGOLocationCapacity.meal_type == meal_type
+        )
+        .values(current_capacity=NGOLocationCapacity.current_capacity + plates)
+    )
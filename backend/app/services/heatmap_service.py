@@ -0,0 +1,131 @@
+"""
+Donation heatmap service
+Keeps the donation_heatmap_tiles aggregates in step with completed donations:
+each completion adds to its location's geohash cell at every
+HEATMAP_PRECISIONS precision, for the month of the donation date
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select, delete, func, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import DonationRequest, DonationStatus, DonationHeatmapTile, NGOLocation
+from app.utils import geohash
+
+TILE_KEY = ["geohash", "month"]
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + 1, 1, 1) if day.month == 12 else date(day.year, day.month + 1, 1)
+
+
+def _add_to_tiles(
+    tiles: Dict[Tuple[str, date], list],
+    latitude: float,
+    longitude: float,
+    month: date,
+    count: int,
+    plates: int
+) -> None:
+    """Add totals to the location's cell at every precision (finest hash sliced for the rest)"""
+    finest = geohash.encode(latitude, longitude, max(settings.HEATMAP_PRECISIONS))
+    for precision in settings.HEATMAP_PRECISIONS:
+        tile = tiles[(finest[:precision], month)]
+        tile[0] += count
+        tile[1] += plates
+
+
+def _tile_rows(tiles: Dict[Tuple[str, date], list]) -> list:
+    # Sorted so concurrent completions lock tile rows in the same order
+    return [
+        {"geohash": cell, "month": month, "precision": len(cell), "donation_count": count, "plates": plates}
+        for (cell, month), (count, plates) in sorted(tiles.items())
+    ]
+
+
+async def record_completed_donations(db: AsyncSession, donations: Iterable[DonationRequest]) -> None:
+    """
+    Add newly completed donations to the heatmap
+    Donations need ngo_location loaded; runs as one multi-row upsert in the
+    caller's transaction
+    """
+    tiles = defaultdict(lambda: [0, 0])
+    for donation in donations:
+        location = donation.ngo_location
+        _add_to_tiles(
+            tiles, location.latitude, location.longitude,
+            month_start(donation.donation_date), 1, donation.quantity_plates
+        )
+
+    rows = _tile_rows(tiles)
+    if not rows:
+        return
+
+    stmt = pg_insert(DonationHeatmapTile).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=TILE_KEY,
+        set_={
+            "donation_count": DonationHeatmapTile.donation_count + stmt.excluded.donation_count,
+            "plates": DonationHeatmapTile.plates + stmt.excluded.plates,
+            "updated_at": func.now(),
+        }
+    )
+    await db.execute(stmt)
+
+
+async def rebuild_heatmap_tiles(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> int:
+    """
+    Recompute the tiles from completed donations, optionally only for the
+    months covering a date range. Geohashes are computed here rather than in
+    SQL, so donations are first grouped per location and day in the database.
+    Returns the number of tile rows written
+    """
+    if db.bind.dialect.name == "postgresql":
+        # Completions made meanwhile block on the lock, then add on top of the rebuilt tiles
+        await db.execute(text(f"LOCK TABLE {DonationHeatmapTile.__tablename__} IN EXCLUSIVE MODE"))
+
+    tile_filter = []
+    donation_filter = [DonationRequest.status == DonationStatus.COMPLETED]
+    if start_date:
+        tile_filter.append(DonationHeatmapTile.month >= month_start(start_date))
+        donation_filter.append(DonationRequest.donation_date >= month_start(start_date))
+    if end_date:
+        tile_filter.append(DonationHeatmapTile.month <= month_start(end_date))
+        donation_filter.append(DonationRequest.donation_date < _next_month(end_date))
+
+    await db.execute(delete(DonationHeatmapTile).where(*tile_filter))
+
+    result = await db.stream(
+        select(
+            NGOLocation.latitude,
+            NGOLocation.longitude,
+            DonationRequest.donation_date,
+            func.count(DonationRequest.id),
+            func.sum(DonationRequest.quantity_plates)
+        )
+        .join(NGOLocation, DonationRequest.ngo_location_id == NGOLocation.id)
+        .where(*donation_filter)
+        .group_by(NGOLocation.id, NGOLocation.latitude, NGOLocation.longitude, DonationRequest.donation_date)
+    )
+
+    tiles = defaultdict(lambda: [0, 0])
+    async for latitude, longitude, donation_date, count, plates in result:
+        _add_to_tiles(tiles, latitude, longitude, month_start(donation_date), count, plates or 0)
+
+    rows = _tile_rows(tiles)
+    for start in range(0, len(rows), 1000):
+        await db.execute(insert(DonationHeatmapTile), rows[start:start + 1000])
+
+    return len(rows)
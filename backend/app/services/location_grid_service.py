@@ -0,0 +1,225 @@
+"""
+Location grid service
+Precomputed hierarchical grid over the active locations of verified NGOs,
+used to answer map clustering requests without touching the database.
+Every zoom level splits each Web Mercator map tile into CLUSTER_CELLS_PER_TILE
+x CLUSTER_CELLS_PER_TILE cells holding a count, centroid and bounds. The grid
+is rebuilt from one query when it expires or after locations change: points
+are bucketed once at the finest level and each coarser level is merged from
+the one below it.
+"""
+import asyncio
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import NGOProfile, NGOLocation
+from app.models.ngo import NGOVerificationStatus
+
+# Web Mercator stops at about +/-85.05 degrees
+MAX_LATITUDE = 85.05112878
+
+GRID_KEY = "grid"
+location_grid_cache = TTLCache(settings.CLUSTER_INDEX_TTL_SECONDS, name="location_grid")
+
+
+def mercator_xy(latitude: float, longitude: float) -> Tuple[float, float]:
+    """Project to Web Mercator, normalised to 0..1 on both axes"""
+    latitude = max(-MAX_LATITUDE, min(MAX_LATITUDE, latitude))
+    x = (longitude + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(latitude))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return min(max(x, 0.0), 1.0), min(max(y, 0.0), 1.0)
+
+
+@dataclass(slots=True)
+class GridPoint:
+    location_id: int
+    ngo_id: int
+    ngo_name: str
+    location_name: str
+    latitude: float
+    longitude: float
+    x: float
+    y: float
+
+
+@dataclass(slots=True)
+class GridCell:
+    count: int = 0
+    lat_sum: float = 0.0
+    lon_sum: float = 0.0
+    min_lat: float = 90.0
+    max_lat: float = -90.0
+    min_lon: float = 180.0
+    max_lon: float = -180.0
+    # Index into LocationGrid.points of any member, used for single-point cells
+    first: int = 0
+    # Only filled at the finest level, where points are listed individually
+    members: Optional[List[int]] = None
+
+    def add(self, point: GridPoint, index: int, keep_member: bool) -> None:
+        if not self.count:
+            self.first = index
+        self.count += 1
+        self.lat_sum += point.latitude
+        self.lon_sum += point.longitude
+        self.min_lat = min(self.min_lat, point.latitude)
+        self.max_lat = max(self.max_lat, point.latitude)
+        self.min_lon = min(self.min_lon, point.longitude)
+        self.max_lon = max(self.max_lon, point.longitude)
+        if keep_member:
+            if self.members is None:
+                self.members = []
+            self.members.append(index)
+
+    def merge(self, child: "GridCell") -> None:
+        # Runs for every occupied cell on every level, so comparisons are inlined
+        if not self.count:
+            self.first = child.first
+        self.count += child.count
+        self.lat_sum += child.lat_sum
+        self.lon_sum += child.lon_sum
+        if child.min_lat < self.min_lat:
+            self.min_lat = child.min_lat
+        if child.max_lat > self.max_lat:
+            self.max_lat = child.max_lat
+        if child.min_lon < self.min_lon:
+            self.min_lon = child.min_lon
+        if child.max_lon > self.max_lon:
+            self.max_lon = child.max_lon
+
+
+class LocationGrid:
+    """Cells per zoom level (0..max_zoom) over a fixed set of points"""
+
+    def __init__(self, points: List[GridPoint], max_zoom: int, cells_per_tile: int):
+        self.points = points
+        self.max_zoom = max_zoom
+        self.cells_per_tile = cells_per_tile
+        self.levels: List[Dict[Tuple[int, int], GridCell]] = [{} for _ in range(max_zoom + 1)]
+
+        finest = self.levels[max_zoom]
+        size = self.cells_at(max_zoom)
+        for index, point in enumerate(points):
+            key = (min(int(point.x * size), size - 1), min(int(point.y * size), size - 1))
+            cell = finest.get(key)
+            if cell is None:
+                cell = finest[key] = GridCell()
+            cell.add(point, index, keep_member=True)
+
+        # Each level has half the cells per axis of the level below
+        for zoom in range(max_zoom - 1, -1, -1):
+            parents = self.levels[zoom]
+            for (col, row), child in self.levels[zoom + 1].items():
+                parent = parents.get((col // 2, row // 2))
+                if parent is None:
+                    parent = parents[(col // 2, row // 2)] = GridCell()
+                parent.merge(child)
+
+    def cells_at(self, zoom: int) -> int:
+        return (2 ** zoom) * self.cells_per_tile
+
+    def _cells_in_bbox(
+        self,
+        zoom: int,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float
+    ) -> List[GridCell]:
+        """Cells of one level overlapping the box (min_lon > max_lon crosses the antimeridian)"""
+        cells = self.levels[zoom]
+        size = self.cells_at(zoom)
+        x0, y1 = mercator_xy(min_lat, min_lon)
+        x1, y0 = mercator_xy(max_lat, max_lon)
+        col_min, col_max = int(x0 * size), min(int(x1 * size), size - 1)
+        row_min, row_max = int(y0 * size), min(int(y1 * size), size - 1)
+
+        if col_min <= col_max:
+            columns = [(col_min, col_max)]
+        else:
+            columns = [(col_min, size - 1), (0, col_max)]
+        column_count = sum(high - low + 1 for low, high in columns)
+
+        # Walk whichever is smaller: the box's cells or the level's occupied cells
+        if column_count * (row_max - row_min + 1) <= len(cells):
+            found = []
+            for low, high in columns:
+                for col in range(low, high + 1):
+                    for row in range(row_min, row_max + 1):
+                        cell = cells.get((col, row))
+                        if cell is not None:
+                            found.append(cell)
+            return found
+
+        return [
+            cell for (col, row), cell in cells.items()
+            if row_min <= row <= row_max and any(low <= col <= high for low, high in columns)
+        ]
+
+    def query(
+        self,
+        zoom: int,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float
+    ) -> Tuple[List[GridCell], List[GridPoint]]:
+        """
+        Clusters and single points inside the box at a map zoom level
+        Above max_zoom every point is returned individually
+        """
+        level = min(zoom, self.max_zoom)
+        cells = self._cells_in_bbox(level, min_lat, min_lon, max_lat, max_lon)
+
+        if zoom > self.max_zoom:
+            crosses = min_lon > max_lon
+            points = [
+                self.points[index]
+                for cell in cells for index in cell.members
+                if min_lat <= self.points[index].latitude <= max_lat and (
+                    (self.points[index].longitude >= min_lon or self.points[index].longitude <= max_lon)
+                    if crosses else min_lon <= self.points[index].longitude <= max_lon
+                )
+            ]
+            return [], points
+
+        clusters = [cell for cell in cells if cell.count > 1]
+        points = [self.points[cell.first] for cell in cells if cell.count == 1]
+        return clusters, points
+
+
+async def _build_location_grid(db: AsyncSession) -> LocationGrid:
+    result = await db.execute(
+        select(
+            NGOLocation.id, NGOLocation.ngo_id, NGOProfile.organization_name, NGOLocation.location_name,
+            NGOLocation.latitude, NGOLocation.longitude
+        )
+        .join(NGOProfile, NGOProfile.id == NGOLocation.ngo_id)
+        .where(
+            NGOProfile.verification_status == NGOVerificationStatus.VERIFIED,
+            NGOLocation.is_active == True
+        )
+    )
+    points = [
+        GridPoint(location_id, ngo_id, ngo_name, location_name, latitude, longitude, *mercator_xy(latitude, longitude))
+        for location_id, ngo_id, ngo_name, location_name, latitude, longitude in result.all()
+    ]
+    # Building is pure CPU work (~0.5s for 20k locations); keep it off the event loop
+    return await asyncio.to_thread(LocationGrid, points, settings.CLUSTER_MAX_ZOOM, settings.CLUSTER_CELLS_PER_TILE)
+
+
+async def get_location_grid(db: AsyncSession) -> LocationGrid:
+    """The current grid, rebuilt at most once per CLUSTER_INDEX_TTL_SECONDS or invalidation"""
+    return await location_grid_cache.get_or_set(GRID_KEY, lambda: _build_location_grid(db))
+
+
+def invalidate_location_grid() -> None:
+    """Rebuild the grid on the next clustering request (call after location or NGO changes)"""
+    location_grid_cache.invalidate(GRID_KEY)
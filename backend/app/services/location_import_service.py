@@ -0,0 +1,255 @@
+"""
+Bulk NGO location import
+Parses CSV or JSON uploads into validated rows and inserts them in batches.
+Rows missing coordinates or address parts are geocoded by a background job
+whose progress is kept in location_import_jobs for polling. The map
+clustering grid is invalidated once when the import finishes, not per row.
+"""
+import asyncio
+import csv
+import io
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import NGOLocation, LocationImportJob, LocationImportStatus
+from app.schemas import NGOLocationImportRow
+from app.services.location_grid_service import invalidate_location_grid
+from app.utils.geocoding import forward_geocode, reverse_geocode
+
+logger = logging.getLogger(__name__)
+
+ADDRESS_FIELDS = ["address_line1", "city", "state", "zip_code", "country"]
+
+# Rows geocoded between progress updates
+GEOCODE_CHUNK_SIZE = 20
+
+# Background jobs running in this process by job id, referenced until they finish
+_running_jobs: Dict[int, asyncio.Task] = {}
+
+ImportRows = List[Tuple[int, NGOLocationImportRow]]
+
+
+class ImportFileError(ValueError):
+    """The upload is not a CSV or JSON list of locations"""
+
+
+def parse_import_file(content: bytes, filename: str = "") -> List[Dict[str, Any]]:
+    """
+    Raw rows from a CSV file with a header row, or a JSON list of objects
+    (optionally wrapped as {"locations": [...]}); .json files and content
+    starting with [ or { are read as JSON
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ImportFileError("File must be UTF-8 encoded")
+
+    if filename.lower().endswith(".json") or text.lstrip().startswith(("[", "{")):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ImportFileError(f"Invalid JSON: {e}")
+        if isinstance(data, dict):
+            data = data.get("locations")
+        if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+            raise ImportFileError("JSON must be a list of location objects")
+        return data
+
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or "location_name" not in reader.fieldnames:
+        raise ImportFileError("CSV must start with a header row including location_name")
+    return list(reader)
+
+
+def validate_rows(raw_rows: List[Dict[str, Any]]) -> Tuple[ImportRows, List[Dict[str, Any]]]:
+    """Validated rows and errors, both keyed by 1-based row number (excluding any CSV header)"""
+    rows = []
+    errors = []
+    for row_number, raw in enumerate(raw_rows, start=1):
+        try:
+            rows.append((row_number, NGOLocationImportRow.model_validate(raw)))
+        except ValidationError as e:
+            errors.append({"row": row_number, "error": _error_message(e)})
+    return rows, errors
+
+
+def _error_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors()
+    )
+
+
+def needs_geocoding(row: NGOLocationImportRow) -> bool:
+    return row.latitude is None or any(getattr(row, field) is None for field in ADDRESS_FIELDS)
+
+
+async def insert_locations(db: AsyncSession, ngo_id: int, rows: List[Dict[str, Any]]) -> int:
+    """Insert location rows in LOCATION_IMPORT_BATCH_SIZE batches (caller commits)"""
+    for start in range(0, len(rows), settings.LOCATION_IMPORT_BATCH_SIZE):
+        batch = rows[start:start + settings.LOCATION_IMPORT_BATCH_SIZE]
+        await db.execute(insert(NGOLocation), [{"ngo_id": ngo_id, **row} for row in batch])
+    return len(rows)
+
+
+async def start_import(
+    db: AsyncSession,
+    ngo_id: int,
+    rows: ImportRows,
+    filename: Optional[str] = None
+) -> LocationImportJob:
+    """
+    Insert the rows that are ready and record the import as a job
+    Rows needing geocoding are handed to a background job; without any the
+    job is recorded as completed straight away
+    """
+    ready = [row.model_dump() for _, row in rows if not needs_geocoding(row)]
+    pending = [(row_number, row) for row_number, row in rows if needs_geocoding(row)]
+
+    imported = await insert_locations(db, ngo_id, ready)
+    job = LocationImportJob(
+        ngo_id=ngo_id,
+        filename=filename,
+        status=LocationImportStatus.RUNNING if pending else LocationImportStatus.COMPLETED,
+        total_rows=len(rows),
+        imported_count=imported,
+        failed_count=0,
+        geocode_total=len(pending),
+        geocode_done=0,
+        errors=[],
+        finished_at=None if pending else datetime.utcnow()
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    if pending:
+        task = asyncio.create_task(_run_geocoding_job(job.id, ngo_id, pending), name=f"location-import-{job.id}")
+        _running_jobs[job.id] = task
+        task.add_done_callback(lambda _: _running_jobs.pop(job.id, None))
+    elif imported:
+        invalidate_location_grid()
+
+    return job
+
+
+async def _geocode_row(row: NGOLocationImportRow) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Location values with coordinates and address completed, or an error message"""
+    values = row.model_dump()
+    if row.latitude is None:
+        found = await forward_geocode(row.address_line1, row.city, row.state, row.zip_code, row.country)
+        if found is None:
+            return None, "Address could not be geocoded; add latitude and longitude"
+        values["latitude"], values["longitude"] = found["latitude"], found["longitude"]
+    else:
+        found = await reverse_geocode(row.latitude, row.longitude)
+        if found is None:
+            return None, "Coordinates could not be reverse geocoded; add the missing address fields"
+
+    # Only fill what the row left out
+    for field in ADDRESS_FIELDS:
+        if values[field] is None:
+            values[field] = found.get(field) or None
+
+    missing = [field for field in ADDRESS_FIELDS if values[field] is None]
+    if missing:
+        return None, f"Could not determine {', '.join(missing)}"
+
+    # Geocoded parts can exceed the column limits (e.g. a long state name)
+    try:
+        return NGOLocationImportRow.model_validate(values).model_dump(), None
+    except ValidationError as e:
+        return None, f"Geocoded address is invalid: {_error_message(e)}"
+
+
+async def _run_geocoding_job(job_id: int, ngo_id: int, pending: ImportRows) -> None:
+    """Geocode and insert pending rows chunk by chunk, updating the job's progress"""
+    try:
+        for start in range(0, len(pending), GEOCODE_CHUNK_SIZE):
+            chunk = pending[start:start + GEOCODE_CHUNK_SIZE]
+            # Lookups share the Nominatim throttle, so this only queues them
+            outcomes = await asyncio.gather(*(_geocode_row(row) for _, row in chunk))
+
+            located = []
+            errors = []
+            for (row_number, _), (values, error) in zip(chunk, outcomes):
+                if error is None:
+                    located.append(values)
+                else:
+                    errors.append({"row": row_number, "error": error})
+
+            # A session per chunk, so no connection is held while geocoding
+            async with AsyncSessionLocal() as db:
+                imported = await insert_locations(db, ngo_id, located)
+                job = await db.get(LocationImportJob, job_id)
+                job.imported_count += imported
+                job.failed_count += len(errors)
+                job.geocode_done += len(chunk)
+                job.errors = (job.errors or []) + errors
+                await db.commit()
+
+        await _finish_job(job_id, LocationImportStatus.COMPLETED)
+    except asyncio.CancelledError:
+        await _finish_job(job_id, LocationImportStatus.FAILED, "Import interrupted by server shutdown")
+        raise
+    except Exception as e:
+        logger.exception(f"Location import job {job_id} failed")
+        await _finish_job(job_id, LocationImportStatus.FAILED, f"Import failed: {e}")
+    finally:
+        invalidate_location_grid()
+
+
+async def _finish_job(job_id: int, job_status: LocationImportStatus, error: Optional[str] = None) -> None:
+    async with AsyncSessionLocal() as db:
+        job = await db.get(LocationImportJob, job_id)
+        job.status = job_status
+        job.finished_at = datetime.utcnow()
+        if error:
+            job.errors = (job.errors or []) + [{"row": None, "error": error}]
+        await db.commit()
+
+
+async def fail_stale_import_jobs(db: AsyncSession, job_id: Optional[int] = None) -> int:
+    """
+    Mark running jobs without progress for LOCATION_IMPORT_STALE_SECONDS as failed
+    A live job updates its row after every chunk, so these belong to a worker
+    that stopped without a clean shutdown. Returns the number marked (caller commits).
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.LOCATION_IMPORT_STALE_SECONDS)
+    query = select(LocationImportJob).where(
+        LocationImportJob.status == LocationImportStatus.RUNNING,
+        func.coalesce(LocationImportJob.updated_at, LocationImportJob.created_at) < cutoff
+    )
+    if job_id is not None:
+        query = query.where(LocationImportJob.id == job_id)
+
+    jobs = [job for job in (await db.execute(query)).scalars().all() if job.id not in _running_jobs]
+    for job in jobs:
+        job.status = LocationImportStatus.FAILED
+        job.finished_at = datetime.utcnow()
+        job.errors = (job.errors or []) + [{"row": None, "error": "Import interrupted: the server stopped before it finished"}]
+    return len(jobs)
+
+
+async def recover_import_jobs() -> int:
+    """Fail jobs left running by a crashed or killed worker (run at startup)"""
+    async with AsyncSessionLocal() as db:
+        failed = await fail_stale_import_jobs(db)
+        await db.commit()
+    return failed
+
+
+async def stop_import_jobs() -> None:
+    """Cancel running imports on shutdown, marking their jobs failed"""
+    tasks = list(_running_jobs.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
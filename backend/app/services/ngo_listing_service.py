@@ -0,0 +1,97 @@
+"""
+NGO listing service
+Keyset-paginated, searchable NGO listings for the admin verification screens,
+with a cached total count per filter
+"""
+from typing import Optional, List, Tuple
+
+from sqlalchemy import select, func, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import NGOProfile
+from app.models.ngo import NGOVerificationStatus
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+# Keys include free-text searches, so the number of distinct filters is unbounded
+NGO_COUNT_CACHE_MAX_ENTRIES = 1000
+ngo_count_cache = TTLCache(
+    settings.ADMIN_STATS_TTL_SECONDS, name="admin_ngo_counts", max_entries=NGO_COUNT_CACHE_MAX_ENTRIES
+)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def ngo_listing_filters(
+    verification_status: Optional[NGOVerificationStatus],
+    search: Optional[str]
+) -> list:
+    """
+    WHERE clauses for a listing
+    search is a case-insensitive prefix match on organization name or
+    registration number so it can use the text_pattern_ops indexes
+    """
+    filters = []
+    if verification_status is not None:
+        filters.append(NGOProfile.verification_status == verification_status)
+    if search:
+        pattern = _escape_like(search.strip().lower()) + "%"
+        filters.append(or_(
+            func.lower(NGOProfile.organization_name).like(pattern, escape="\\"),
+            func.lower(NGOProfile.registration_number).like(pattern, escape="\\"),
+        ))
+    return filters
+
+
+async def list_ngos_page(
+    db: AsyncSession,
+    verification_status: Optional[NGOVerificationStatus],
+    search: Optional[str],
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[NGOProfile], Optional[str]]:
+    """
+    Return one page of NGOs (newest first) and the cursor for the next page
+
+    Raises:
+        ValueError: if cursor is malformed
+    """
+    query = select(NGOProfile).where(*ngo_listing_filters(verification_status, search))
+
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = query.where(tuple_(NGOProfile.created_at, NGOProfile.id) < tuple_(created_at, last_id))
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(
+        query.order_by(NGOProfile.created_at.desc(), NGOProfile.id.desc()).limit(limit + 1)
+    )
+    ngos = list(result.scalars().all())
+
+    next_cursor = None
+    if len(ngos) > limit:
+        ngos = ngos[:limit]
+        next_cursor = encode_cursor(ngos[-1].created_at, ngos[-1].id)
+
+    return ngos, next_cursor
+
+
+async def count_ngos(
+    db: AsyncSession,
+    verification_status: Optional[NGOVerificationStatus],
+    search: Optional[str]
+) -> int:
+    """Total rows for a listing filter, cached for ADMIN_STATS_TTL_SECONDS"""
+    key = (verification_status, (search or "").strip().lower())
+
+    async def _count() -> int:
+        result = await db.execute(
+            select(func.count(NGOProfile.id)).where(*ngo_listing_filters(verification_status, search))
+        )
+        return result.scalar() or 0
+
+    return await ngo_count_cache.get_or_set(key, _count)
@@ -0,0 +1,112 @@
+"""
+Rating stats service
+Keeps the ngo_rating_stats aggregates in step with the ratings table
+"""
+from sqlalchemy import select, delete, update, func, case, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Rating, NGORatingStats
+
+
+def _histogram_column(stars: int):
+    return getattr(NGORatingStats, f"rating_{stars}_count")
+
+
+async def apply_rating_change(db: AsyncSession, ngo_id: int, rating: int, delta: int) -> None:
+    """
+    Add (delta=1) or remove (delta=-1) a single rating from an NGO's stats
+    Runs as one upsert in the caller's transaction; removals only update an
+    existing row (an NGO without one is picked up by rebuild_rating_stats)
+    """
+    histogram_key = f"rating_{rating}_count"
+    if delta < 0:
+        await db.execute(
+            update(NGORatingStats)
+            .where(NGORatingStats.ngo_id == ngo_id)
+            .values({
+                "rating_count": NGORatingStats.rating_count + delta,
+                "rating_sum": NGORatingStats.rating_sum + delta * rating,
+                histogram_key: _histogram_column(rating) + delta,
+                "updated_at": func.now(),
+            })
+        )
+        return
+
+    stmt = pg_insert(NGORatingStats).values(
+        ngo_id=ngo_id,
+        rating_count=delta,
+        rating_sum=delta * rating,
+        **{f"rating_{stars}_count": delta if stars == rating else 0 for stars in range(1, 6)}
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[NGORatingStats.ngo_id],
+        set_={
+            "rating_count": NGORatingStats.rating_count + delta,
+            "rating_sum": NGORatingStats.rating_sum + delta * rating,
+            histogram_key: _histogram_column(rating) + delta,
+            "updated_at": func.now(),
+        }
+    )
+    await db.execute(stmt)
+
+
+async def remove_ratings(db: AsyncSession, *criteria) -> None:
+    """
+    Subtract the ratings matching criteria from their NGOs' stats
+    Call before deleting rows whose cascade removes ratings (e.g. a location
+    and its donations); runs as one grouped UPDATE in the caller's transaction
+    """
+    removed = select(
+        Rating.ngo_id.label("ngo_id"),
+        func.count(Rating.id).label("rating_count"),
+        func.sum(Rating.rating).label("rating_sum"),
+        *[
+            func.sum(case((Rating.rating == stars, 1), else_=0)).label(f"rating_{stars}_count")
+            for stars in range(1, 6)
+        ]
+    ).where(*criteria).group_by(Rating.ngo_id).subquery()
+
+    await db.execute(
+        update(NGORatingStats)
+        .where(NGORatingStats.ngo_id == removed.c.ngo_id)
+        .values({
+            "rating_count": NGORatingStats.rating_count - removed.c.rating_count,
+            "rating_sum": NGORatingStats.rating_sum - removed.c.rating_sum,
+            **{
+                f"rating_{stars}_count": _histogram_column(stars) - removed.c[f"rating_{stars}_count"]
+                for stars in range(1, 6)
+            },
+            "updated_at": func.now(),
+        })
+    )
+
+
+async def rebuild_rating_stats(db: AsyncSession) -> int:
+    """
+    Recompute every NGO's stats from the ratings table
+    Returns the number of NGOs with ratings
+    """
+    if db.bind.dialect.name == "postgresql":
+        # Rating changes made meanwhile block on the lock, then apply their
+        # deltas on top of the rebuilt rows instead of being lost or doubled
+        await db.execute(text(f"LOCK TABLE {NGORatingStats.__tablename__} IN EXCLUSIVE MODE"))
+
+    await db.execute(delete(NGORatingStats))
+    
+    aggregates = select(
+        Rating.ngo_id,
+        func.count(Rating.id),
+        func.sum(Rating.rating),
+        *[func.sum(case((Rating.rating == stars, 1), else_=0)) for stars in range(1, 6)]
+    ).group_by(Rating.ngo_id)
+    
+    await db.execute(
+        insert(NGORatingStats).from_select(
+            ["ngo_id", "rating_count", "rating_sum"] + [f"rating_{stars}_count" for stars in range(1, 6)],
+            aggregates
+        )
+    )
+    
+    result = await db.execute(select(func.count()).select_from(NGORatingStats))
+    return result.scalar() or 0
@@ -0,0 +1,117 @@
+"""
+Donation rollup service
+Keeps the donation_daily_rollups aggregates in step with donation status changes
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import select, delete, func, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DonationRequest, DonationStatus, DonationDailyRollup
+
+ROLLUP_KEY = ["date", "location_id", "meal_type", "status"]
+
+
+async def record_status_changes(
+    db: AsyncSession,
+    changes: Iterable[Tuple[DonationRequest, Optional[DonationStatus]]]
+) -> None:
+    """
+    Move donations from their previous status bucket to donation.status
+    changes holds (donation, previous_status); previous_status is None for a
+    new donation. Runs as one multi-row upsert in the caller's transaction.
+    Each transition must be recorded exactly once: callers change status on
+    rows loaded with for_update=True (see donation_service), so a concurrent
+    duplicate action fails its status check instead of reaching this.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for donation, previous_status in changes:
+        if previous_status == donation.status:
+            # Nothing moved (the two deltas would cancel out)
+            continue
+        bucket = (donation.donation_date, donation.ngo_location_id, donation.meal_type)
+        if previous_status is not None:
+            deltas[(*bucket, previous_status)][0] -= 1
+            deltas[(*bucket, previous_status)][1] -= donation.quantity_plates
+        deltas[(*bucket, donation.status)][0] += 1
+        deltas[(*bucket, donation.status)][1] += donation.quantity_plates
+
+    # Sorted so concurrent bulk updates lock rollup rows in the same order
+    rows = [
+        dict(zip(ROLLUP_KEY, key), donation_count=count, plates=plates)
+        for key, (count, plates) in sorted(deltas.items(), key=lambda item: (
+            item[0][0], item[0][1], item[0][2].name, item[0][3].name
+        ))
+    ]
+    if not rows:
+        return
+
+    stmt = pg_insert(DonationDailyRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=ROLLUP_KEY,
+        set_={
+            "donation_count": DonationDailyRollup.donation_count + stmt.excluded.donation_count,
+            "plates": DonationDailyRollup.plates + stmt.excluded.plates,
+            "updated_at": func.now(),
+        }
+    )
+    await db.execute(stmt)
+
+
+async def record_status_change(
+    db: AsyncSession,
+    donation: DonationRequest,
+    previous_status: Optional[DonationStatus] = None
+) -> None:
+    """Record one donation's creation (previous_status=None) or status change"""
+    await record_status_changes(db, [(donation, previous_status)])
+
+
+async def rebuild_donation_rollups(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> int:
+    """
+    Recompute the rollups from donation_requests, optionally only for a date range
+    Returns the number of rollup rows written
+    """
+    if db.bind.dialect.name == "postgresql":
+        # Status changes made meanwhile block on the lock, then apply their
+        # deltas on top of the rebuilt rows instead of being lost or doubled
+        await db.execute(text(f"LOCK TABLE {DonationDailyRollup.__tablename__} IN EXCLUSIVE MODE"))
+
+    rollup_filter = []
+    donation_filter = []
+    if start_date:
+        rollup_filter.append(DonationDailyRollup.date >= start_date)
+        donation_filter.append(DonationRequest.donation_date >= start_date)
+    if end_date:
+        rollup_filter.append(DonationDailyRollup.date <= end_date)
+        donation_filter.append(DonationRequest.donation_date <= end_date)
+
+    await db.execute(delete(DonationDailyRollup).where(*rollup_filter))
+
+    aggregates = select(
+        DonationRequest.donation_date,
+        DonationRequest.ngo_location_id,
+        DonationRequest.meal_type,
+        DonationRequest.status,
+        func.count(DonationRequest.id),
+        func.sum(DonationRequest.quantity_plates)
+    ).where(*donation_filter).group_by(
+        DonationRequest.donation_date,
+        DonationRequest.ngo_location_id,
+        DonationRequest.meal_type,
+        DonationRequest.status
+    )
+
+    await db.execute(
+        insert(DonationDailyRollup).from_select(ROLLUP_KEY + ["donation_count", "plates"], aggregates)
+    )
+
+    result = await db.execute(select(func.count()).select_from(DonationDailyRollup).where(*rollup_filter))
+    return result.scalar() or 0
@@ -0,0 +1,68 @@
+"""
+Platform stats service
+Computes the admin dashboard counters in a single round trip and keeps a
+short-lived snapshot so repeated dashboard polling does not rescan the tables
+"""
+from datetime import datetime
+from typing import Dict, Any
+
+from sqlalchemy import select, func, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import User, NGOProfile, DonationRequest
+from app.models.ngo import NGOVerificationStatus
+from app.models.donation import DonationStatus
+
+
+PLATFORM_STATS_KEY = "platform"
+
+platform_stats_cache = TTLCache(settings.ADMIN_STATS_TTL_SECONDS, name="platform_stats")
+
+
+def platform_stats_query():
+    """
+    One SELECT that scans each table once, using conditional aggregates
+    for the per-status counts
+    """
+    ngo_counts = select(
+        func.count().filter(NGOProfile.verification_status == NGOVerificationStatus.PENDING).label("pending_verifications"),
+        func.count().filter(NGOProfile.verification_status == NGOVerificationStatus.VERIFIED).label("verified_ngos"),
+        func.count().filter(NGOProfile.verification_status == NGOVerificationStatus.REJECTED).label("rejected_ngos"),
+    ).subquery()
+
+    user_counts = select(
+        func.count().label("total_users"),
+        func.count().filter(User.is_active == True).label("active_users"),
+    ).subquery()
+
+    donation_counts = select(
+        func.count().label("total_donations"),
+        func.count().filter(DonationRequest.status == DonationStatus.COMPLETED).label("completed_donations"),
+    ).subquery()
+
+    # Each subquery yields exactly one row, so joining them ON true is a 1x1x1 product
+    return select(ngo_counts, user_counts, donation_counts).select_from(
+        ngo_counts.join(user_counts, true()).join(donation_counts, true())
+    )
+
+
+async def compute_platform_stats(db: AsyncSession) -> Dict[str, Any]:
+    """Run the aggregate query and return the dashboard counters"""
+    result = await db.execute(platform_stats_query())
+    stats = {key: value or 0 for key, value in result.one()._mapping.items()}
+    stats["generated_at"] = datetime.utcnow().isoformat()
+    return stats
+
+
+async def get_platform_stats(db: AsyncSession) -> Dict[str, Any]:
+    """Return the cached snapshot, recomputing it when older than ADMIN_STATS_TTL_SECONDS"""
+    return await platform_stats_cache.get_or_set(
+        PLATFORM_STATS_KEY, lambda: compute_platform_stats(db)
+    )
+
+
+def invalidate_platform_stats() -> None:
+    """Force the next dashboard request to recompute (call after admin changes)"""
+    platform_stats_cache.invalidate(PLATFORM_STATS_KEY)
@@ -0,0 +1,41 @@
+"""
+Conditional GET helpers
+ETags are built from cheap version stamps (row counts, max(updated_at), stats
+counters) that the endpoint reads before building its payload, so a matching
+If-None-Match is answered with a 304 without loading or serializing the body.
+"""
+import hashlib
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+# Clients must revalidate every time, but may reuse their copy on a 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(*parts) -> str:
+    """Weak ETag over the version stamp parts (and the app version, so deploys bust it)"""
+    raw = "|".join(str(part) for part in (settings.APP_VERSION, *parts))
+    return f'W/"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when If-None-Match names this ETag (weak comparison) or is *"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip() for tag in header.split(",")}
+    if "*" in candidates:
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == opaque for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,145 @@
+"""
+Local gazetteer for offline reverse geocoding
+Populated places (city, state, country, postcode, coordinates) held in an
+in-memory grid index, answering nearest-place lookups in microseconds. The
+bundled app/data/gazetteer.csv covers major Indian cities; set GAZETTEER_PATH
+to a CSV with the same columns (e.g. exported from GeoNames) for more places.
+"""
+import csv
+import logging
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_GAZETTEER = Path(__file__).resolve().parent.parent / "data" / "gazetteer.csv"
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+
+class Place(NamedTuple):
+    name: str
+    state: str
+    country: str
+    postcode: str
+    latitude: float
+    longitude: float
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class GazetteerIndex:
+    """Places bucketed into cell_degrees x cell_degrees cells for nearest-place search"""
+
+    def __init__(self, places: Iterable[Place], cell_degrees: float = 1.0):
+        self.cell_degrees = cell_degrees
+        self.lon_cells = round(360 / cell_degrees)
+        self.cells: Dict[Tuple[int, int], List[Place]] = {}
+        self.size = 0
+        for place in places:
+            self.cells.setdefault(self._cell(place.latitude, place.longitude), []).append(place)
+            self.size += 1
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (
+            int((latitude + 90) // self.cell_degrees),
+            int((longitude + 180) // self.cell_degrees) % self.lon_cells,
+        )
+
+    def _ring(self, row: int, col: int, radius: int) -> Iterable[Tuple[int, int]]:
+        """Cells exactly radius cells away (Chebyshev distance), longitude wrapping"""
+        if radius == 0:
+            yield row, col
+            return
+        for d_col in range(-radius, radius + 1):
+            yield row - radius, (col + d_col) % self.lon_cells
+            yield row + radius, (col + d_col) % self.lon_cells
+        for d_row in range(-radius + 1, radius):
+            yield row + d_row, (col - radius) % self.lon_cells
+            yield row + d_row, (col + radius) % self.lon_cells
+
+    def nearest(self, latitude: float, longitude: float, max_km: float) -> Optional[Tuple[Place, float]]:
+        """Closest place within max_km, with its distance in km"""
+        if not self.size:
+            return None
+
+        row, col = self._cell(latitude, longitude)
+        best: Optional[Place] = None
+        best_km = max_km
+        # A cell side is at least this long anywhere the search can reach (longitude shrinks with latitude)
+        reach_lat = min(abs(latitude) + max_km / KM_PER_DEGREE, 89.0)
+        cell_km = self.cell_degrees * KM_PER_DEGREE * math.cos(math.radians(reach_lat))
+        max_radius = min(int(max_km / cell_km) + 1, self.lon_cells)
+
+        for radius in range(max_radius + 1):
+            # Every place in this ring is at least (radius - 1) whole cells away
+            if best is not None and (radius - 1) * cell_km > best_km:
+                break
+            for cell in self._ring(row, col, radius):
+                for place in self.cells.get(cell, ()):
+                    distance = haversine_km(latitude, longitude, place.latitude, place.longitude)
+                    if distance <= best_km:
+                        best, best_km = place, distance
+
+        return (best, best_km) if best is not None else None
+
+
+def load_places(path: Path) -> List[Place]:
+    """Read places from a name,state,country,postcode,latitude,longitude CSV, skipping bad rows"""
+    places = []
+    skipped = 0
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                places.append(Place(
+                    name=row["name"].strip(),
+                    state=(row.get("state") or "").strip(),
+                    country=(row.get("country") or "").strip(),
+                    postcode=(row.get("postcode") or "").strip(),
+                    latitude=float(row["latitude"]),
+                    longitude=float(row["longitude"]),
+                ))
+            except (KeyError, TypeError, ValueError):
+                skipped += 1
+    if skipped:
+        logger.warning(f"Skipped {skipped} malformed gazetteer rows in {path}")
+    return places
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer() -> GazetteerIndex:
+    """The process-wide index, loaded on first use from GAZETTEER_PATH or the bundled file"""
+    path = Path(settings.GAZETTEER_PATH) if settings.GAZETTEER_PATH else BUNDLED_GAZETTEER
+    index = GazetteerIndex(load_places(path))
+    logger.info(f"Loaded {index.size} gazetteer places from {path}")
+    return index
+
+
+def local_reverse_geocode(latitude: float, longitude: float) -> Optional[Dict]:
+    """
+    Nearest populated place as a reverse_geocode result (city-level precision)
+    None when nothing lies within GAZETTEER_MAX_DISTANCE_KM
+    """
+    found = get_gazetteer().nearest(latitude, longitude, settings.GAZETTEER_MAX_DISTANCE_KM)
+    if found is None:
+        return None
+
+    place, distance = found
+    return {
+        "address_line1": "",
+        "city": place.name,
+        "state": place.state,
+        "country": place.country,
+        "zip_code": place.postcode,
+        "raw_address": ", ".join(part for part in (place.name, place.state, place.postcode, place.country) if part),
+        "source": "gazetteer",
+        "distance_km": round(distance, 2)
+    }
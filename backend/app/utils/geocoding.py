@@ -1,75 +1,302 @@
 """
 Geocoding utilities for reverse geocoding (coordinates to address)
+and forward geocoding (address to coordinates)
+Nominatim answers first; when a reverse lookup times out or fails, the nearest
+place in the local gazetteer (app/utils/gazetteer.py) answers at city precision.
+Nominatim answers are cached per rounded coordinate or per address, and every
+Nominatim call goes through one throttle that caps concurrency and request rate.
 """
+import asyncio
 import httpx
-from typing import Optional, Dict
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional, Dict, List, Tuple
 import logging
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import geocoding_request_duration_seconds, geocoding_local_lookups_total
+from app.utils.gazetteer import local_reverse_geocode
+
 logger = logging.getLogger(__name__)
 
+# Upstream outcomes worth a local answer; not_found means Nominatim has nothing there
+FALLBACK_OUTCOMES = {"timeout", "http_error", "error"}
+
+Coordinate = Tuple[float, float]
+
+reverse_geocode_cache = TTLCache(
+    settings.GEOCODING_CACHE_TTL_SECONDS, name="reverse_geocode", max_entries=settings.GEOCODING_CACHE_MAX_ENTRIES
+)
+forward_geocode_cache = TTLCache(
+    settings.GEOCODING_CACHE_TTL_SECONDS, name="forward_geocode", max_entries=settings.GEOCODING_CACHE_MAX_ENTRIES
+)
+
+
+class UpstreamThrottle:
+    """Caps concurrent upstream requests and spaces their starts to rate_per_second"""
+
+    def __init__(self, max_concurrency: int, rate_per_second: float):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_start = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._semaphore:
+            # Reserve the next start time before sleeping so waiters queue up in order
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+nominatim_throttle = UpstreamThrottle(settings.GEOCODING_MAX_CONCURRENCY, settings.GEOCODING_UPSTREAM_RATE_PER_SECOND)
+
+
+def round_coordinate(latitude: float, longitude: float) -> Coordinate:
+    """Cache key for a point; nearby points within rounding share one lookup"""
+    decimals = settings.GEOCODING_COORDINATE_DECIMALS
+    return round(latitude, decimals), round(longitude, decimals)
+
+
 async def reverse_geocode(latitude: float, longitude: float) -> Optional[Dict]:
     """
-    Reverse geocode coordinates to address using Nominatim API
+    Reverse geocode coordinates to address using Nominatim API,
+    falling back to the local gazetteer when Nominatim is unavailable
     
     Args:
         latitude: Latitude coordinate
         longitude: Longitude coordinate
         
     Returns:
-        Dictionary with address details or None if failed
+        Dictionary with address details (source "nominatim" or "gazetteer")
+        or None if failed
     """
-    try:
-        url = "https://nominatim.openstreetmap.org/reverse"
-        params = {
-            "format": "json",
+    point = round_coordinate(latitude, longitude)
+    if not settings.GEOCODING_LOCAL_PRIMARY:
+        cached = reverse_geocode_cache.lookup(point)
+        if cached is not None:
+            return cached
+    return await _resolve(*point)
+
+
+async def reverse_geocode_batch(points: List[Coordinate], timeout: float) -> List[Dict]:
+    """
+    Reverse geocode many points, one status per point
+    Points are deduplicated after rounding and cache hits answer at once;
+    misses are worked off a queue by GEOCODING_MAX_CONCURRENCY workers
+    through the Nominatim throttle. Points still unresolved after timeout
+    seconds get status "timeout" (retrying later picks up what was cached).
+    Statuses: ok (Nominatim), fallback (gazetteer), not_found, timeout
+    """
+    keys = [round_coordinate(latitude, longitude) for latitude, longitude in points]
+    resolved: Dict[Coordinate, Tuple[str, Optional[Dict], bool]] = {}
+    queue: asyncio.Queue = asyncio.Queue()
+
+    for point in dict.fromkeys(keys):
+        cached = None if settings.GEOCODING_LOCAL_PRIMARY else reverse_geocode_cache.lookup(point)
+        if cached is not None:
+            resolved[point] = ("ok", cached, True)
+        else:
+            queue.put_nowait(point)
+
+    async def worker() -> None:
+        while not queue.empty():
+            point = queue.get_nowait()
+            result = await _resolve(*point)
+            if result is None:
+                resolved[point] = ("not_found", None, False)
+            else:
+                resolved[point] = ("ok" if result["source"] == "nominatim" else "fallback", result, False)
+
+    if not queue.empty():
+        workers = [asyncio.create_task(worker()) for _ in range(min(settings.GEOCODING_MAX_CONCURRENCY, queue.qsize()))]
+        _, unfinished = await asyncio.wait(workers, timeout=timeout)
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*unfinished, return_exceptions=True)
+
+    items = []
+    for (latitude, longitude), point in zip(points, keys):
+        item_status, result, cached = resolved.get(point, ("timeout", None, False))
+        items.append({
             "lat": latitude,
             "lon": longitude,
-            "zoom": 18,
-            "addressdetails": 1
-        }
-        headers = {
-            "User-Agent": "PlatesForPeople/1.0 (https://platesforpeople.com; support@platesforpeople.com)"
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers, timeout=10.0)
+            "status": item_status,
+            "cached": cached,
+            "address": result
+        })
+    return items
+
+
+async def _resolve(latitude: float, longitude: float) -> Optional[Dict]:
+    """Cache miss: Nominatim (cached when it answers) or the local gazetteer"""
+    if settings.GEOCODING_LOCAL_PRIMARY:
+        return _local_lookup(latitude, longitude, "primary")
+
+    result, outcome = await _nominatim_reverse(latitude, longitude)
+    if outcome in FALLBACK_OUTCOMES:
+        return _local_lookup(latitude, longitude, "fallback")
+    if result is not None:
+        reverse_geocode_cache.set((latitude, longitude), result)
+    return result
+
+
+async def forward_geocode(
+    address_line1: Optional[str] = None,
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    zip_code: Optional[str] = None,
+    country: Optional[str] = None
+) -> Optional[Dict]:
+    """
+    Geocode an address to coordinates using Nominatim's structured search
+    Returns the reverse_geocode fields plus latitude and longitude, or None
+    when Nominatim finds nothing or is unavailable. There is no gazetteer
+    fallback: a city centre is too far off to stand in for a street address.
+    """
+    query = {
+        name: value.strip()
+        for name, value in (
+            ("street", address_line1), ("city", city), ("state", state),
+            ("postalcode", zip_code), ("country", country)
+        )
+        if value and value.strip()
+    }
+    if not query:
+        return None
+
+    key = tuple(sorted((name, value.lower()) for name, value in query.items()))
+    cached = forward_geocode_cache.lookup(key)
+    if cached is not None:
+        return cached
+
+    result, _ = await _nominatim_search(query)
+    if result is not None:
+        forward_geocode_cache.set(key, result)
+    return result
+
+
+def _local_lookup(latitude: float, longitude: float, reason: str) -> Optional[Dict]:
+    result = local_reverse_geocode(latitude, longitude)
+    geocoding_local_lookups_total.inc(reason, "true" if result else "false")
+    return result
+
+
+async def _nominatim_reverse(latitude: float, longitude: float) -> Tuple[Optional[Dict], str]:
+    """Nominatim result (or None) and the outcome label it was recorded under"""
+    params = {
+        "format": "json",
+        "lat": latitude,
+        "lon": longitude,
+        "zoom": 18,
+        "addressdetails": 1
+    }
+    result, outcome = await _nominatim_get("reverse", params, _parse_address)
+    if outcome == "not_found":
+        logger.warning(f"No address data in response for {latitude}, {longitude}")
+    return result, outcome
+
+
+async def _nominatim_search(query: Dict[str, str]) -> Tuple[Optional[Dict], str]:
+    """Best Nominatim match for a structured address query, with coordinates"""
+    params = {
+        "format": "json",
+        "addressdetails": 1,
+        "limit": 1,
+        **query
+    }
+    return await _nominatim_get("search", params, _parse_search)
+
+
+async def _nominatim_get(
+    endpoint: str,
+    params: Dict,
+    parse: Callable[[Any], Optional[Dict]]
+) -> Tuple[Optional[Dict], str]:
+    """
+    One Nominatim call through the throttle, parsed (None means not_found)
+    Returns the result and the outcome label its latency was recorded under;
+    the throttle wait is not part of the recorded latency
+    """
+    async with nominatim_throttle.slot():
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            url = f"https://nominatim.openstreetmap.org/{endpoint}"
+            headers = {
+                "User-Agent": "PlatesForPeople/1.0 (https://platesforpeople.com; support@platesforpeople.com)"
+            }
             
-            if response.status_code == 200:
-                data = response.json()
+            async with httpx.AsyncClient() as client:
+                response = await client.get(url, params=params, headers=headers, timeout=settings.GEOCODING_TIMEOUT_SECONDS)
                 
-                if "address" in data:
-                    address = data["address"]
-                    
-                    # Extract and structure address components
-                    return {
-                        "address_line1": _build_address_line(address),
-                        "city": (
-                            address.get("city") or 
-                            address.get("town") or 
-                            address.get("village") or 
-                            address.get("municipality") or 
-                            ""
-                        ),
-                        "state": (
-                            address.get("state") or 
-                            address.get("province") or 
-                            address.get("region") or 
-                            ""
-                        ),
-                        "country": address.get("country", ""),
-                        "zip_code": address.get("postcode", ""),
-                        "raw_address": data.get("display_name", "")
-                    }
+                if response.status_code == 200:
+                    result = parse(response.json())
+                    outcome = "ok" if result is not None else "not_found"
+                    return result, outcome
                 else:
-                    logger.warning(f"No address data in response for {latitude}, {longitude}")
-                    return None
-            else:
-                logger.error(f"Nominatim returned status {response.status_code}")
-                return None
-                
-    except Exception as e:
-        logger.error(f"Reverse geocoding failed: {e}")
+                    outcome = "http_error"
+                    logger.error(f"Nominatim returned status {response.status_code}")
+                    return None, outcome
+                    
+        except asyncio.CancelledError:
+            # A batch ran out of time while this request was in flight
+            outcome = "cancelled"
+            raise
+        except httpx.TimeoutException:
+            outcome = "timeout"
+            logger.warning(f"Nominatim {endpoint} timed out after {settings.GEOCODING_TIMEOUT_SECONDS}s")
+            return None, outcome
+        except Exception as e:
+            logger.error(f"Geocoding request failed: {e}")
+            return None, outcome
+        finally:
+            geocoding_request_duration_seconds.observe(time.perf_counter() - started, outcome)
+
+
+def _parse_address(data: Dict) -> Optional[Dict]:
+    """Structured address from a Nominatim place, or None without address details"""
+    if "address" not in data:
+        return None
+    address = data["address"]
+    
+    # Extract and structure address components
+    return {
+        "address_line1": _build_address_line(address),
+        "city": (
+            address.get("city") or 
+            address.get("town") or 
+            address.get("village") or 
+            address.get("municipality") or 
+            ""
+        ),
+        "state": (
+            address.get("state") or 
+            address.get("province") or 
+            address.get("region") or 
+            ""
+        ),
+        "country": address.get("country", ""),
+        "zip_code": address.get("postcode", ""),
+        "raw_address": data.get("display_name", ""),
+        "source": "nominatim"
+    }
+
+
+def _parse_search(data: List[Dict]) -> Optional[Dict]:
+    if not data:
+        return None
+    place = data[0]
+    result = _parse_address(place)
+    if result is None:
         return None
+    result["latitude"] = float(place["lat"])
+    result["longitude"] = float(place["lon"])
+    return result
 
 
 def _build_address_line(address: Dict) -> str:
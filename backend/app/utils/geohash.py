@@ -0,0 +1,85 @@
+"""
+Geohash utilities
+Encode coordinates to geohash strings and decode them back to cell bounds.
+A geohash names a lat/lon cell; every extra character splits the cell into
+32, and a cell's geohash is a prefix of the geohashes of all cells inside it.
+"""
+from typing import Dict, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(BASE32)}
+
+MAX_PRECISION = 12
+
+
+def encode(latitude: float, longitude: float, precision: int) -> str:
+    """Geohash of the cell containing the point"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # bits alternate longitude, latitude, longitude, ...
+
+    while len(chars) < precision:
+        target, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        if target >= middle:
+            value = (value << 1) | 1
+            bounds[0] = middle
+        else:
+            value <<= 1
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def decode_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lon, max_lat, max_lon) of a geohash cell"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bounds = lon_range if even else lat_range
+            middle = (bounds[0] + bounds[1]) / 2
+            if (value >> shift) & 1:
+                bounds[0] = middle
+            else:
+                bounds[1] = middle
+            even = not even
+
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def decode(geohash: str) -> Tuple[float, float]:
+    """Center (latitude, longitude) of a geohash cell"""
+    min_lat, min_lon, max_lat, max_lon = decode_bounds(geohash)
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
+
+def cell(geohash: str) -> Dict[str, float]:
+    """Center and bounds of a geohash cell, ready for a JSON response"""
+    min_lat, min_lon, max_lat, max_lon = decode_bounds(geohash)
+    return {
+        "latitude": round((min_lat + max_lat) / 2, 6),
+        "longitude": round((min_lon + max_lon) / 2, 6),
+        "bounds": {
+            "min_lat": round(min_lat, 6),
+            "min_lon": round(min_lon, 6),
+            "max_lat": round(max_lat, 6),
+            "max_lon": round(max_lon, 6)
+        }
+    }
+
+
+def is_valid(geohash: str) -> bool:
+    return len(geohash) <= MAX_PRECISION and all(char in _DECODE for char in geohash)
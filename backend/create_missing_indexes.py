@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Script to build indexes declared on the models but missing from the database
+create_all only creates indexes together with new tables, so run this once
+after deploying a change that adds an index to an existing table (e.g. the
+admin NGO listing indexes on ngo_profiles). Indexes are built with CREATE
+INDEX CONCURRENTLY, so writes to the table continue during the build.
+"""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+from app import models  # noqa: F401
+from app.core.database import Base, engine, init_db
+
+
+async def main():
+    await init_db()
+
+    created = []
+    # CONCURRENTLY cannot run inside a transaction block
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        existing = set((await conn.execute(text("SELECT indexname FROM pg_indexes"))).scalars())
+
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name in existing:
+                    continue
+                index.dialect_options["postgresql"]["concurrently"] = True
+                print(f"Building {index.name} on {table.name}...")
+                await conn.execute(CreateIndex(index, if_not_exists=True))
+                created.append(index.name)
+
+        # An interrupted concurrent build leaves an invalid index behind
+        invalid = (await conn.execute(text(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE NOT i.indisvalid"
+        ))).scalars().all()
+
+    print(f"✅ Built {len(created)} missing indexes{': ' + ', '.join(created) if created else ''}")
+    if invalid:
+        print(f"⚠️  Invalid indexes (DROP INDEX CONCURRENTLY them and re-run): {', '.join(invalid)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,4 @@
+"""
+Performance tooling - load tests, benchmarks and data generators
+Run from the backend directory, e.g. python -m perf.login_latency
+"""
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the hot paths
+
+Times the functions every busy request goes through - distance calculation,
+building search results, JWT encode/decode, password verification and
+response validation/encoding (default JSONResponse against FastJSONResponse
+on 1k-row lists) - with timeit, entirely offline (no database or
+server). Results can be written to JSON and compared with a stored baseline;
+a benchmark regresses when its best time per call grows by more than
+--tolerance.
+
+Usage:
+    python -m perf.benchmarks
+    python -m perf.benchmarks --json perf/baselines/benchmarks.json
+    python -m perf.benchmarks --compare perf/baselines/benchmarks.json --tolerance 0.15
+    python -m perf.benchmarks --only token
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
+from app.core.security import create_access_token, decode_token, hash_password, verify_password
+from app.models import (
+    NGOProfile, NGOLocation, NGOLocationCapacity, NGORatingStats, Notification, MealType, DonationStatus,
+)
+from app.routers.search import build_search_result, calculate_distance
+from app.schemas import NGOLocationResponse, NotificationListResponse, NGOLocationCapacityResponse
+
+REPEATS = 5
+SEARCH_RESULTS = 100
+NOTIFICATIONS = 50
+LOCATIONS = 20
+LIST_ROWS = 1000
+
+
+def _search_rows():
+    rows = []
+    for i in range(1, SEARCH_RESULTS + 1):
+        ngo = NGOProfile(
+            id=i, organization_name=f"Bench NGO {i}", contact_person=f"Contact {i}", phone=f"+9180000{i:05d}",
+        )
+        location = NGOLocation(
+            id=i, ngo_id=i, location_name=f"Bench NGO {i} Branch", address_line1=f"{i} Bench Road",
+            city="Chennai", state="Tamil Nadu", zip_code="600001", country="India",
+            latitude=13.0827 + i / 1000, longitude=80.2707 - i / 1000, is_active=True,
+        )
+        stats = NGORatingStats(
+            ngo_id=i, rating_count=10, rating_sum=42,
+            rating_1_count=0, rating_2_count=1, rating_3_count=1, rating_4_count=3, rating_5_count=5,
+        )
+        rows.append((ngo, location, stats))
+    return rows
+
+
+def _notifications():
+    now = datetime.now(timezone.utc)
+    return [
+        Notification(
+            id=i, user_id=1, title="New Donation Request", message=f"Donation request #{i}",
+            notification_type="donation_request", related_entity_type="donation", related_entity_id=i,
+            is_read=i % 2 == 0, read_at=None, created_at=now - timedelta(minutes=i),
+        )
+        for i in range(1, NOTIFICATIONS + 1)
+    ]
+
+
+def _locations():
+    return [
+        NGOLocation(
+            id=i, ngo_id=1, location_name=f"Branch {i}", address_line1=f"{i} Bench Road", address_line2=None,
+            city="Chennai", state="Tamil Nadu", zip_code="600001", country="India",
+            latitude=13.0827, longitude=80.2707, is_active=True,
+        )
+        for i in range(1, LOCATIONS + 1)
+    ]
+
+
+def _donation_rows(native: bool) -> List[Dict]:
+    """my-donations rows; native=True leaves dates and enums for the response class to encode"""
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(1, LIST_ROWS + 1):
+        created_at = now - timedelta(minutes=i)
+        donation_date = date.today() + timedelta(days=i % 7)
+        confirmed_at = created_at + timedelta(hours=2) if i % 2 else None
+        rows.append({
+            "id": i, "donor_id": 1, "ngo_location_id": i % 50 + 1, "food_type": "Rice and curry",
+            "quantity_plates": 20, "meal_type": MealType.LUNCH if native else MealType.LUNCH.value,
+            "donation_date": donation_date if native else donation_date.isoformat(),
+            "pickup_time_start": "10:00", "pickup_time_end": "11:00", "description": None,
+            "special_instructions": None,
+            "status": DonationStatus.CONFIRMED if native else DonationStatus.CONFIRMED.value,
+            "rejection_reason": None, "created_at": created_at if native else created_at.isoformat(),
+            "confirmed_at": confirmed_at if native else (confirmed_at.isoformat() if confirmed_at else None),
+            "completed_at": None, "cancelled_at": None, "ngo_name": "Bench NGO", "location_name": "Bench Branch",
+        })
+    return rows
+
+
+def _capacities():
+    return [
+        NGOLocationCapacity(
+            id=i, location_id=1, date=date.today() + timedelta(days=i // 3), meal_type=list(MealType)[i % 3],
+            total_capacity=100, current_capacity=60,
+        )
+        for i in range(1, LIST_ROWS + 1)
+    ]
+
+
+def _default_response(content) -> JSONResponse:
+    """What FastAPI does for a dict/list return value without a response_model"""
+    return JSONResponse(jsonable_encoder(content))
+
+
+def _validated_capacity_response(capacities) -> JSONResponse:
+    """What FastAPI does for response_model=List[NGOLocationCapacityResponse] with ORM rows"""
+    return JSONResponse(jsonable_encoder([
+        NGOLocationCapacityResponse.model_validate(c).model_dump(mode="json") for c in capacities
+    ]))
+
+
+def _fast_capacity_response(capacities) -> FastJSONResponse:
+    return FastJSONResponse([
+        {
+            "date": c.date, "meal_type": c.meal_type, "total_capacity": c.total_capacity,
+            "id": c.id, "location_id": c.location_id, "current_capacity": c.current_capacity,
+        }
+        for c in capacities
+    ])
+
+
+def build_benchmarks() -> Dict[str, Callable[[], object]]:
+    """Name -> zero-argument callable; fixtures are built once, outside the timing"""
+    search_rows = _search_rows()
+    search_payload = {
+        "total": len(search_rows),
+        "ngos": [build_search_result(ngo, loc, stats, 1.5, 40) for ngo, loc, stats in search_rows],
+    }
+    notifications = {"total": NOTIFICATIONS, "unread_count": NOTIFICATIONS // 2, "notifications": _notifications()}
+    locations = _locations()
+    token = create_access_token({"sub": "42", "role": "donor"})
+    password_hash = hash_password("bench-password")
+    donations_encoded, donations_native = _donation_rows(native=False), _donation_rows(native=True)
+    capacities = _capacities()
+
+    return {
+        "calculate_distance": lambda: calculate_distance(13.0827, 80.2707, 13.0674, 80.2376),
+        f"search result rows x{SEARCH_RESULTS}": lambda: [
+            build_search_result(ngo, loc, stats, 1.5, 40) for ngo, loc, stats in search_rows
+        ],
+        f"search response encode x{SEARCH_RESULTS}": lambda: _default_response(search_payload),
+        f"search response fast x{SEARCH_RESULTS}": lambda: FastJSONResponse(search_payload),
+        f"donation list encode x{LIST_ROWS}": lambda: _default_response(donations_encoded),
+        f"donation list fast x{LIST_ROWS}": lambda: FastJSONResponse(donations_native),
+        f"capacity list validated x{LIST_ROWS}": lambda: _validated_capacity_response(capacities),
+        f"capacity list fast x{LIST_ROWS}": lambda: _fast_capacity_response(capacities),
+        "create_access_token": lambda: create_access_token({"sub": "42", "role": "donor"}),
+        "decode_token": lambda: decode_token(token),
+        "verify_password": lambda: verify_password("bench-password", password_hash),
+        f"NotificationListResponse x{NOTIFICATIONS}": lambda: NotificationListResponse.model_validate(
+            notifications
+        ).model_dump(mode="json"),
+        f"NGOLocationResponse x{LOCATIONS}": lambda: [
+            NGOLocationResponse.model_validate(location).model_dump(mode="json") for location in locations
+        ],
+    }
+
+
+def run_benchmark(func: Callable[[], object]) -> Dict[str, float]:
+    """Per-call timings in microseconds over REPEATS rounds of an auto-sized loop"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    rounds = [t / number * 1e6 for t in timer.repeat(repeat=REPEATS, number=number)]
+    median = statistics.median(rounds)
+    return {
+        "loops": number,
+        "min_us": round(min(rounds), 3),
+        "median_us": round(median, 3),
+        "ops_per_s": round(1e6 / median, 1) if median else 0.0,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Compare best-round times, which are far less noisy than medians on a busy machine"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base and result["min_us"] > base["min_us"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: {result['min_us']} us > baseline {base['min_us']} us "
+                f"(+{(result['min_us'] / base['min_us'] - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main(only: Optional[str], json_path: Optional[str], compare_path: Optional[str], tolerance: float) -> int:
+    baseline = None
+    if compare_path:
+        with open(compare_path) as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    print(f"{'benchmark':<36}{'median us':>12}{'min us':>12}{'ops/s':>14}{'vs base':>10}")
+    print("-" * 84)
+    for name, func in build_benchmarks().items():
+        if only and only not in name:
+            continue
+        result = results[name] = run_benchmark(func)
+        change = ""
+        if baseline and name in baseline:
+            change = f"{(result['min_us'] / baseline[name]['min_us'] - 1) * 100:+.0f}%"
+        print(f"{name:<36}{result['median_us']:>12.2f}{result['min_us']:>12.2f}{result['ops_per_s']:>14,.0f}{change:>10}")
+
+    if json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(json_path)), exist_ok=True)
+        with open(json_path, "w") as f:
+            json.dump({
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2)
+        print(f"\n✅ Results written to {json_path}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {compare_path}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            return 1
+        print(f"\n✅ Within {tolerance:.0%} of baseline {compare_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file (e.g. to store a baseline)")
+    parser.add_argument("--compare", help="Baseline JSON to compare against; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown (default 0.15)")
+    args = parser.parse_args()
+
+    sys.exit(main(args.only, args.json_path, args.compare, args.tolerance))
@@ -0,0 +1,255 @@
+"""
+Deterministic data fixtures for the perf tools
+
+generate_fixture(scale) builds rows (as column dicts, explicit ids) for every
+table the API reads: users, donor and NGO profiles, locations, capacity,
+donations, ratings, rating stats and notifications. The same scale and seed
+always produce the same rows. One scale unit is 20 NGOs, 10 donors and 200
+donations; a quarter of all donations belong to the probe donor and a quarter
+go to the probe NGO, so their lists grow with scale.
+"""
+import random
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Any
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.database import Base, engine, init_db
+from app.core.security import hash_password
+from app.models import (
+    User, UserRole, DonorProfile, NGOProfile, NGOLocation, NGOLocationCapacity,
+    NGOVerificationStatus, MealType, DonationRequest, DonationStatus,
+    Rating, NGORatingStats, Notification,
+)
+
+PASSWORD = "perf-password"
+CENTER = (13.0827, 80.2707)  # Chennai
+CAPACITY_DAYS = 7
+INSERT_CHUNK = 1000
+
+FOOD_TYPES = ["Rice and curry", "Chapati and dal", "Biryani", "Idli and sambar", "Sandwiches", "Fruit"]
+DONATION_STATUS_WEIGHTS = {
+    DonationStatus.PENDING: 3,
+    DonationStatus.CONFIRMED: 2,
+    DonationStatus.COMPLETED: 4,
+    DonationStatus.REJECTED: 1,
+    DonationStatus.CANCELLED: 1,
+}
+
+
+@dataclass
+class Fixture:
+    """Generated rows in insert order, plus the ids the perf tools query as"""
+    scale: int
+    rows: Dict[Any, List[Dict[str, Any]]] = field(default_factory=dict)
+    admin_user_id: int = 1
+    donor_user_id: int = 0
+    donor_id: int = 1
+    ngo_user_id: int = 0
+    ngo_id: int = 1
+    ngo_location_id: int = 1
+    donation_id: int = 1
+
+    def count(self, model) -> int:
+        return len(self.rows.get(model, []))
+
+
+def generate_fixture(scale: int = 1, seed: int = 42, today: date = None) -> Fixture:
+    """Build the rows for a dataset of the given scale"""
+    rng = random.Random(seed)
+    today = today or date.today()
+    now = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=12)
+    password_hash = hash_password(PASSWORD)
+
+    n_ngos = 20 * scale
+    n_donors = 10 * scale
+    n_donations = 200 * scale
+
+    fixture = Fixture(scale=scale)
+    users, donors, ngos, locations, capacities = [], [], [], [], []
+    donations, ratings, notifications = [], [], []
+
+    def created(days_back: int = 90) -> datetime:
+        return now - timedelta(seconds=rng.randint(0, days_back * 86400))
+
+    users.append({
+        "id": 1, "email": "admin@perf.example", "password_hash": password_hash,
+        "role": UserRole.ADMIN, "is_active": True, "is_verified": True, "created_at": created(),
+    })
+
+    for i in range(1, n_donors + 1):
+        user_id = len(users) + 1
+        users.append({
+            "id": user_id, "email": f"donor{i}@perf.example", "password_hash": password_hash,
+            "role": UserRole.DONOR, "is_active": True, "is_verified": True, "created_at": created(),
+        })
+        lat, lon = _near(rng, CENTER, 0.2)
+        donors.append({
+            "id": i, "user_id": user_id, "organization_name": f"Perf Donor {i}",
+            "contact_person": f"Donor Contact {i}", "phone": f"+9190000{i:05d}",
+            "address_line1": f"{i} Donor Street", "city": "Chennai", "state": "Tamil Nadu",
+            "zip_code": "600001", "country": "India", "latitude": lat, "longitude": lon,
+            "created_at": created(),
+        })
+
+    location_id = 0
+    for i in range(1, n_ngos + 1):
+        user_id = len(users) + 1
+        # The probe NGO is always verified; roughly 1 in 10 of the rest are pending
+        verified = i == 1 or rng.random() > 0.1
+        users.append({
+            "id": user_id, "email": f"ngo{i}@perf.example", "password_hash": password_hash,
+            "role": UserRole.NGO, "is_active": True, "is_verified": verified, "created_at": created(),
+        })
+        ngos.append({
+            "id": i, "user_id": user_id, "organization_name": f"Perf NGO {i}",
+            "registration_number": f"PERF-REG-{i:06d}", "contact_person": f"NGO Contact {i}",
+            "phone": f"+9180000{i:05d}",
+            "verification_status": NGOVerificationStatus.VERIFIED if verified else NGOVerificationStatus.PENDING,
+            "verified_at": now if verified else None, "verified_by": 1 if verified else None,
+            "created_at": created(),
+        })
+        for branch in (1, 2):
+            location_id += 1
+            lat, lon = _near(rng, CENTER, 0.2)
+            locations.append({
+                "id": location_id, "ngo_id": i, "location_name": f"Perf NGO {i} Branch {branch}",
+                "address_line1": f"{location_id} NGO Road", "city": "Chennai", "state": "Tamil Nadu",
+                "zip_code": "600002", "country": "India", "latitude": lat, "longitude": lon,
+                "is_active": True, "created_at": created(),
+            })
+            for day in range(CAPACITY_DAYS):
+                for meal in MealType:
+                    total = rng.choice([50, 100, 150, 200])
+                    capacities.append({
+                        "id": len(capacities) + 1, "location_id": location_id,
+                        "date": today + timedelta(days=day), "meal_type": meal,
+                        "total_capacity": total, "current_capacity": rng.randint(0, total),
+                        "created_at": created(30),
+                    })
+
+    donor_user = {d["id"]: d["user_id"] for d in donors}
+    ngo_user = {n["id"]: n["user_id"] for n in ngos}
+    location_ngo = {loc["id"]: loc["ngo_id"] for loc in locations}
+    probe_locations = [loc["id"] for loc in locations if loc["ngo_id"] == 1]
+    statuses = list(DONATION_STATUS_WEIGHTS)
+    weights = list(DONATION_STATUS_WEIGHTS.values())
+    rating_totals = defaultdict(lambda: [0, 0, [0] * 5])
+
+    for i in range(1, n_donations + 1):
+        donor_id = 1 if rng.random() < 0.25 else rng.randint(1, n_donors)
+        loc_id = rng.choice(probe_locations) if rng.random() < 0.25 else rng.randint(1, location_id)
+        status = rng.choices(statuses, weights)[0]
+        created_at = created()
+        start_hour = rng.randint(8, 19)
+        donation = {
+            "id": i, "donor_id": donor_id, "ngo_location_id": loc_id,
+            "food_type": rng.choice(FOOD_TYPES), "quantity_plates": rng.randint(5, 60),
+            "meal_type": rng.choice(list(MealType)),
+            "donation_date": (created_at + timedelta(days=rng.randint(0, 5))).date(),
+            "pickup_time_start": f"{start_hour:02d}:00", "pickup_time_end": f"{start_hour + 1:02d}:00",
+            "status": status, "created_at": created_at,
+            "confirmed_at": None, "rejected_at": None, "rejection_reason": None,
+            "completed_at": None, "cancelled_at": None,
+        }
+        if status in (DonationStatus.CONFIRMED, DonationStatus.COMPLETED):
+            donation["confirmed_at"] = created_at + timedelta(hours=2)
+        if status == DonationStatus.COMPLETED:
+            donation["completed_at"] = created_at + timedelta(days=1)
+        elif status == DonationStatus.REJECTED:
+            donation["rejected_at"] = created_at + timedelta(hours=3)
+            donation["rejection_reason"] = "No capacity for this slot"
+        elif status == DonationStatus.CANCELLED:
+            donation["cancelled_at"] = created_at + timedelta(hours=1)
+        donations.append(donation)
+
+        ngo_id = location_ngo[loc_id]
+        notifications.append({
+            "id": len(notifications) + 1, "user_id": ngo_user[ngo_id],
+            "title": "New Donation Request", "message": f"Donation request #{i}",
+            "notification_type": "donation_request", "related_entity_type": "donation",
+            "related_entity_id": i, "is_read": rng.random() < 0.5, "created_at": created_at,
+        })
+        if status != DonationStatus.PENDING:
+            notifications.append({
+                "id": len(notifications) + 1, "user_id": donor_user[donor_id],
+                "title": f"Donation {status.value.title()}", "message": f"Donation request #{i} is {status.value}",
+                "notification_type": f"donation_{status.value}", "related_entity_type": "donation",
+                "related_entity_id": i, "is_read": rng.random() < 0.5, "created_at": created_at + timedelta(hours=2),
+            })
+
+        if status == DonationStatus.COMPLETED and rng.random() < 0.7:
+            stars = rng.choices([1, 2, 3, 4, 5], [1, 1, 2, 4, 4])[0]
+            ratings.append({
+                "id": len(ratings) + 1, "donation_id": i, "donor_id": donor_id, "ngo_id": ngo_id,
+                "rating": stars, "feedback": "Smooth pickup" if stars >= 4 else None,
+                "created_at": donation["completed_at"] + timedelta(hours=1),
+            })
+            totals = rating_totals[ngo_id]
+            totals[0] += 1
+            totals[1] += stars
+            totals[2][stars - 1] += 1
+
+    rating_stats = [
+        {
+            "ngo_id": ngo_id, "rating_count": count, "rating_sum": total,
+            **{f"rating_{stars}_count": histogram[stars - 1] for stars in range(1, 6)},
+        }
+        for ngo_id, (count, total, histogram) in sorted(rating_totals.items())
+    ]
+
+    fixture.rows = {
+        User: users,
+        DonorProfile: donors,
+        NGOProfile: ngos,
+        NGOLocation: locations,
+        NGOLocationCapacity: capacities,
+        DonationRequest: donations,
+        Rating: ratings,
+        NGORatingStats: rating_stats,
+        Notification: notifications,
+    }
+    fixture.donor_user_id = donor_user[1]
+    fixture.ngo_user_id = ngo_user[1]
+    fixture.ngo_location_id = probe_locations[0]
+    fixture.donation_id = next(d["id"] for d in donations if d["donor_id"] == 1 and d["ngo_location_id"] in probe_locations)
+    return fixture
+
+
+def _near(rng: random.Random, center, spread: float):
+    return (
+        round(center[0] + rng.uniform(-spread, spread), 6),
+        round(center[1] + rng.uniform(-spread, spread), 6),
+    )
+
+
+async def load_fixture(conn: AsyncConnection, fixture: Fixture) -> None:
+    """Insert the fixture with chunked executemany INSERTs (tables must be empty)"""
+    for model, rows in fixture.rows.items():
+        for start in range(0, len(rows), INSERT_CHUNK):
+            await conn.execute(insert(model.__table__), rows[start:start + INSERT_CHUNK])
+    await reset_sequences(conn, [model for model, rows in fixture.rows.items() if rows])
+
+
+async def reset_database() -> None:
+    """Drop every table and recreate the schema (THE TARGET DATABASE IS WIPED)"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await init_db()
+
+
+async def reset_sequences(conn: AsyncConnection, models: Iterable) -> None:
+    """Move PostgreSQL id sequences past the explicit ids so later inserts don't collide"""
+    if conn.dialect.name != "postgresql":
+        return
+    for model in models:
+        table = model.__table__
+        if "id" not in table.c:
+            continue
+        await conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT MAX(id) FROM {table.name}))"
+        ))
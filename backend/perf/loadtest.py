@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Load test for the core user journeys
+
+Virtual donors search for NGOs near a target location, create donations,
+poll their notifications and rate donations once they are completed. Virtual
+NGOs poll notifications and their request list, confirm and complete the
+donations sent to their locations. The run reports throughput, p50/p95/p99
+latency and error rate per endpoint, can save the result as a baseline, and
+compares later runs against it (exit code 1 on regression).
+
+Accounts come from perf.seed or perf.fixtures (donor<N>@perf.example,
+ngo<N>@perf.example, password "perf-password"); seed with today's date so
+capacity exists for the donation dates used here. Disable rate limiting on
+the target (RATE_LIMIT_ENABLED=false) or 429s will count as errors.
+
+Usage:
+    python -m perf.loadtest --url http://localhost:8000 --donors 40 --ngos 10 --duration 60
+    python -m perf.loadtest --duration 60 --save perf/baselines/loadtest.json
+    python -m perf.loadtest --duration 60 --compare perf/baselines/loadtest.json --tolerance 0.25
+    python -m perf.loadtest --in-process --duration 20   # app in this process, DATABASE_URL from env
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+
+from perf.login_latency import summarize
+
+# Same as perf.fixtures, which isn't imported so --url mode never loads the app settings
+PASSWORD = "perf-password"
+CAPACITY_DAYS = 7
+MEALS = ("breakfast", "lunch", "dinner")
+FOOD_TYPES = ("Rice and curry", "Chapati and dal", "Biryani", "Idli and sambar")
+
+
+class Recorder:
+    """Latency samples and status codes per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def call(
+        self,
+        client: httpx.AsyncClient,
+        name: str,
+        method: str,
+        url: str,
+        expected: int = 200,
+        **kwargs
+    ) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[name].append((time.perf_counter() - started) * 1000)
+            self.errors[name] += 1
+            self.statuses[name][0] += 1
+            return None
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        self.statuses[name][response.status_code] += 1
+        if response.status_code != expected:
+            self.errors[name] += 1
+        return response
+
+    def report(self, elapsed: float) -> Dict[str, Dict]:
+        endpoints = {}
+        for name in sorted(self.latencies):
+            samples = self.latencies[name]
+            endpoints[name] = {
+                **summarize(samples),
+                "rps": round(len(samples) / elapsed, 2),
+                "error_rate": round(self.errors[name] / len(samples), 4),
+                "statuses": {str(code): n for code, n in sorted(self.statuses[name].items())},
+            }
+        total = sum(len(samples) for samples in self.latencies.values())
+        return {
+            "elapsed_s": round(elapsed, 1),
+            "requests": total,
+            "rps": round(total / elapsed, 2),
+            "error_rate": round(sum(self.errors.values()) / total, 4) if total else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+@dataclass
+class VirtualNGO:
+    index: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    locations: List[Dict] = field(default_factory=list)
+    inbox: asyncio.Queue = field(default_factory=asyncio.Queue)
+
+
+@dataclass
+class VirtualDonor:
+    index: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    to_rate: asyncio.Queue = field(default_factory=asyncio.Queue)
+
+
+async def login(client: httpx.AsyncClient, recorder: Recorder, email: str) -> Optional[Dict[str, str]]:
+    response = await recorder.call(
+        client, "POST /api/auth/login", "POST", "/api/auth/login", json={"email": email, "password": PASSWORD}
+    )
+    if response is None or response.status_code != 200:
+        return None
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def think(rng: random.Random, think_ms: int) -> None:
+    await asyncio.sleep(rng.uniform(0, think_ms) / 1000)
+
+
+async def donor_journey(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    donor: VirtualDonor,
+    locations: List[tuple],
+    deadline: float,
+    think_ms: int,
+    seed: int
+) -> None:
+    rng = random.Random(seed)
+    while time.monotonic() < deadline:
+        location, ngo = rng.choice(locations)
+        await recorder.call(
+            client, "GET /api/search/ngos", "GET", "/api/search/ngos", headers=donor.headers,
+            params={"latitude": location["latitude"], "longitude": location["longitude"], "radius": 10},
+        )
+        await think(rng, think_ms)
+
+        donation_date = date.today() + timedelta(days=rng.randrange(CAPACITY_DAYS))
+        start_hour = rng.randint(8, 19)
+        response = await recorder.call(
+            client, "POST /api/donations/requests", "POST", "/api/donations/requests", expected=201,
+            headers=donor.headers,
+            json={
+                "ngo_location_id": location["id"], "food_type": rng.choice(FOOD_TYPES),
+                "quantity_plates": rng.randint(1, 5), "meal_type": rng.choice(MEALS),
+                "donation_date": donation_date.isoformat(),
+                "pickup_time_start": f"{start_hour:02d}:00", "pickup_time_end": f"{start_hour + 1:02d}:00",
+            },
+        )
+        if response is not None and response.status_code == 201:
+            ngo.inbox.put_nowait((response.json()["id"], donor))
+
+        await recorder.call(
+            client, "GET /api/notifications/unread", "GET", "/api/notifications/unread", headers=donor.headers
+        )
+
+        while not donor.to_rate.empty():
+            donation_id = donor.to_rate.get_nowait()
+            await recorder.call(
+                client, "POST /api/ratings/", "POST", "/api/ratings/", expected=201, headers=donor.headers,
+                json={"donation_id": donation_id, "rating": rng.randint(3, 5), "feedback": "Load test pickup"},
+            )
+        await think(rng, think_ms)
+
+
+async def ngo_journey(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    ngo: VirtualNGO,
+    deadline: float,
+    think_ms: int,
+    seed: int
+) -> None:
+    rng = random.Random(seed)
+    polls = 0
+    while time.monotonic() < deadline:
+        try:
+            donation_id, donor = await asyncio.wait_for(ngo.inbox.get(), timeout=max(think_ms, 100) / 1000)
+        except asyncio.TimeoutError:
+            donation_id = None
+
+        if donation_id is not None:
+            confirmed = await recorder.call(
+                client, "POST /api/donations/requests/{id}/confirm", "POST",
+                f"/api/donations/requests/{donation_id}/confirm", headers=ngo.headers,
+            )
+            await think(rng, think_ms)
+            if confirmed is not None and confirmed.status_code == 200:
+                completed = await recorder.call(
+                    client, "POST /api/donations/requests/{id}/complete", "POST",
+                    f"/api/donations/requests/{donation_id}/complete", headers=ngo.headers,
+                )
+                if completed is not None and completed.status_code == 200:
+                    donor.to_rate.put_nowait(donation_id)
+
+        polls += 1
+        await recorder.call(
+            client, "GET /api/notifications/unread", "GET", "/api/notifications/unread", headers=ngo.headers
+        )
+        if polls % 5 == 0:
+            await recorder.call(
+                client, "GET /api/donations/requests/ngo-requests", "GET", "/api/donations/requests/ngo-requests",
+                headers=ngo.headers,
+            )
+
+
+async def run_load(client: httpx.AsyncClient, args) -> Dict:
+    recorder = Recorder()
+    ngos = [VirtualNGO(i) for i in range(1, args.ngos + 1)]
+    donors = [VirtualDonor(i) for i in range(1, args.donors + 1)]
+
+    # Log everyone in up front so the journeys measure steady-state traffic
+    for ngo in ngos:
+        ngo.headers = await login(client, recorder, f"ngo{ngo.index}@perf.example") or {}
+        if ngo.headers:
+            response = await recorder.call(client, "GET /api/ngos/locations", "GET", "/api/ngos/locations",
+                                           headers=ngo.headers)
+            ngo.locations = response.json() if response is not None and response.status_code == 200 else []
+    for donor in donors:
+        donor.headers = await login(client, recorder, f"donor{donor.index}@perf.example") or {}
+
+    locations = [(location, ngo) for ngo in ngos for location in ngo.locations if location.get("is_active", True)]
+    active_donors = [donor for donor in donors if donor.headers]
+    if not locations or not active_donors:
+        raise SystemExit("❌ No usable accounts - seed the target with perf.seed (or perf.fixtures) first")
+    print(f"📦 {len(active_donors)} donors and {sum(1 for n in ngos if n.locations)} NGOs "
+          f"({len(locations)} locations) for {args.duration}s")
+
+    started = time.monotonic()
+    deadline = started + args.duration
+    tasks = []
+    ramp_step = args.ramp_up / max(1, len(active_donors) + len(ngos))
+    for i, ngo in enumerate(n for n in ngos if n.locations):
+        tasks.append(asyncio.create_task(ngo_journey(client, recorder, ngo, deadline, args.think_ms, args.seed + i)))
+        await asyncio.sleep(ramp_step)
+    for i, donor in enumerate(active_donors):
+        tasks.append(asyncio.create_task(
+            donor_journey(client, recorder, donor, locations, deadline, args.think_ms, args.seed + 10_000 + i)
+        ))
+        await asyncio.sleep(ramp_step)
+    await asyncio.gather(*tasks)
+    return recorder.report(time.monotonic() - started)
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'endpoint':<46}{'count':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'err%':>7}")
+    print("-" * 95)
+    for name, row in report["endpoints"].items():
+        print(f"{name:<46}{row['count']:>7}{row['rps']:>8.1f}{row['p50']:>9.1f}{row['p95']:>9.1f}"
+              f"{row['p99']:>9.1f}{row['error_rate'] * 100:>7.1f}")
+    print(f"\n{report['requests']} requests in {report['elapsed_s']}s: {report['rps']} req/s, "
+          f"error rate {report['error_rate'] * 100:.2f}%")
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions against a saved baseline (p95 or throughput worse than tolerance, more errors)"""
+    regressions = []
+    if report["rps"] < baseline["rps"] * (1 - tolerance):
+        regressions.append(f"throughput {report['rps']} req/s < baseline {baseline['rps']} req/s")
+    for name, row in report["endpoints"].items():
+        base = baseline["endpoints"].get(name)
+        if base is None:
+            continue
+        if row["p95"] > base["p95"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {row['p95']} ms > baseline {base['p95']} ms")
+        if row["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(
+                f"{name}: error rate {row['error_rate'] * 100:.1f}% > baseline {base['error_rate'] * 100:.1f}%"
+            )
+    return regressions
+
+
+async def main(args) -> int:
+    if args.in_process:
+        # Must be set before the app (and its settings) are imported
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+        os.environ.setdefault("DEBUG", "false")
+        from app.main import app
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60.0) as client:
+                report = await run_load(client, args)
+    else:
+        limits = httpx.Limits(max_connections=args.donors + args.ngos)
+        async with httpx.AsyncClient(base_url=args.url, timeout=60.0, limits=limits) as client:
+            report = await run_load(client, args)
+
+    report["config"] = {"donors": args.donors, "ngos": args.ngos, "duration": args.duration, "think_ms": args.think_ms}
+    print_report(report)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.compare}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            return 1
+        print(f"\n✅ Within {args.tolerance:.0%} of baseline {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the running API")
+    parser.add_argument("--in-process", action="store_true", help="Drive app.main in this process instead of --url")
+    parser.add_argument("--donors", type=int, default=20, help="Virtual donors (donor1..N)")
+    parser.add_argument("--ngos", type=int, default=5, help="Virtual NGOs (ngo1..N)")
+    parser.add_argument("--duration", type=int, default=30, help="Seconds of load after login")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds over which virtual users start")
+    parser.add_argument("--think-ms", type=int, default=500, help="Max random pause between steps")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", help="Write the report to this JSON file as a baseline")
+    parser.add_argument("--compare", help="Compare against a saved baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95/throughput change (default 0.2)")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Event-loop latency under concurrent logins
+
+In-process mode (default) runs N concurrent password verifications twice -
+once with bcrypt inline on the event loop (the old behaviour) and once on the
+password pool - while a ticker task measures how late the loop wakes up.
+
+Server mode (--url) fires concurrent logins at a running API and measures the
+latency of GET / alongside them, which is the event-loop lag a client sees.
+
+Usage:
+    python -m perf.login_latency --concurrency 50
+    python -m perf.login_latency --url http://localhost:8000 --email donor@example.com --password secret123
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Dict
+
+TICK_SECONDS = 0.01
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max of a list of millisecond samples"""
+    if not samples:
+        return {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 2)
+    
+    return {
+        "count": len(ordered),
+        "p50": round(statistics.median(ordered), 2),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+        "max": round(ordered[-1], 2),
+    }
+
+
+async def measure_loop_lag(stop: asyncio.Event, samples: List[float]):
+    """Sleep in short ticks and record how late each wake-up is (ms)"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        samples.append(max(0.0, (loop.time() - expected) * 1000))
+
+
+async def run_in_process(concurrency: int) -> None:
+    from app.core.security import (
+        hash_password, verify_password, verify_password_async, get_password_pool_stats
+    )
+    
+    password = "load-test-password"
+    hashed = hash_password(password)
+    
+    async def inline_verify():
+        return verify_password(password, hashed)
+    
+    for label, verify in [("inline (event loop)", inline_verify),
+                          ("password pool", lambda: verify_password_async(password, hashed))]:
+        stop = asyncio.Event()
+        lag: List[float] = []
+        ticker = asyncio.create_task(measure_loop_lag(stop, lag))
+        await asyncio.sleep(TICK_SECONDS * 5)
+        
+        started = time.perf_counter()
+        results = await asyncio.gather(*(verify() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        
+        stop.set()
+        await ticker
+        assert all(results), "password verification failed"
+        
+        print(f"\n{label}: {concurrency} verifications in {elapsed:.2f}s "
+              f"({concurrency / elapsed:.1f}/s)")
+        print(f"  event-loop lag ms: {summarize(lag)}")
+    
+    print(f"\npassword pool stats: {get_password_pool_stats()}")
+
+
+async def run_against_server(url: str, email: str, password: str, concurrency: int, rounds: int) -> None:
+    import httpx
+    
+    login_latencies: List[float] = []
+    probe_latencies: List[float] = []
+    errors = 0
+    
+    async with httpx.AsyncClient(base_url=url, timeout=60.0) as client:
+        async def login():
+            nonlocal errors
+            started = time.perf_counter()
+            response = await client.post("/api/auth/login", json={"email": email, "password": password})
+            login_latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                errors += 1
+        
+        async def probe(stop: asyncio.Event):
+            while not stop.is_set():
+                started = time.perf_counter()
+                await client.get("/")
+                probe_latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(TICK_SECONDS)
+        
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(stop))
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(login() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await prober
+    
+    total = concurrency * rounds
+    print(f"{total} logins in {elapsed:.2f}s ({total / elapsed:.1f}/s), errors: {errors}")
+    print(f"  login latency ms:      {summarize(login_latencies)}")
+    print(f"  GET / latency ms:      {summarize(probe_latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure event-loop latency under concurrent logins")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3, help="Login waves in server mode")
+    parser.add_argument("--url", help="Base URL of a running API (server mode)")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    args = parser.parse_args()
+    
+    if args.url:
+        if not (args.email and args.password):
+            parser.error("--email and --password are required with --url")
+        asyncio.run(run_against_server(args.url, args.email, args.password, args.concurrency, args.rounds))
+    else:
+        asyncio.run(run_in_process(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
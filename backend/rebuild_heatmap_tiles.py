@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the donation heatmap tiles from completed donations
+Run once after deploying the donation_heatmap_tiles table (backfill), after
+changing HEATMAP_PRECISIONS or moving locations, or whenever the tiles are
+suspected to have drifted. Pass --start/--end to rebuild only the months
+covering a range of donation dates.
+"""
+import argparse
+import asyncio
+from datetime import date
+
+from app.core.database import AsyncSessionLocal, init_db
+from app.services.heatmap_service import rebuild_heatmap_tiles
+
+
+async def main(start_date: date = None, end_date: date = None):
+    await init_db()
+    
+    async with AsyncSessionLocal() as db:
+        tile_count = await rebuild_heatmap_tiles(db, start_date, end_date)
+        await db.commit()
+    
+    scope = f" for {start_date or 'the beginning'} to {end_date or 'the end'}" if start_date or end_date else ""
+    print(f"✅ Rebuilt {tile_count} heatmap tiles{scope}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=date.fromisoformat, help="First donation date to rebuild, YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last donation date to rebuild, YYYY-MM-DD")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.start, args.end))
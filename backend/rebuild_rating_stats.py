@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the precomputed NGO rating stats from the ratings table
+Run once after deploying the ngo_rating_stats table, or whenever the
+aggregates are suspected to have drifted
+"""
+import asyncio
+from app.core.database import AsyncSessionLocal, init_db
+from app.services.rating_stats_service import rebuild_rating_stats
+
+
+async def main():
+    await init_db()
+    
+    async with AsyncSessionLocal() as db:
+        ngo_count = await rebuild_rating_stats(db)
+        await db.commit()
+    
+    print(f"✅ Rebuilt rating stats for {ngo_count} NGOs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
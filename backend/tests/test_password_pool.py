@@ -0,0 +1,41 @@
+"""
+Password pool queue accounting
+"""
+import asyncio
+import threading
+
+from app.core.config import settings
+from app.core.security import _run_in_password_pool, get_password_pool_stats
+
+
+def test_cancelled_waiter_leaves_queue():
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def block():
+        started.release()
+        release.wait(timeout=10)
+
+    async def scenario():
+        # Occupy every worker so the next job has to wait in the queue
+        blockers = [
+            asyncio.create_task(_run_in_password_pool(block))
+            for _ in range(settings.PASSWORD_HASH_WORKERS)
+        ]
+        for _ in blockers:
+            await asyncio.to_thread(started.acquire)
+
+        waiter = asyncio.create_task(_run_in_password_pool(block))
+        await asyncio.sleep(0)
+        assert get_password_pool_stats()["queued"] == 1
+
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        release.set()
+        await asyncio.gather(*blockers)
+
+    asyncio.run(scenario())
+
+    stats = get_password_pool_stats()
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
@@ -0,0 +1,21 @@
+"""
+Query budgets for the read endpoints (see perf/query_budget.py)
+Fails when an endpoint runs more queries than its budget, exceeds its latency
+ceiling, or runs more queries as the data grows (an N+1). The database in
+DATABASE_URL is wiped, so the test also needs QUERY_BUDGET_RESET=1.
+"""
+import asyncio
+import os
+
+import pytest
+
+
+def test_read_endpoints_within_query_budget(database_url):
+    if os.environ.get("QUERY_BUDGET_RESET") != "1":
+        pytest.skip("drops every table in DATABASE_URL; set QUERY_BUDGET_RESET=1 to allow it")
+
+    from perf.query_budget import DEFAULT_SCALES, ENDPOINTS, evaluate, measure_scales
+
+    by_scale = asyncio.run(measure_scales(DEFAULT_SCALES, ENDPOINTS))
+    failures = evaluate(ENDPOINTS, by_scale, latency_factor=1.0)
+    assert not failures, "\n".join(failures)